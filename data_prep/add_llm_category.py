@@ -1,19 +1,65 @@
+"""
+Add the LLM categories from categorized_hoaxes.csv to the hoax store.
+
+Only IDs whose category is new or changed are upserted, in one transaction;
+the rest of the dataset is not read or rewritten. --export updates the
+LLM Category column of the Complete CSV from the store for the CSV-based
+stages: every other column comes from the CSV itself, and the file is
+replaced atomically.
+
+Usage:
+    python3 add_llm_category.py [--export]
+"""
+
+import argparse
+import os
+
 import pandas as pd
 
-# Read the categorized hoaxes file to create ID to LLM_CATEGORY mapping
-categorized_df = pd.read_csv('categorized_hoaxes.csv')
-id_to_category = dict(zip(categorized_df['ID'], categorized_df['LLM_CATEGORY']))
+from hoax_store import DB_PATH, HoaxStore
+
+COMPLETE_CSV = 'Scraping turnbackhoax.id - Complete.csv'
+CATEGORIZED_CSV = 'categorized_hoaxes.csv'
+CATEGORY_COLUMN = 'LLM Category'
+
+
+def export_categories(store, path=COMPLETE_CSV):
+    """Left-join the store's LLM Category onto the CSV by ID and replace it atomically."""
+    df = pd.read_csv(path, dtype=str)
+    ids = pd.to_numeric(df['ID'], errors='coerce')
+    stored = store.read([CATEGORY_COLUMN], ids=ids.dropna().astype(int).unique())
+    df[CATEGORY_COLUMN] = ids.map(stored.set_index('ID')[CATEGORY_COLUMN])
+    tmp_path = path + '.tmp'
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return df[CATEGORY_COLUMN].notna().sum(), len(df)
+
 
-# Read the main scraping file
-scraping_df = pd.read_csv('Scraping turnbackhoax.id - Complete.csv')
+def main():
+    parser = argparse.ArgumentParser(description="Upsert LLM categories by ID")
+    parser.add_argument('--categorized', default=CATEGORIZED_CSV)
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--export', action='store_true', help=f"also write {COMPLETE_CSV}")
+    args = parser.parse_args()
 
-# Add the LLM Category column by mapping IDs
-scraping_df['LLM Category'] = scraping_df['ID'].map(id_to_category)
+    # Read the categorized hoaxes file to create ID to LLM_CATEGORY mapping
+    categorized_df = pd.read_csv(args.categorized)
+    categorized_df = categorized_df.drop_duplicates('ID', keep='last')
+    categories = categorized_df[['ID', 'LLM_CATEGORY']].rename(columns={'LLM_CATEGORY': CATEGORY_COLUMN})
 
-# Save the updated file
-scraping_df.to_csv('Scraping turnbackhoax.id - Complete.csv', index=False)
+    with HoaxStore(args.db) as store:
+        # Only IDs whose category is new or different
+        stored = store.read([CATEGORY_COLUMN], ids=categories['ID'])
+        merged = categories.merge(stored, on='ID', how='left', suffixes=('', '_stored'))
+        changed = merged[merged[CATEGORY_COLUMN] != merged[f'{CATEGORY_COLUMN}_stored']]
+        store.upsert(changed[['ID', CATEGORY_COLUMN]])
+        print(f"Successfully upserted LLM Category for {len(changed)} rows "
+              f"({store.count(CATEGORY_COLUMN)} categorized in {args.db})")
 
-print(f"Successfully added LLM Category column to {len(scraping_df)} rows")
-print("File saved as 'Scraping turnbackhoax.id - Complete.csv'")
+        if args.export:
+            categorized, rows = export_categories(store)
+            print(f"File saved as '{COMPLETE_CSV}' ({categorized} of {rows} rows categorized)")
 
 
+if __name__ == "__main__":
+    main()
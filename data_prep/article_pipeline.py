@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Pipelined article scraper: I/O threads fetch, a process pool parses.
+
+Replaces the scrape_article / process_google_sheet loop from
+Scraping_Turn_Back_Hoax.ipynb, where BeautifulSoup parsing ran inline on the
+thread doing the network fetch.
+
+    URLs -> fetcher threads -> bounded raw-HTML queue -> process pool -> results
+
+The raw queue and the number of parse jobs in flight are both bounded, so a
+slow parser stalls the fetchers instead of piling up HTML in memory. With
+--stream DIR, results are committed to Parquet row groups as they arrive
+(result_writer.py) instead of being held until the end, and a rerun with the
+same DIR resumes after the last committed article. Failed fetches are not
+committed, so the rerun retries them.
+
+Usage:
+    python3 article_pipeline.py <headlines_csv> [--fetchers 8] [--workers 4] [--delay 0.25]
+    python3 article_pipeline.py --frontier crawl_frontier.db --cache html_cache
+    python3 article_pipeline.py <headlines_csv> --parser lxml
+    python3 article_pipeline.py <headlines_csv> --stream article_results
+    python3 article_pipeline.py --benchmark
+"""
+
+import argparse
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+import pyarrow as pa
+import requests
+from requests.adapters import HTTPAdapter
+
+from crawl_frontier import CrawlFrontier
+from html_cache import HtmlCache
+from rate_limiter import MAX_RETRIES, THROTTLE_STATUSES, AdaptiveRateLimiter, rate_for_delay
+from result_writer import ResultWriter, export_csv
+from turnbackhoax_parser import BACKENDS, DEFAULT_BACKEND, HEADERS, parse_article
+
+FETCHERS = 8
+WORKERS = os.cpu_count() or 1
+QUEUE_SIZE = 64  # raw pages waiting for a parser
+REQUEST_DELAY = 0.25  # initial seconds between request starts; adapts to the server
+REQUEST_TIMEOUT = 30
+
+ARTICLE_SCHEMA = pa.schema([('url', pa.string()), ('category', pa.string()), ('content', pa.string())])
+
+_DONE = object()
+
+
+def create_session(pool_size=FETCHERS):
+    """Keep-alive session with a connection pool sized for the fetchers."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def parse_article_task(url, content, parser=DEFAULT_BACKEND):
+    """Process-pool entry point: parse one fetched page."""
+    try:
+        result = parse_article(content, parser)
+    except Exception as e:
+        return {'url': url, 'category': '', 'content': f'Error: {str(e)}'}
+    return {'url': url, **result}
+
+
+def _get(session, url, headers, limiter):
+    """GET under the shared rate limiter, retrying throttled responses."""
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.acquire()
+        try:
+            response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException:
+            limiter.record(None)
+            raise
+        limiter.record(response.status_code, response.elapsed.total_seconds(),
+                       response.headers.get('Retry-After'))
+        if response.status_code not in THROTTLE_STATUSES:
+            break
+    return response
+
+
+def _fetch_one(url, session, limiter, frontier, cache):
+    """(url, content, error) for one URL; content and error are both None for a 304."""
+    headers = frontier.conditional_headers(url) if frontier is not None else None
+    try:
+        response = _get(session, url, headers, limiter)
+        if frontier is not None:
+            frontier.record_fetch(url, 'article', response.status_code,
+                                  response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        if response.status_code == 304:
+            # Unchanged since the last run: nothing to parse
+            return url, None, None
+        response.raise_for_status()
+        if cache is not None:
+            cache.put(url, response.content)
+        return url, response.content, None
+    except requests.RequestException as e:
+        if frontier is not None and e.response is None:
+            frontier.record_fetch(url, 'article', None)
+        return url, None, e
+
+
+def _put(raw_queue, item, stop):
+    """Put item on the bounded queue unless stop is set first; True if it was put."""
+    while not stop.is_set():
+        try:
+            raw_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _fetch_worker(url_queue, raw_queue, session, limiter, frontier, cache, stop):
+    try:
+        while not stop.is_set():
+            url = url_queue.get()
+            if url is _DONE:
+                return
+            try:
+                item = _fetch_one(url, session, limiter, frontier, cache)
+            except Exception as e:
+                # e.g. a sqlite error from the frontier or an OSError from the cache:
+                # report it for this URL instead of losing the thread
+                item = (url, None, e)
+            if not _put(raw_queue, item, stop):
+                return
+    finally:
+        # Always tell the consumer this fetcher is finished
+        _put(raw_queue, _DONE, stop)
+
+
+def iter_articles(urls, fetchers=FETCHERS, workers=WORKERS, queue_size=QUEUE_SIZE,
+                  delay=REQUEST_DELAY, frontier=None, cache=None, parser=DEFAULT_BACKEND,
+                  limiter=None):
+    """
+    Fetch and parse articles, yielding results as they complete.
+
+    Args:
+        urls: Article URLs to scrape
+        fetchers: Number of network threads
+        workers: Number of parser processes
+        queue_size: Maximum fetched pages waiting to be parsed
+        delay: Initial seconds between request starts (shared by all fetchers);
+            the rate then adapts to the server's latency and 429/503 answers
+        frontier: Optional CrawlFrontier; requests become conditional GETs and
+            their outcome is recorded. Pages answering 304 are skipped.
+        cache: Optional HtmlCache receiving every fetched page
+        parser: turnbackhoax_parser backend used by the parse workers
+        limiter: AdaptiveRateLimiter to use instead of one built from delay
+
+    Yields:
+        Dicts with url, category and content (content is 'Error: ...' on failure)
+    """
+    url_queue = queue.Queue()
+    raw_queue = queue.Queue(maxsize=queue_size)
+    for url in urls:
+        url_queue.put(url)
+    for _ in range(fetchers):
+        url_queue.put(_DONE)
+
+    session = create_session(fetchers)
+    stop = threading.Event()  # set when the consumer closes the generator early
+    if limiter is None:
+        limiter = AdaptiveRateLimiter(rate_for_delay(delay))
+    threads = [
+        threading.Thread(target=_fetch_worker, daemon=True,
+                         args=(url_queue, raw_queue, session, limiter, frontier, cache, stop))
+        for _ in range(fetchers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    max_in_flight = workers * 2
+    in_flight = set()
+    finished_fetchers = 0
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while finished_fetchers < fetchers or in_flight:
+                # Drain completed parses first so the pool never holds more
+                # than max_in_flight pages
+                if len(in_flight) >= max_in_flight or finished_fetchers == fetchers:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                    continue
+
+                item = raw_queue.get()
+                if item is _DONE:
+                    finished_fetchers += 1
+                    continue
+
+                url, content, error = item
+                if content is None and error is None:
+                    continue
+                if error is not None:
+                    print(f"\nError scraping {url}: {error}")
+                    yield {'url': url, 'category': '', 'content': f'Error: {str(error)}'}
+                    continue
+
+                in_flight.add(pool.submit(parse_article_task, url, content, parser))
+    finally:
+        stop.set()
+        session.close()
+
+
+def scrape_articles(urls, fetchers=FETCHERS, workers=WORKERS, delay=REQUEST_DELAY, progress=True,
+                    frontier=None, cache=None, parser=DEFAULT_BACKEND, limiter=None):
+    """Scrape all URLs and return a DataFrame in input order."""
+    if limiter is None:
+        limiter = AdaptiveRateLimiter(rate_for_delay(delay))
+    results = {}
+    for result in iter_articles(urls, fetchers=fetchers, workers=workers, delay=delay,
+                                frontier=frontier, cache=cache, parser=parser, limiter=limiter):
+        results[result['url']] = result
+        if progress:
+            print(f"   Scraped {len(results)}/{len(urls)} articles ({limiter.describe()})...    ", end='\r')
+    if progress:
+        print()
+        print(f"   Rate limiter: {limiter.describe()}")
+
+    return pd.DataFrame([results[url] for url in urls if url in results],
+                        columns=['url', 'category', 'content'])
+
+
+def stream_articles(urls, writer, fetchers=FETCHERS, workers=WORKERS, delay=REQUEST_DELAY, progress=True,
+                    frontier=None, cache=None, parser=DEFAULT_BACKEND, limiter=None):
+    """
+    Scrape the URLs not yet committed in writer, committing results as they complete.
+
+    Failed fetches ('Error: ...' content) are not committed, so a rerun retries them.
+
+    Returns:
+        (number of URLs already committed, number committed by this run, number failed)
+    """
+    if limiter is None:
+        limiter = AdaptiveRateLimiter(rate_for_delay(delay))
+    done = writer.completed_keys()
+    todo = [url for url in urls if url not in done]
+    skipped = len(urls) - len(todo)
+    if progress and skipped:
+        print(f"   Resuming: {skipped} articles already committed, {len(todo)} to go")
+
+    scraped = failed = 0
+    for result in iter_articles(todo, fetchers=fetchers, workers=workers, delay=delay,
+                                frontier=frontier, cache=cache, parser=parser, limiter=limiter):
+        if result['content'].startswith('Error:'):
+            failed += 1
+        else:
+            writer.write([result])
+            scraped += 1
+        if progress:
+            print(f"   Scraped {scraped + failed}/{len(todo)} articles, {writer.rows_committed} committed "
+                  f"({limiter.describe()})...    ", end='\r')
+    writer.flush()
+    if progress:
+        print()
+        print(f"   Rate limiter: {limiter.describe()}")
+        if failed:
+            print(f"   {failed} articles failed and were not committed; rerun with the same --stream DIR to retry")
+    return skipped, scraped, failed
+
+
+def run_benchmark(pages=10, per_page=20, latency=0.02, fetchers=16):
+    """Measure articles/sec against a local synthetic site for 1..N parser processes."""
+    import asyncio
+
+    from headline_crawler import crawl_pages
+    from local_site import serve_site, write_fixture_site
+
+    cpu_count = os.cpu_count() or 1
+    levels = sorted({1, 2, 4, 8, cpu_count} & set(range(1, cpu_count + 1)))
+
+    print("=" * 60)
+    print(f"ARTICLE PIPELINE BENCHMARK ({pages * per_page} articles, {fetchers} fetchers, "
+          f"{cpu_count} CPUs)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as root:
+        with serve_site(root, latency=latency) as base_url:
+            write_fixture_site(root, base_url, 1, pages, per_page)
+            urls = asyncio.run(crawl_pages(1, pages, base_url, delay=0.0, progress=False))['url'].tolist()
+
+            baseline = None
+            for workers in levels:
+                start = time.perf_counter()
+                df = scrape_articles(urls, fetchers=fetchers, workers=workers, delay=0.0, progress=False)
+                elapsed = time.perf_counter() - start
+                rate = len(df) / elapsed
+                baseline = baseline or rate
+                print(f"   workers={workers:<3} {len(df):>5} articles  {elapsed:6.2f}s  "
+                      f"{rate:7.1f} articles/sec  ({rate / baseline:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape turnbackhoax.id articles")
+    parser.add_argument('headlines_csv', nargs='?', help="CSV with a 'url' column (headline crawler output)")
+    parser.add_argument('--frontier', help="SQLite frontier: conditional GETs, and without a CSV, "
+                                           "scrape the URLs it still has pending")
+    parser.add_argument('--cache', help="keep raw HTML in this html_cache directory for offline re-parsing")
+    parser.add_argument('--stream', metavar='DIR',
+                        help="commit results to Parquet row groups in DIR as they arrive; "
+                             "rerunning with the same DIR resumes")
+    parser.add_argument('--parser', choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help="HTML extraction backend (see parser_benchmark.py)")
+    parser.add_argument('--fetchers', type=int, default=FETCHERS)
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--delay', type=float, default=REQUEST_DELAY,
+                        help="initial seconds between requests across all fetchers (adapts)")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="measure scaling against a local synthetic site")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark()
+        return
+    if not args.headlines_csv and not args.frontier:
+        parser.error("headlines_csv or --frontier is required unless --benchmark is given")
+
+    frontier = CrawlFrontier(args.frontier) if args.frontier else None
+    cache = HtmlCache(args.cache) if args.cache else None
+    if args.headlines_csv:
+        urls = pd.read_csv(args.headlines_csv)['url'].dropna().tolist()
+    else:
+        urls = frontier.pending_urls('article')
+    print(f"Found {len(urls)} URLs to process")
+    if not urls:
+        return
+
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    filename = f'turnbackhoax_articles_{timestamp}.csv'
+
+    if args.stream:
+        with ResultWriter(args.stream, ARTICLE_SCHEMA, 'url') as writer:
+            stream_articles(urls, writer, fetchers=args.fetchers, workers=args.workers, delay=args.delay,
+                            frontier=frontier, cache=cache, parser=args.parser)
+        total = export_csv(args.stream, filename)
+    else:
+        results_df = scrape_articles(urls, fetchers=args.fetchers, workers=args.workers, delay=args.delay,
+                                     frontier=frontier, cache=cache, parser=args.parser)
+        results_df.to_csv(filename, index=False)
+        total = len(results_df)
+    if frontier is not None:
+        frontier.close()
+    if cache is not None:
+        cache.close()
+
+    print(f"\nScraping completed successfully!")
+    print(f"Total articles scraped: {total}")
+    print(f"Data saved to: {filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,77 +1,77 @@
+"""
+Categorize hoax titles into politics, scam or others with Gemini.
+
+Batches are sent concurrently by llm_categorizer.py over one reused
+session, with retries and requeues for transient failures. Results are
+appended to categorized_hoaxes.csv and upserted into the hoax store as
+each batch finishes, so an interrupted run resumes where it stopped.
+Answers are reconciled with their batch by ID; items the model leaves out
+are sent again in the same run, and the run ends with a coverage report.
+Titles already categorized under the current prompt version, including
+re-posts under new IDs, come from category_cache.sqlite without a request.
+With --triage, titles whose keywords (keyword_triage.py) clearly point to
+one bucket are answered first; with --classifier, titles the local model
+(title_classifier.py) is confident about are answered next. Neither needs
+a request; their answers go only to the hoax store, whose 'Category
+Source' column tells them ('keywords', 'local') from LLM answers ('llm').
+categorized_hoaxes.csv, the training set for title_classifier.py and the
+label source of the topic modeling scripts, only gets LLM answers.
+
+Usage:
+    python3 categorize_hoaxes.py [--concurrency 4] [--token-budget 2000] [--max-items 80]
+    python3 categorize_hoaxes.py --no-cache
+    python3 categorize_hoaxes.py [--triage] [--classifier [title_classifier.npz]]
+    python3 categorize_hoaxes.py --base-url http://127.0.0.1:8001   # mock_gemini.py, no API key needed
+    python3 categorize_hoaxes.py --record cassette.jsonl             # for llm_replay.py serve
+"""
+
+import argparse
+import asyncio
 import os
-import time
 import pandas as pd
-import google.generativeai as genai
 from dotenv import load_dotenv
-import json
-import typing_extensions as typing
+
+from category_cache import CACHE_DB, CategoryCache
+from hoax_store import HoaxStore
+from keyword_triage import KeywordTriage
+from llm_replay import CassetteRecorder
+from llm_categorizer import (CONCURRENCY, GEMINI_API_URL, MAX_BATCH_ITEMS, MODEL_NAME, TOKEN_BUDGET, GeminiClient,
+                             categorize_items)
+from title_classifier import MODEL_FILE, SOURCE_COLUMN, TitleClassifier
 
 # Load environment variables
 load_dotenv()
 
-# Configure Gemini
-api_key = os.getenv("GEMINI_API_KEY")
-if not api_key:
-    print("Error: GEMINI_API_KEY not found in .env")
-    exit(1)
-
-genai.configure(api_key=api_key)
-
 # Configuration
 INPUT_FILE = "Scraping turnbackhoax.id - Complete.csv"
 OUTPUT_FILE = "categorized_hoaxes.csv"
-BATCH_SIZE = 50
-# Note: User explicitly requested gemini-2.5-flash.
-MODEL_NAME = "gemini-2.5-flash" 
 
-def categorize_batch(items):
-    # items is a list of dicts: [{'ID': 123, 'TITLE': '...'}, ...]
-    
-    prompt = """
-    You are an expert at categorizing news and claims.
-    The data is from turnbackhoax.id, an Indonesian anti-hoax database by MAFINDO.
-    
-    Categorize each of the following items based on their Title into one of these categories:
-    - politics
-    - scam
-    - others
-    
-    Return the result as a JSON list of objects, where each object has 'id' and 'category'.
-    """
-    
-    # Prepare the input text
-    items_text = ""
-    for item in items:
-        items_text += f"ID: {item['ID']}\nTitle: {item['TITLE']}\n---\n"
-        
-    full_prompt = prompt + "\nItems to categorize:\n" + items_text
-
-    # Define the schema for structured output
-    generation_config = {
-        "response_mime_type": "application/json",
-        "response_schema": {
-            "type": "ARRAY",
-            "items": {
-                "type": "OBJECT",
-                "properties": {
-                    "id": {"type": "INTEGER"},
-                    "category": {"type": "STRING", "enum": ["politics", "scam", "others"]}
-                },
-                "required": ["id", "category"]
-            }
-        }
-    }
-
-    model = genai.GenerativeModel(MODEL_NAME, generation_config=generation_config)
+def main():
+    parser = argparse.ArgumentParser(description="Categorize hoax titles with Gemini")
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY, help="requests in flight")
+    parser.add_argument('--token-budget', type=int, default=TOKEN_BUDGET,
+                        help="estimated prompt + answer tokens per batch")
+    parser.add_argument('--max-items', type=int, default=MAX_BATCH_ITEMS, help="items per batch at most")
+    parser.add_argument('--base-url', default=GEMINI_API_URL, help="API root (e.g. a mock_gemini.py server)")
+    parser.add_argument('--model', default=MODEL_NAME)
+    parser.add_argument('--cache', default=CACHE_DB, help="category cache (SQLite)")
+    parser.add_argument('--no-cache', action='store_true', help="send every title to the model")
+    parser.add_argument('--record', metavar='CASSETTE', help="append every answer to this file for llm_replay.py")
+    parser.add_argument('--triage', action='store_true', help="answer titles with clear keyword matches first")
+    parser.add_argument('--classifier', nargs='?', const=MODEL_FILE,
+                        help="answer confident titles with this local model (title_classifier.py train)")
+    args = parser.parse_args()
 
-    try:
-        response = model.generate_content(full_prompt)
-        return json.loads(response.text)
-    except Exception as e:
-        print(f"Error generating content: {e}")
-        return []
+    # Configure Gemini
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key and args.base_url == GEMINI_API_URL:
+        print("Error: GEMINI_API_KEY not found in .env")
+        exit(1)
+
+    if args.classifier and not os.path.exists(args.classifier):
+        print(f"Classifier {args.classifier} not found; run `python3 title_classifier.py train` first.")
+        exit(1)
 
-def main():
     if not os.path.exists(INPUT_FILE):
         print(f"Input file {INPUT_FILE} not found.")
         return
@@ -96,44 +96,61 @@ def main():
         # Initialize output file with headers
         pd.DataFrame(columns=['ID', 'TITLE', 'LLM_CATEGORY']).to_csv(OUTPUT_FILE, index=False)
 
+    # Categories are also upserted by ID into the hoax store as batches finish
+    store = HoaxStore()
+    processed_ids |= set(store.read(['LLM Category']).dropna()['ID'])
+
     # Filter out already processed items
     # We only need ID and TITLE for the API
     items_to_process = df[~df['ID'].isin(processed_ids)][['ID', 'TITLE']].to_dict('records')
     
     total_items = len(items_to_process)
-    print(f"Total items to process: {total_items}")
-
-    for i in range(0, total_items, BATCH_SIZE):
-        batch = items_to_process[i:i+BATCH_SIZE]
-        print(f"Processing batch {i//BATCH_SIZE + 1}/{(total_items + BATCH_SIZE - 1)//BATCH_SIZE} ({len(batch)} items)...")
-        
-        results = categorize_batch(batch)
-        
-        if not results:
-            print("Batch failed or returned empty. Skipping...")
-            continue
-            
-        # Create a DataFrame for the results
-        batch_results = []
-        for res in results:
-            # Find the title from the batch
-            original_item = next((item for item in batch if item['ID'] == res['id']), None)
-            if original_item:
-                batch_results.append({
-                    'ID': res['id'],
-                    'TITLE': original_item['TITLE'],
-                    'LLM_CATEGORY': res['category']
-                })
-        
-        if batch_results:
-            batch_df = pd.DataFrame(batch_results)
-            # Append to CSV, skip header
-            batch_df.to_csv(OUTPUT_FILE, mode='a', header=False, index=False)
-            print(f"Saved {len(batch_df)} items to {OUTPUT_FILE}")
-        
-        # Rate limiting to be safe
-        time.sleep(2)
+    print(f"Total items to process: {total_items} ({args.concurrency} requests in flight, "
+          f"batches up to {args.token_budget} tokens / {args.max_items} items)")
 
+    saved_ids = set()
+
+    def save_batch(batch, results):
+        # Results come reconciled by ID: results[i] answers batch[i]
+        batch_df = pd.DataFrame({
+            'ID': [item['ID'] for item in batch],
+            'TITLE': [item['TITLE'] for item in batch],
+            'LLM_CATEGORY': [res['category'] for res in results],
+            SOURCE_COLUMN: [res.get('source', 'llm') for res in results],
+        })
+        # Append LLM answers to CSV, skip header; keyword and local-model answers stay in the store
+        llm = batch_df[SOURCE_COLUMN] == 'llm'
+        batch_df.loc[llm, ['ID', 'TITLE', 'LLM_CATEGORY']].to_csv(OUTPUT_FILE, mode='a', header=False, index=False)
+        store.upsert(batch_df[['ID', 'LLM_CATEGORY', SOURCE_COLUMN]].rename(
+            columns={'LLM_CATEGORY': 'LLM Category'}))
+        saved_ids.update(batch_df['ID'])
+
+    cache = None if args.no_cache else CategoryCache(args.cache)
+    # Local tiers, tried in order before the LLM
+    classifier = [KeywordTriage() if args.triage else None,
+                  TitleClassifier.load(args.classifier) if args.classifier else None]
+    recorder = CassetteRecorder(args.record) if args.record else None
+
+    async def run():
+        async with GeminiClient(api_key, args.base_url, args.model, args.concurrency, recorder=recorder) as client:
+            return await categorize_items(client, items_to_process, save_batch,
+                                          args.token_budget, args.max_items, args.concurrency, cache=cache,
+                                          classifier=classifier)
+
+    try:
+        stats = asyncio.run(run())
+    finally:
+        store.close()
+        if cache is not None:
+            cache.close()
+        if recorder is not None:
+            recorder.close()
+            print(f"Recorded {recorder.recorded} answers to {args.record}")
+    print(f"Saved to the hoax store and, LLM answers only, {OUTPUT_FILE}: {stats.describe()}")
+    covered = df['ID'].isin(processed_ids | saved_ids)
+    print(f"Coverage of {INPUT_FILE}: {covered.sum()}/{len(df)} ({covered.mean():.1%})")
+    if stats.failed_ids:
+        print(f"{len(stats.failed_ids)} items failed; rerun to retry them.")
     print("Done!")
 
 if __name__ == "__main__":
@@ -0,0 +1,126 @@
+"""
+Persistent cache of LLM categories, keyed by normalized title and prompt version.
+
+A hoax re-posted under a new ID, or with a different verdict label, case,
+spacing or punctuation, normalizes to the same title and gets its category
+from the cache instead of another LLM call. The key also holds the prompt
+version (llm_categorizer.prompt_version: a hash of the prompt, response
+schema and model), so after a prompt tweak only entries of the new version
+are looked up; entries of other versions stay until pruned.
+
+Usage:
+    python3 category_cache.py [category_cache.sqlite]                 # entries per version
+    python3 category_cache.py [category_cache.sqlite] --prune VERSION  # keep only VERSION
+"""
+
+import argparse
+import hashlib
+import re
+import sqlite3
+import time
+import unicodedata
+
+CACHE_DB = "category_cache.sqlite"
+
+VERDICT_PATTERN = re.compile(r'^\s*(?:\[[^\]]*\]\s*)+')  # "[SALAH]", "[HOAKS] [DISINFORMASI]"
+NON_WORD_PATTERN = re.compile(r'[\W_]+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    title_key TEXT NOT NULL,
+    version TEXT NOT NULL,
+    category TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (title_key, version)
+) WITHOUT ROWID;
+"""
+
+
+def normalize_title(title):
+    """Title without verdict labels, case, Unicode variants, punctuation or extra spaces."""
+    title = unicodedata.normalize('NFKC', str(title))
+    title = VERDICT_PATTERN.sub('', title).casefold()
+    return ' '.join(NON_WORD_PATTERN.sub(' ', title).split())
+
+
+def title_key(title):
+    """
+    Cache key of a title: sha1 of its normalized form.
+
+    None for a missing (None or NaN) title or one that normalizes to nothing,
+    e.g. only a verdict label: such titles share no content, so they must
+    not share a key.
+    """
+    if title is None or title != title:
+        return None
+    normalized = normalize_title(title)
+    if not normalized:
+        return None
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+class CategoryCache:
+    """SQLite table of (title_key, version) -> category."""
+
+    def __init__(self, path=CACHE_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def get_many(self, keys, version):
+        """{title_key: category} for the keys cached under this version."""
+        keys = list(set(keys))
+        found = {}
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            found.update(self.conn.execute(
+                f"SELECT title_key, category FROM categories WHERE version = ? AND title_key IN ({placeholders})",
+                [version] + chunk))
+        return found
+
+    def put_many(self, categories, version):
+        """Store {title_key: category} under this version, in one transaction."""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO categories (title_key, version, category, created) VALUES (?, ?, ?, ?)",
+                [(key, version, category, now) for key, category in categories.items()])
+
+    def versions(self):
+        """[(version, entries)], newest first."""
+        return self.conn.execute(
+            "SELECT version, COUNT(*) FROM categories GROUP BY version ORDER BY MAX(created) DESC").fetchall()
+
+    def prune(self, keep_version):
+        """Delete the entries of every other version; returns how many."""
+        with self.conn:
+            return self.conn.execute("DELETE FROM categories WHERE version != ?", (keep_version,)).rowcount
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the LLM category cache")
+    parser.add_argument('path', nargs='?', default=CACHE_DB)
+    parser.add_argument('--prune', metavar='VERSION', help="delete entries of every other prompt version")
+    args = parser.parse_args()
+
+    with CategoryCache(args.path) as cache:
+        if args.prune:
+            print(f"✓ Deleted {cache.prune(args.prune)} entries of other versions")
+        for version, entries in cache.versions():
+            print(f"   {version}: {entries} titles")
+
+
+if __name__ == "__main__":
+    main()
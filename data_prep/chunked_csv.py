@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Chunked, multi-process execution for the CSV-to-CSV data prep steps.
+
+process_csv reads the input in chunks, runs a transform on each chunk in a
+process pool, and appends the results to the output in input order. Only a
+bounded number of chunks is in flight, so memory depends on the chunk size
+and worker count, not the size of the archive.
+
+Every column is read as text (dtype=str), so a chunk never infers a
+different type for a column than its neighbours, and pass-through columns
+are written back exactly as they were read.
+
+Usage:
+    python3 chunked_csv.py --benchmark [--rows 37600] [--chunksize 2000] [--max-workers N]
+"""
+
+import argparse
+import collections
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+CHUNKSIZE = 2000
+WORKERS = 1
+
+
+def read_header(input_file):
+    """Column names of a CSV without reading its rows."""
+    return pd.read_csv(input_file, nrows=0).columns.tolist()
+
+
+def iter_chunks(input_file, chunksize=CHUNKSIZE):
+    """DataFrames of up to chunksize rows; the whole file at once if chunksize is None."""
+    if chunksize is None:
+        yield pd.read_csv(input_file, dtype=str)
+        return
+    yield from pd.read_csv(input_file, dtype=str, chunksize=chunksize)
+
+
+def ordered_map(pool, function, items, window):
+    """Like pool.map, but never more than `window` items submitted ahead of the consumer."""
+    pending = collections.deque()
+    for item in items:
+        pending.append(pool.submit(function, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def process_csv(input_file, output_file, transform, workers=WORKERS, chunksize=CHUNKSIZE, progress=True):
+    """
+    Stream input_file through transform into output_file.
+
+    Chunks are written to output_file + '.tmp', which replaces output_file
+    only after the last chunk, so an interrupted run never leaves a
+    truncated output behind.
+
+    Args:
+        input_file, output_file: CSV paths
+        transform: Top-level function DataFrame -> DataFrame (must be picklable)
+        workers: Processes; 1 runs in this process
+        chunksize: Rows per chunk, or None for the whole file as one chunk
+        progress: Print a running row counter
+
+    Returns:
+        Number of rows written
+    """
+    rows = 0
+    tmp_path = output_file + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        chunks = iter_chunks(input_file, chunksize)
+        if workers > 1:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            results = ordered_map(pool, transform, chunks, window=workers * 2)
+        else:
+            pool = None
+            results = map(transform, chunks)
+
+        try:
+            for df in results:
+                df.to_csv(f, index=False, header=rows == 0)
+                rows += len(df)
+                if progress:
+                    print(f"   Processed {rows} rows...", end='\r')
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+    os.replace(tmp_path, output_file)
+
+    if progress:
+        print()
+    return rows
+
+
+def write_synthetic_complete_csv(path, rows):
+    """Complete-CSV-shaped file with synthetic CONTENT, for benchmarks."""
+    from extract_content import synthetic_contents
+
+    contents = synthetic_contents(min(rows, 3760))
+    pd.DataFrame({
+        'ID': range(1, rows + 1),
+        'URL': [f"https://turnbackhoax.id/2024/01/01/post-{i}/" for i in range(rows)],
+        'TITLE': [f"[SALAH] Judul {i}" for i in range(rows)],
+        'CONTENT': [contents[i % len(contents)] for i in range(rows)],
+    }).to_csv(path, index=False)
+
+
+def run_benchmark(rows=37600, chunksize=CHUNKSIZE, max_workers=None):
+    """Time extract_content and clean_columns for 1..N workers against the eager single pass."""
+    from clean_columns import clean_frame
+    from extract_content import structure_frame
+
+    cpu_count = os.cpu_count() or 1
+    max_workers = max_workers or cpu_count
+    levels = sorted({1, 2, 4, 8, max_workers} & set(range(1, max_workers + 1)))
+
+    print("=" * 60)
+    print(f"CHUNKED DATA PREP BENCHMARK ({rows:,} rows, chunks of {chunksize}, {cpu_count} CPUs)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        complete = os.path.join(tmp, 'complete.csv')
+        write_synthetic_complete_csv(complete, rows)
+
+        for name, transform, input_file in (('extract_content', structure_frame, complete),
+                                            ('clean_columns', clean_frame, os.path.join(tmp, 'eager.csv'))):
+            eager_output = os.path.join(tmp, f'{name}_eager.csv')
+            start = time.perf_counter()
+            process_csv(input_file, eager_output, transform, workers=1, chunksize=None, progress=False)
+            baseline = time.perf_counter() - start
+            print(f"   {name}: eager single pass {baseline:6.2f}s")
+
+            for workers in levels:
+                output = os.path.join(tmp, f'{name}_{workers}.csv')
+                start = time.perf_counter()
+                process_csv(input_file, output, transform, workers, chunksize, progress=False)
+                elapsed = time.perf_counter() - start
+                with open(eager_output, 'rb') as a, open(output, 'rb') as b:
+                    same = a.read() == b.read()
+                print(f"      workers={workers:<3} {elapsed:6.2f}s  ({baseline / elapsed:.2f}x)  "
+                      f"output {'identical' if same else 'DIFFERENT'}")
+
+            # The structured output feeds the clean_columns run
+            os.replace(eager_output, os.path.join(tmp, 'eager.csv'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chunked data prep")
+    parser.add_argument('--benchmark', action='store_true')
+    parser.add_argument('--rows', type=int, default=37600)
+    parser.add_argument('--chunksize', type=int, default=CHUNKSIZE)
+    parser.add_argument('--max-workers', type=int, default=None,
+                        help="largest pool to time (default: CPU count)")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.rows, args.chunksize, args.max_workers)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
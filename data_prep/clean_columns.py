@@ -1,6 +1,35 @@
+import argparse
+import functools
+import numpy as np
 import pandas as pd
 import re
 import sys
+import time
+
+from chunked_csv import CHUNKSIZE, process_csv, read_header
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # arrow engine unavailable
+    pa = None
+
+# What str.strip() and re's \s treat as whitespace (str.isspace). RE2, behind
+# the Arrow kernels, only knows ASCII \s, so the characters are spelled out.
+WHITESPACE = ('\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680' + ''.join(map(chr, range(0x2000, 0x200b)))
+              + '\u2028\u2029\u202f\u205f\u3000')
+QUOTES = '"“”'
+
+# All of clean_text as one pattern: leading colons/whitespace, quotes and
+# whitespace, or trailing whitespace, quotes and '='/whitespace. The leading
+# branch must not match empty, or RE2 steps past position 0 before trying
+# the trailing one (and '==' would survive).
+ARROW_CLEAN_PATTERN = (f'\\A(?:[:{WHITESPACE}]+[{QUOTES}]*[{WHITESPACE}]*|[{QUOTES}]+[{WHITESPACE}]*)'
+                       f'|[{WHITESPACE}]*[{QUOTES}]*[={WHITESPACE}]*\\z')
+
+ENGINES = ['apply', 'arrow', 'strip']
+DEFAULT_ENGINE = 'strip'
+
 
 def clean_text(text):
     if not isinstance(text, str):
@@ -32,30 +61,130 @@ def clean_text(text):
     
     return text
 
+COLUMNS_TO_CLEAN = [
+    'KATEGORI', 'SUMBER', 'NARASI', 'PENJELASAN', 
+    'REFERENSI', 'FAKTA', 'SALAH'
+]
+
+
+def _clean_strings_arrow(values):
+    array = pa.array(values, type=pa.large_string())
+    cleaned = pc.replace_substring_regex(array, pattern=ARROW_CLEAN_PATTERN, replacement='')
+    return cleaned.to_numpy(zero_copy_only=False)
+
+
+def _clean_strings_strip(values):
+    # clean_text's steps as character-set strips: '^[:\s]+' is an lstrip,
+    # '[\s=]+$' an rstrip (the text has no trailing newline left for $ to skip)
+    leading = ':' + WHITESPACE
+    trailing = '=' + WHITESPACE
+    return [value.lstrip(leading).rstrip(trailing).strip(QUOTES).strip() for value in values]
+
+
+def clean_frame(df, engine=DEFAULT_ENGINE):
+    """
+    Apply clean_text to every section column present in df.
+
+    Args:
+        df: DataFrame, modified in place and returned
+        engine: 'apply' (clean_text per cell, column by column), 'arrow'
+            (ARROW_CLEAN_PATTERN in one Arrow kernel call over every column's
+            strings) or 'strip' (one str.strip chain per string)
+    """
+    columns = [col for col in COLUMNS_TO_CLEAN if col in df.columns]
+    if not columns:
+        return df
+
+    if engine == 'apply':
+        for col in columns:
+            df[col] = df[col].apply(clean_text)
+        return df
+
+    # Column-major, so each column's cells stay contiguous; non-strings are left alone
+    values = df[columns].to_numpy(dtype=object).ravel(order='F')
+    is_text = np.fromiter((isinstance(value, str) for value in values), dtype=bool, count=len(values))
+    clean_strings = _clean_strings_arrow if engine == 'arrow' else _clean_strings_strip
+    values[is_text] = clean_strings(values[is_text])
+    df[columns] = values.reshape(len(df), len(columns), order='F')
+    return df
+
+
+def synthetic_structured(rows):
+    """Section columns as extract_content produces them, from synthetic CONTENT."""
+    from extract_content import structure_frame, synthetic_contents
+
+    base = structure_frame(pd.DataFrame({'CONTENT': synthetic_contents(min(rows, 3746))}))
+    base = base.drop(columns='CONTENT')
+    return pd.concat([base] * -(-rows // len(base)), ignore_index=True).iloc[:rows]
+
+
+def run_benchmark(scales=(10, 100), base_rows=3746):
+    """Time each engine on data scales x the size of the scraped archive."""
+    print("=" * 60)
+    print(f"CLEAN COLUMNS BENCHMARK ({len(COLUMNS_TO_CLEAN)} columns, engines: {', '.join(ENGINES)})")
+    print("=" * 60)
+
+    for scale in scales:
+        rows = base_rows * scale
+        df = synthetic_structured(rows)
+        print(f"   {scale}x ({rows:,} rows, {rows * len(COLUMNS_TO_CLEAN):,} cells)")
+
+        reference = None
+        for engine in ENGINES:
+            if engine == 'arrow' and pa is None:
+                print(f"      {engine:<6} skipped (pyarrow not installed)")
+                continue
+            frame = df.copy()
+            start = time.perf_counter()
+            frame = clean_frame(frame, engine)
+            elapsed = time.perf_counter() - start
+            if reference is None:
+                reference, baseline = frame, elapsed
+                parity = 'reference'
+            else:
+                parity = 'identical' if frame.equals(reference) else 'DIFFERENT'
+            print(f"      {engine:<6} {elapsed:6.2f}s  {rows / elapsed:9,.0f} rows/sec  "
+                  f"({baseline / elapsed:.1f}x)  {parity}")
+            del frame
+
+
 def main():
-    input_file = "Scraping turnbackhoax.id - Structured.csv"
-    output_file = "Scraping turnbackhoax.id - Cleaned.csv"
-    
-    columns_to_clean = [
-        'KATEGORI', 'SUMBER', 'NARASI', 'PENJELASAN', 
-        'REFERENSI', 'FAKTA', 'SALAH'
-    ]
+    parser = argparse.ArgumentParser(description="Clean the extracted section columns")
+    parser.add_argument('input_file', nargs='?', default="Scraping turnbackhoax.id - Structured.csv")
+    parser.add_argument('output_file', nargs='?', default="Scraping turnbackhoax.id - Cleaned.csv")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes cleaning chunks in parallel (default: 1)")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help=f"rows per chunk (default: whole file, or {CHUNKSIZE} with --workers > 1)")
+    parser.add_argument('--engine', choices=ENGINES, default=DEFAULT_ENGINE,
+                        help=f"cleaning engine (default: {DEFAULT_ENGINE})")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="time the engines on synthetic data 10x and 100x the archive")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark()
+        return
+    if args.engine == 'arrow' and pa is None:
+        parser.error("the arrow engine needs pyarrow")
+
+    input_file = args.input_file
+    output_file = args.output_file
+    chunksize = args.chunksize or (CHUNKSIZE if args.workers > 1 else None)
     
     print(f"Reading {input_file}...")
     try:
-        df = pd.read_csv(input_file)
+        columns = read_header(input_file)
     except Exception as e:
         print(f"Error reading CSV: {e}")
         sys.exit(1)
         
-    print("Cleaning columns...")
-    for col in columns_to_clean:
-        if col in df.columns:
-            print(f"Cleaning {col}...")
-            df[col] = df[col].apply(clean_text)
+    print(f"Cleaning columns {[col for col in COLUMNS_TO_CLEAN if col in columns]} "
+          f"({args.engine} engine, {args.workers} workers)...")
+    transform = functools.partial(clean_frame, engine=args.engine)
+    rows = process_csv(input_file, output_file, transform, args.workers, chunksize)
             
-    print(f"Saving to {output_file}...")
-    df.to_csv(output_file, index=False)
+    print(f"Saved {rows} rows to {output_file}")
     print("Done.")
 
 if __name__ == "__main__":
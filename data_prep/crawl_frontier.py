@@ -0,0 +1,164 @@
+"""
+Persistent crawl frontier for incremental turnbackhoax.id scrapes.
+
+Records every listing page and article URL the crawlers have seen in SQLite,
+together with its fetch status, ETag and Last-Modified, so re-runs can send
+conditional GETs and stop paging as soon as they reach already-known hoaxes.
+
+Usage:
+    python3 crawl_frontier.py [crawl_frontier.db]     # print a status summary
+"""
+
+import sqlite3
+import sys
+import threading
+import time
+
+FRONTIER_DB = "crawl_frontier.db"
+
+# Fetch states
+SEEN = 'seen'                  # discovered on a listing page, not fetched yet
+FETCHED = 'fetched'            # 200 response stored
+NOT_MODIFIED = 'not_modified'  # 304 on the last conditional GET
+ERROR = 'error'                # last fetch failed
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    http_status INTEGER,
+    etag TEXT,
+    last_modified TEXT,
+    first_seen REAL NOT NULL,
+    last_fetched REAL
+);
+CREATE INDEX IF NOT EXISTS idx_urls_kind_status ON urls (kind, status);
+"""
+
+
+class CrawlFrontier:
+    """SQLite-backed record of seen URLs, shared safely between fetcher threads."""
+
+    def __init__(self, path=FRONTIER_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def known_urls(self, urls):
+        """Subset of urls already recorded in the frontier."""
+        urls = list(urls)
+        known = set()
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT url FROM urls WHERE url IN ({placeholders})", chunk
+                ).fetchall()
+                known.update(row[0] for row in rows)
+        return known
+
+    def add_seen(self, urls, kind='article'):
+        """Record newly discovered URLs; already-known URLs are left untouched."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO urls (url, kind, status, first_seen) VALUES (?, ?, ?, ?)",
+                [(url, kind, SEEN, now) for url in urls],
+            )
+            self._conn.commit()
+
+    def conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since headers from the last successful fetch."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified FROM urls WHERE url = ?", (url,)
+            ).fetchone()
+        headers = {}
+        if row:
+            etag, last_modified = row
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def record_fetch(self, url, kind, http_status, etag=None, last_modified=None):
+        """
+        Store the outcome of a fetch.
+
+        A 304 keeps the stored validators; a 200 replaces them; anything else
+        is recorded as an error.
+        """
+        if http_status == 304:
+            status = NOT_MODIFIED
+        elif http_status is not None and 200 <= http_status < 300:
+            status = FETCHED
+        else:
+            status = ERROR
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO urls (url, kind, status, first_seen) VALUES (?, ?, ?, ?)",
+                (url, kind, status, now),
+            )
+            if status == FETCHED:
+                self._conn.execute(
+                    "UPDATE urls SET status = ?, http_status = ?, etag = ?, last_modified = ?, "
+                    "last_fetched = ? WHERE url = ?",
+                    (status, http_status, etag, last_modified, now, url),
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE urls SET status = ?, http_status = ?, last_fetched = ? WHERE url = ?",
+                    (status, http_status, now, url),
+                )
+            self._conn.commit()
+
+    def pending_urls(self, kind='article'):
+        """URLs of the given kind that still need a (successful) fetch, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM urls WHERE kind = ? AND status IN (?, ?) ORDER BY first_seen, rowid",
+                (kind, SEEN, ERROR),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def summary(self):
+        """Counts of URLs per (kind, status)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, status, COUNT(*) FROM urls GROUP BY kind, status ORDER BY kind, status"
+            ).fetchall()
+        return {(kind, status): count for kind, status, count in rows}
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else FRONTIER_DB
+    with CrawlFrontier(path) as frontier:
+        summary = frontier.summary()
+    if not summary:
+        print(f"{path}: empty frontier")
+        return
+    print(f"Frontier: {path}")
+    for (kind, status), count in summary.items():
+        print(f"   {kind:<8} {status:<13} {count:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,85 +1,227 @@
+import argparse
+import hashlib
+import json
+import os
 import pandas as pd
 import re
+import string
 import sys
 
+from chunked_csv import CHUNKSIZE, process_csv, read_header
+
+# Section tags look like [TAG] (group 1) or TAG : (group 2).
+# "FAKTA :" can also appear inside normal text, so the tags are filtered
+# and merged after parsing (see structure_frame).
+SECTION_PATTERN = re.compile(r'(?:\[([A-Z\s]+)\]|\b([A-Z]+)\s*:)')
+
+_UPPERCASE = frozenset(string.ascii_uppercase)
+
+
+def _is_word(char):
+    # What \w matches in a str pattern
+    return char.isalnum() or char == '_'
+
+
+def _scan_tags(text):
+    r"""
+    Yield (tag, match_start, match_end) for the matches SECTION_PATTERN.finditer
+    would find, without running the regex over every character.
+
+    Every tag ends in ']' or ':', so str.find jumps between those and each
+    candidate is checked locally: '[' + [A-Z\s]+ + ']', or a word-initial
+    [A-Z]+ run + optional whitespace + ':'. Neither kind can contain '[' or ':',
+    so candidates never overlap and position order is the regex's scan order.
+    """
+    length = len(text)
+    find = text.find
+    bracket = find('[')
+    colon = find(':')
+    while bracket != -1 or colon != -1:
+        if colon == -1 or (bracket != -1 and bracket < colon):
+            end = bracket + 1
+            while end < length and (text[end] in _UPPERCASE or text[end].isspace()):
+                end += 1
+            if end > bracket + 1 and end < length and text[end] == ']':
+                yield text[bracket + 1:end], bracket, end + 1
+            bracket = find('[', bracket + 1)
+        else:
+            word_end = colon
+            while word_end > 0 and text[word_end - 1].isspace():
+                word_end -= 1
+            start = word_end
+            while start > 0 and text[start - 1] in _UPPERCASE:
+                start -= 1
+            if start < word_end and (start == 0 or not _is_word(text[start - 1])):
+                yield text[start:word_end], start, colon + 1
+            colon = find(':', colon + 1)
+
+
+def iter_sections(text):
+    """
+    Scan text once and yield (tag, start, end) for every section, in order.
+
+    start/end are offsets of the section body in text (unstripped), so no
+    body is copied until the caller slices.
+    """
+    tags = _scan_tags(text)
+    current = next(tags, None)
+    while current is not None:
+        following = next(tags, None)
+        end = following[1] if following is not None else len(text)
+        yield current[0].strip(), current[2], end
+        current = following
+
+
 def parse_content(text):
+    """Map each section tag in CONTENT to its stripped text; later tags win."""
     if not isinstance(text, str):
         return {}
-    
-    # Regex to find tags like [TAG]
-    # Captures the tag name (without brackets)
-    # We use a lookahead or split approach.
-    # re.split with capturing group returns [text_before, tag, text_after, tag, text_after...]
-    
-    # Pattern to find tags:
-    # 1. [TAG] -> \[([A-Z\s]+)\]
-    # 2. TAG : -> ([A-Z]+)\s*:
-    # We combine them. We need to be careful not to match normal words.
-    # The "TAG :" format usually has specific keywords like SUMBER, NARASI, PENJELASAN.
-    # Let's try to match the specific ones we know or just Capitalized words followed by colon.
-    # But "FAKTA :" might appear in text.
-    # Let's stick to the user's list plus common ones if possible, or just use a generic pattern and filter later.
-    # Given the plan mentions "Narasi:...", let's try to capture that.
-    
-    # Regex:
-    # \[([A-Z\s]+)\]  <-- matches [TAG]
-    # |
-    # \b([A-Z]+)\s*:  <-- matches TAG : (word boundary start)
-    
-    pattern = r'(?:\[([A-Z\s]+)\]|\b([A-Z]+)\s*:)'
-    
-    # re.split will return None for the non-matching group in the pair.
-    # e.g. if [TAG] matches, group 1 is TAG, group 2 is None.
-    parts = re.split(pattern, text)
-    
-    # parts structure will be:
-    # [text, tag1_group1, tag1_group2, text, tag2_group1, tag2_group2, text...]
-    
+
+    result = {}
+    for tag, start, end in iter_sections(text):
+        result[tag] = text[start:end].strip()
+    return result
+
+
+def parse_content_split(text):
+    """The original re.split implementation, kept as the benchmark's reference."""
+    if not isinstance(text, str):
+        return {}
+
+    # parts = [text_before, tag_bracket, tag_colon, text_after, tag_bracket, ...]
+    parts = re.split(SECTION_PATTERN, text)
     result = {}
-    
-    # Iterate with step 3 because each split adds 2 capturing groups + 1 text chunk
-    # parts[0] = text before first tag
-    # parts[1] = group 1 (bracketed)
-    # parts[2] = group 2 (colon)
-    # parts[3] = text after first tag
-    
     for i in range(1, len(parts), 3):
         tag_bracket = parts[i]
         tag_colon = parts[i+1]
         content = parts[i+2].strip() if i+2 < len(parts) else ""
-        
+
         tag = tag_bracket if tag_bracket else tag_colon
         if tag:
             tag = tag.strip()
             result[tag] = content
-            
+
     return result
 
-def main():
-    input_file = "Scraping turnbackhoax.id - Complete.csv"
-    output_file = "Scraping turnbackhoax.id - Structured.csv"
-    
-    print(f"Reading {input_file}...")
-    try:
-        df = pd.read_csv(input_file)
-    except Exception as e:
-        print(f"Error reading CSV: {e}")
-        sys.exit(1)
-        
-    if 'CONTENT' not in df.columns:
-        print("Error: 'CONTENT' column not found.")
+
+SYNTHETIC_TEMPLATES = [
+    "[KATEGORI] : {category}\n\n=======\n\n[SUMBER] : Facebook\nhttps://facebook.com/{i}\n\n=======\n\n"
+    "[NARASI] : \u201c{words} \u201d\n\n=======\n\n[PENJELASAN] : {long}\n\n=======\n\n"
+    "[REFERENSI] :\nhttps://cekfakta.example/{i}",
+    "SALAH: {category}\nSUMBER: Twitter, WhatsApp\nNARASI: {words}\nPENJELASAN: {long} Baca juga URL: "
+    "https://example.com/{i}\nFAKTANYA: {words}",
+    "[SALAH] {words}\n\n[NARASII] :\n\u201c{words}\u201d\n\n[FAKTA] : {long}\n\n[ REFERENSI ] "
+    "https://cekfakta.example/{i}",
+    "Hasil periksa fakta {words}. {long}",
+]
+
+
+def synthetic_contents(count):
+    """CONTENT strings mixing the tag styles seen in the scraped data."""
+    from local_site import SAMPLE_WORDS
+
+    contents = []
+    for i in range(count):
+        words = ' '.join(SAMPLE_WORDS[(i * 7 + k * 3) % len(SAMPLE_WORDS)] for k in range(40))
+        long_text = ' '.join([words.capitalize() + '.'] * 6)
+        template = SYNTHETIC_TEMPLATES[i % len(SYNTHETIC_TEMPLATES)]
+        contents.append(template.format(i=i, category='Konten yang Menyesatkan', words=words, long=long_text))
+    return contents
+
+
+def run_benchmark(scale=100, base_rows=3760):
+    """Compare the section scanner with re.split on a synthetic corpus."""
+    import time
+
+    contents = synthetic_contents(base_rows) * scale
+    print("=" * 60)
+    print(f"SECTION SCANNER BENCHMARK ({len(contents):,} CONTENT values, "
+          f"{sum(map(len, contents)) / 1e6:.0f} MB)")
+    print("=" * 60)
+
+    timings = {}
+    outputs = {}
+    for name, function in (('re.split', parse_content_split), ('scanner', parse_content)):
+        start = time.perf_counter()
+        outputs[name] = [function(text) for text in contents]
+        timings[name] = time.perf_counter() - start
+        print(f"   {name:<9} {timings[name]:6.2f}s  {len(contents) / timings[name]:9,.0f} rows/sec")
+
+    identical = outputs['re.split'] == outputs['scanner']
+    print(f"   Speedup: {timings['re.split'] / timings['scanner']:.2f}x, "
+          f"output {'identical' if identical else 'DIFFERENT'}")
+    if not identical:
         sys.exit(1)
+
+
+TARGET_COLUMNS = ['KATEGORI', 'SUMBER', 'NARASI', 'PENJELASAN', 'REFERENSI', 'FAKTA', 'SALAH']
+
+# HOAX_TEXT is the hoax narrative used by topic modeling, sentiment and the
+# text networks: [NARASI] (or "Narasi:") with ===== separators removed,
+# falling back to TITLE when that is missing or too short.
+NARASI_TAG_PATTERN = re.compile(r'\[NARASI\]\s*:?\s*(.*?)(?:\[|$)', re.IGNORECASE | re.DOTALL)
+NARASI_LABEL_PATTERN = re.compile(r'(?:NARASI|Narasi)\s*:\s*(.*?)(?:\[|={3}|$)', re.DOTALL)
+SEPARATOR_PATTERN = re.compile(r'={3,}.*?={3,}')
+MIN_HOAX_TEXT_LENGTH = 11
+
+# Everything that decides the extracted columns. Its hash is written to every
+# row as EXTRACTOR_VERSION, so a changed rule shows up as a stale output.
+EXTRACTOR_CONFIG = {
+    'section_pattern': SECTION_PATTERN.pattern,
+    'target_columns': TARGET_COLUMNS,
+    'merged_tags': {'NARASII': 'NARASI', 'FAKTANYA': 'FAKTA'},
+    'narasi_patterns': [NARASI_TAG_PATTERN.pattern, NARASI_LABEL_PATTERN.pattern],
+    'separator_pattern': SEPARATOR_PATTERN.pattern,
+    'min_hoax_text_length': MIN_HOAX_TEXT_LENGTH,
+}
+EXTRACTOR_VERSION = hashlib.sha256(json.dumps(EXTRACTOR_CONFIG, sort_keys=True).encode()).hexdigest()[:12]
+OUTPUT_COLUMNS = TARGET_COLUMNS + ['HOAX_TEXT', 'EXTRACTOR_VERSION']
+
+
+def extract_hoax_text(content_text, title_fallback):
+    """
+    Extract NARASI (hoax narrative) from CONTENT field.
+    
+    Args:
+        content_text: The CONTENT column text
+        title_fallback: The TITLE to use if NARASI not found
         
-    print("Extracting content structure...")
+    Returns:
+        Extracted hoax text (NARASI or TITLE fallback)
+    """
+    if not isinstance(content_text, str):
+        return title_fallback
+    
+    for pattern in (NARASI_TAG_PATTERN, NARASI_LABEL_PATTERN):
+        match = pattern.search(content_text)
+        if match:
+            # Clean up common separators
+            narasi_text = SEPARATOR_PATTERN.sub('', match.group(1).strip()).strip()
+            if len(narasi_text) >= MIN_HOAX_TEXT_LENGTH:
+                return narasi_text
+    
+    return title_fallback
+
+
+def read_extractor_version(path):
+    """EXTRACTOR_VERSION of a structured CSV, None if absent or mixed."""
+    try:
+        versions = pd.read_csv(path, usecols=['EXTRACTOR_VERSION'], dtype=str)['EXTRACTOR_VERSION']
+    except (OSError, ValueError):
+        return None
+    versions = versions.unique()
+    return versions[0] if len(versions) == 1 else None
+
+
+def structure_frame(df):
+    """Parse CONTENT into the section columns and append them to df."""
     # Apply parsing
     extracted_data = df['CONTENT'].apply(parse_content)
     
-    # Convert list of dicts to DataFrame
-    extracted_df = pd.DataFrame(extracted_data.tolist())
+    # Convert list of dicts to DataFrame, aligned with df (chunks don't start at 0)
+    extracted_df = pd.DataFrame(extracted_data.tolist(), index=df.index)
     
     # Column merging logic
-    print("Refining columns...")
-    
     # Combine NARASI and NARASII (if exists)
     if 'NARASII' in extracted_df.columns:
         if 'NARASI' not in extracted_df.columns:
@@ -95,25 +237,68 @@ def main():
     if 'FAKTANYA' in extracted_df.columns:
         extracted_df['FAKTA'] = extracted_df['FAKTA'].combine_first(extracted_df['FAKTANYA'])
         
-    # Define columns to keep
-    target_columns = ['KATEGORI', 'SUMBER', 'NARASI', 'PENJELASAN', 'REFERENSI', 'FAKTA', 'SALAH']
-    
     # Ensure all target columns exist (fill with NaN if missing)
-    for col in target_columns:
+    for col in TARGET_COLUMNS:
         if col not in extracted_df.columns:
             extracted_df[col] = None
             
     # Filter extracted_df to only these columns
-    extracted_df = extracted_df[target_columns]
+    extracted_df = extracted_df[TARGET_COLUMNS].copy()
+    
+    titles = df['TITLE'] if 'TITLE' in df.columns else pd.Series(None, index=df.index)
+    extracted_df['HOAX_TEXT'] = [extract_hoax_text(content, title)
+                                 for content, title in zip(df['CONTENT'], titles)]
+    extracted_df['EXTRACTOR_VERSION'] = EXTRACTOR_VERSION
     
     # Merge with original DataFrame
     # We want to keep original columns and add new ones
-    result_df = pd.concat([df, extracted_df], axis=1)
+    return pd.concat([df.drop(columns=OUTPUT_COLUMNS, errors='ignore'), extracted_df], axis=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split CONTENT into section columns")
+    parser.add_argument('input_file', nargs='?', default="Scraping turnbackhoax.id - Complete.csv")
+    parser.add_argument('output_file', nargs='?', default="Scraping turnbackhoax.id - Structured.csv")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes parsing chunks in parallel (default: 1)")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help=f"rows per chunk (default: whole file, or {CHUNKSIZE} with --workers > 1)")
+    parser.add_argument('--force', action='store_true',
+                        help="re-extract even if the output is already up to date")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="compare the section scanner with the re.split parser")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark()
+        return
+
+    input_file = args.input_file
+    output_file = args.output_file
+    chunksize = args.chunksize or (CHUNKSIZE if args.workers > 1 else None)
     
-    print(f"Extracted columns kept: {extracted_df.columns.tolist()}")
+    if (not args.force and os.path.exists(output_file) and os.path.exists(input_file)
+            and os.path.getmtime(output_file) >= os.path.getmtime(input_file)
+            and read_extractor_version(output_file) == EXTRACTOR_VERSION):
+        print(f"{output_file} is up to date (extractor {EXTRACTOR_VERSION}); use --force to rebuild")
+        return
+    
+    print(f"Reading {input_file}...")
+    try:
+        columns = read_header(input_file)
+    except Exception as e:
+        print(f"Error reading CSV: {e}")
+        sys.exit(1)
+        
+    if 'CONTENT' not in columns:
+        print("Error: 'CONTENT' column not found.")
+        sys.exit(1)
+        
+    print(f"Extracting content structure (extractor {EXTRACTOR_VERSION}, {args.workers} workers)...")
+    rows = process_csv(input_file, output_file, structure_frame, args.workers, chunksize)
     
-    print(f"Saving to {output_file}...")
-    result_df.to_csv(output_file, index=False)
+    print(f"Extracted columns kept: {OUTPUT_COLUMNS}")
+    print(f"Saved {rows} rows to {output_file}")
     print("Done.")
 
 if __name__ == "__main__":
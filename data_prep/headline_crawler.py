@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Asynchronous headline crawler for turnbackhoax.id listing pages.
+
+Replaces the sequential scrape_all_pages loop from Scraping_Turn_Back_Hoax.ipynb.
+Pages are fetched concurrently over one pooled keep-alive session, with a cap on
+in-flight requests and a per-host adaptive rate limit (rate_limiter.py) that
+speeds up while the server keeps up and backs off on 429/503 and Retry-After.
+
+Usage:
+    python3 headline_crawler.py [--start 39] [--end 226] [--concurrency 8] [--delay 0.25]
+    python3 headline_crawler.py --frontier crawl_frontier.db --incremental
+    python3 headline_crawler.py --parser lxml
+    python3 headline_crawler.py --stream headline_results   # commit pages as they arrive, resumable
+    python3 headline_crawler.py --benchmark
+"""
+
+import argparse
+import asyncio
+import contextlib
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+import pandas as pd
+import pyarrow as pa
+
+from crawl_frontier import CrawlFrontier
+from rate_limiter import MAX_RETRIES, THROTTLE_STATUSES, AdaptiveRateLimiter, rate_for_delay
+from result_writer import ResultWriter, export_csv, iter_parts
+from turnbackhoax_parser import (BACKENDS, BASE_URL, DEFAULT_BACKEND, HEADERS, LISTING_COLUMNS,
+                                 listing_page_url, parse_listing_page)
+
+START_PAGE = 39
+END_PAGE = 226
+CONCURRENCY = 8
+PER_HOST_CONCURRENCY = 4
+PER_HOST_DELAY = 0.25  # initial seconds between request starts on the same host
+REQUEST_TIMEOUT = 30
+
+HEADLINE_SCHEMA = pa.schema([(column, pa.string()) for column in LISTING_COLUMNS] +
+                            [('page_number', pa.int64())])
+
+
+class HostPoliteness:
+    """Caps concurrent requests and rate-limits request starts, per host."""
+
+    def __init__(self, max_concurrent=PER_HOST_CONCURRENCY, min_interval=PER_HOST_DELAY):
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._semaphores = {}
+        self.limiters = {}
+
+    @contextlib.asynccontextmanager
+    async def slot(self, url):
+        """
+        Wait for this host's turn, then hold one of its connection slots.
+
+        Yields the host's AdaptiveRateLimiter, which expects the response
+        outcome through record().
+        """
+        host = urlsplit(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_concurrent)
+            self.limiters[host] = AdaptiveRateLimiter(rate_for_delay(self.min_interval))
+
+        async with self._semaphores[host]:
+            await self.limiters[host].acquire_async()
+            yield self.limiters[host]
+
+    def describe(self):
+        """Rate limiter summary for every host seen so far."""
+        return '; '.join(f"{host}: {limiter.describe()}" for host, limiter in self.limiters.items())
+
+
+def create_session(concurrency=CONCURRENCY, per_host=PER_HOST_CONCURRENCY):
+    """Pooled keep-alive session shared by all requests of a crawl."""
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host, keepalive_timeout=30)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=HEADERS)
+
+
+async def fetch_page(session, url, politeness, headers=None):
+    """
+    GET one URL under the host's politeness rules.
+
+    Throttled responses (429/503) are retried up to MAX_RETRIES times after
+    the limiter's backoff.
+
+    Returns:
+        (status, body, etag, last_modified); body is None for a 304
+    """
+    loop = asyncio.get_running_loop()
+    for attempt in range(MAX_RETRIES + 1):
+        async with politeness.slot(url) as limiter:
+            start = loop.time()
+            try:
+                response = await session.get(url, headers=headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                limiter.record(None)
+                raise
+            async with response:
+                limiter.record(response.status, loop.time() - start, response.headers.get('Retry-After'))
+                if response.status in THROTTLE_STATUSES and attempt < MAX_RETRIES:
+                    continue
+                if response.status == 304:
+                    return 304, None, None, None
+                response.raise_for_status()
+                content = await response.read()
+                return (response.status, content,
+                        response.headers.get('ETag'), response.headers.get('Last-Modified'))
+
+
+async def fetch_listing_page(session, page_number, politeness, base_url=BASE_URL, parser=DEFAULT_BACKEND):
+    """
+    Fetch and parse one listing page.
+
+    Returns:
+        DataFrame of headlines with a page_number column, or None on failure
+    """
+    url = listing_page_url(page_number, base_url)
+    try:
+        _, content, _, _ = await fetch_page(session, url, politeness)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"\nError on page {page_number}: {e!r}")
+        return None
+
+    try:
+        df = parse_listing_page(content, parser)
+    except Exception as e:
+        print(f"\nUnexpected error on page {page_number}: {e}")
+        return None
+
+    df['page_number'] = page_number
+    return df
+
+
+async def crawl_pages(start_page=START_PAGE, end_page=END_PAGE, base_url=BASE_URL,
+                      concurrency=CONCURRENCY, per_host=PER_HOST_CONCURRENCY,
+                      delay=PER_HOST_DELAY, progress=True, parser=DEFAULT_BACKEND, writer=None):
+    """
+    Crawl a range of listing pages concurrently.
+
+    Args:
+        start_page, end_page: Inclusive page range
+        base_url: Site root (point this at a local_site server for testing)
+        concurrency: Maximum requests in flight overall
+        per_host: Maximum requests in flight per host
+        delay: Initial seconds between request starts on the same host (adapts)
+        progress: Print a running page counter
+        parser: turnbackhoax_parser backend ('bs4', 'strainer' or 'lxml')
+        writer: Optional ResultWriter keyed on page_number. Pages it already
+            holds are skipped, and each scraped page is committed to it
+            instead of being kept in memory.
+
+    Returns:
+        DataFrame with the notebook's title/url/preview/image_url/date/author
+        columns plus page_number, ordered by page (empty when writer is given)
+    """
+    politeness = HostPoliteness(max_concurrent=min(per_host, concurrency), min_interval=delay)
+    pages = list(range(start_page, end_page + 1))
+    if writer is not None:
+        committed = writer.completed_keys()
+        pages = [page_number for page_number in pages if page_number not in committed]
+        if progress and committed:
+            print(f"   Resuming: {len(committed)} pages already committed, {len(pages)} to go")
+    done = 0
+
+    async with create_session(concurrency, per_host) as session:
+        async def fetch(page_number):
+            nonlocal done
+            df = await fetch_listing_page(session, page_number, politeness, base_url, parser)
+            done += 1
+            if writer is not None and df is not None:
+                writer.write(df)
+                df = None
+            if progress:
+                print(f"   Scraped {done}/{len(pages)} pages ({politeness.describe()})...    ", end='\r')
+            return df
+
+        frames = await asyncio.gather(*(fetch(page_number) for page_number in pages))
+
+    if writer is not None:
+        writer.flush()
+    if progress:
+        print()
+        print(f"   Rate limiter: {politeness.describe()}")
+
+    frames = [df for df in frames if df is not None and not df.empty]
+    if not frames:
+        return pd.DataFrame(columns=LISTING_COLUMNS + ['page_number'])
+    return pd.concat(frames, ignore_index=True)
+
+
+async def crawl_new_headlines(frontier, start_page=1, end_page=END_PAGE, base_url=BASE_URL,
+                              concurrency=CONCURRENCY, per_host=PER_HOST_CONCURRENCY,
+                              delay=PER_HOST_DELAY, window=4, parser=DEFAULT_BACKEND):
+    """
+    Crawl from the newest listing page until reaching already-known hoaxes.
+
+    The newest page is probed alone, then pages are requested in windows of
+    `window` pages, all with conditional GETs (validators from the frontier).
+    Paging stops at the first page that answers 304 or lists no URL missing
+    from the frontier. Nothing that would hide these headlines from the next
+    run is written here: commit_new_headlines stores the new URLs and the
+    listing validators once the headlines are saved.
+
+    Returns:
+        (DataFrame of new headlines, number of listing requests made,
+         (url, status, etag, last_modified) of every listing page parsed)
+    """
+    politeness = HostPoliteness(max_concurrent=min(per_host, concurrency), min_interval=delay)
+    frames = []
+    fetched = []
+    found = set()
+    requests_made = 0
+
+    async with create_session(concurrency, per_host) as session:
+        async def fetch(page_number):
+            url = listing_page_url(page_number, base_url)
+            try:
+                return url, await fetch_page(session, url, politeness, frontier.conditional_headers(url))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"\nError on page {page_number}: {e!r}")
+                return url, None
+
+        page_number = start_page
+        stop = False
+        while page_number <= end_page and not stop:
+            # Probe the newest page alone first: on a quiet day that is the only request
+            size = 1 if page_number == start_page else window
+            pages = range(page_number, min(page_number + size, end_page + 1))
+            results = await asyncio.gather(*(fetch(p) for p in pages))
+            requests_made += len(pages)
+
+            for p, (url, result) in zip(pages, results):
+                if result is None:
+                    frontier.record_fetch(url, 'listing', None)
+                    continue
+                status, content, etag, last_modified = result
+                if status == 304:
+                    frontier.record_fetch(url, 'listing', status)
+                    print(f"   Page {p}: not modified, stopping")
+                    stop = True
+                    break
+
+                try:
+                    df = parse_listing_page(content, parser)
+                except Exception as e:
+                    # Recorded as failed without its validators, so the next run fetches it again
+                    print(f"\nUnexpected error on page {p}: {e}")
+                    frontier.record_fetch(url, 'listing', None)
+                    continue
+                fetched.append((url, status, etag, last_modified))
+                df['page_number'] = p
+                known = frontier.known_urls(df['url']) | found
+                new_df = df[~df['url'].isin(known)]
+                print(f"   Page {p}: {len(new_df)} new of {len(df)}")
+                if new_df.empty:
+                    stop = True
+                    break
+                found.update(new_df['url'])
+                frames.append(new_df)
+
+            page_number += size
+
+    if not frames:
+        return pd.DataFrame(columns=LISTING_COLUMNS + ['page_number']), requests_made, fetched
+    return pd.concat(frames, ignore_index=True), requests_made, fetched
+
+
+def commit_new_headlines(frontier, new_df, fetched):
+    """Add the new URLs to the frontier as SEEN, then store the listing pages' validators."""
+    frontier.add_seen(new_df['url'], 'article')
+    for url, status, etag, last_modified in fetched:
+        frontier.record_fetch(url, 'listing', status, etag, last_modified)
+
+
+def save_headlines(df):
+    """Write headlines to a timestamped CSV, like the notebook did."""
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    filename = f'turnbackhoax_data_{timestamp}.csv'
+    df.to_csv(filename, index=False)
+    return filename
+
+
+def stream_all_pages(stream_dir, start_page=START_PAGE, end_page=END_PAGE, base_url=BASE_URL,
+                     concurrency=CONCURRENCY, delay=PER_HOST_DELAY, frontier=None,
+                     parser=DEFAULT_BACKEND):
+    """
+    Crawl the page range committing each page to stream_dir, then export a
+    timestamped CSV from the committed parts. Rerunning after a crash only
+    fetches the pages that were not committed.
+    """
+    with ResultWriter(stream_dir, HEADLINE_SCHEMA, 'page_number') as writer:
+        asyncio.run(crawl_pages(start_page, end_page, base_url, concurrency=concurrency,
+                                delay=delay, parser=parser, writer=writer))
+
+    if frontier is not None:
+        for df in iter_parts(stream_dir, ['url']):
+            frontier.add_seen(df['url'], 'article')
+
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    filename = f'turnbackhoax_data_{timestamp}.csv'
+    total = export_csv(stream_dir, filename)
+
+    print(f"\nScraping completed successfully!")
+    print(f"Total articles scraped: {total}")
+    print(f"Data saved to: {filename}")
+    return filename
+
+
+def scrape_all_pages(start_page=START_PAGE, end_page=END_PAGE, base_url=BASE_URL,
+                     concurrency=CONCURRENCY, delay=PER_HOST_DELAY, frontier=None,
+                     parser=DEFAULT_BACKEND):
+    """
+    Crawl the page range and save a timestamped CSV.
+
+    When a frontier is given, every scraped URL is recorded in it so later
+    incremental runs know where to stop.
+    """
+    final_df = asyncio.run(crawl_pages(start_page, end_page, base_url,
+                                       concurrency=concurrency, delay=delay, parser=parser))
+
+    if final_df.empty:
+        print("\nNo data was scraped successfully.")
+        return None
+
+    if frontier is not None:
+        frontier.add_seen(final_df['url'], 'article')
+
+    filename = save_headlines(final_df)
+
+    print(f"\nScraping completed successfully!")
+    print(f"Total articles scraped: {len(final_df)}")
+    print(f"Data saved to: {filename}")
+
+    return final_df
+
+
+def scrape_new_pages(frontier, base_url=BASE_URL, concurrency=CONCURRENCY, delay=PER_HOST_DELAY,
+                     parser=DEFAULT_BACKEND):
+    """
+    Incremental crawl: save only headlines not yet in the frontier.
+
+    The frontier is only updated after the CSV is written, so an interrupted
+    run finds the same headlines again next time.
+    """
+    new_df, requests_made, fetched = asyncio.run(crawl_new_headlines(
+        frontier, base_url=base_url, concurrency=concurrency, delay=delay, parser=parser))
+
+    print(f"\nListing requests made: {requests_made}")
+    if new_df.empty:
+        commit_new_headlines(frontier, new_df, fetched)
+        print("No new hoaxes since the last run.")
+        return None
+
+    filename = save_headlines(new_df)
+    commit_new_headlines(frontier, new_df, fetched)
+    print(f"New articles found: {len(new_df)}")
+    print(f"Data saved to: {filename}")
+    return new_df
+
+
+def run_benchmark(pages=60, per_page=20, latency=0.05, levels=(1, 4, 8, 16)):
+    """Time crawls of a synthetic local site at several concurrency levels."""
+    from local_site import serve_site, write_fixture_site
+
+    print("=" * 60)
+    print(f"HEADLINE CRAWLER BENCHMARK ({pages} pages, {latency * 1000:.0f} ms server latency)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as root:
+        with serve_site(root, latency=latency) as base_url:
+            write_fixture_site(root, base_url, 1, pages, per_page)
+
+            for concurrency in levels:
+                start = time.perf_counter()
+                df = asyncio.run(crawl_pages(1, pages, base_url, concurrency=concurrency,
+                                             per_host=concurrency, delay=0.0, progress=False))
+                elapsed = time.perf_counter() - start
+                print(f"   concurrency={concurrency:<3} {len(df):>5} rows  "
+                      f"{elapsed:6.2f}s  {pages / elapsed:7.1f} pages/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl turnbackhoax.id listing pages")
+    parser.add_argument('--start', type=int, default=START_PAGE)
+    parser.add_argument('--end', type=int, default=END_PAGE)
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--delay', type=float, default=PER_HOST_DELAY,
+                        help="initial seconds between requests to the same host (adapts)")
+    parser.add_argument('--parser', choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help="HTML extraction backend (see parser_benchmark.py)")
+    parser.add_argument('--frontier', help="SQLite frontier file recording seen URLs")
+    parser.add_argument('--stream', metavar='DIR',
+                        help="commit pages to Parquet row groups in DIR as they arrive; "
+                             "rerunning with the same DIR resumes")
+    parser.add_argument('--incremental', action='store_true',
+                        help="start at page 1 and stop once a page has no new URLs (needs --frontier)")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="measure throughput against a local synthetic site")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark()
+        return
+    if args.incremental and not args.frontier:
+        parser.error("--incremental requires --frontier")
+
+    frontier = CrawlFrontier(args.frontier) if args.frontier else None
+
+    print("Starting the scraping process...")
+    if args.incremental:
+        df = scrape_new_pages(frontier, args.base_url, args.concurrency, args.delay, args.parser)
+    elif args.stream:
+        stream_all_pages(args.stream, args.start, args.end, args.base_url, args.concurrency, args.delay,
+                         frontier, args.parser)
+        df = None
+    else:
+        df = scrape_all_pages(args.start, args.end, args.base_url, args.concurrency, args.delay, frontier,
+                              args.parser)
+    if frontier is not None:
+        frontier.close()
+    if df is not None:
+        print("\nSample of scraped data:")
+        print(df.head())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Canonical, typed Parquet copy of the hoax dataset, partitioned by month, with
+a loader that reads only what a script asks for.
+
+The structured CSV (see extract_content.py) is converted once:
+    ID              int64
+    DATE            date32, parsed from '%d %b %Y' (unparseable dates are null)
+    CATEGORY,
+    LLM Category    dictionary-encoded (pandas categorical)
+    everything else string
+
+and written as a hive-partitioned directory, one directory per month:
+
+    <dataset>/year=2024/month=2/part-<batch>-0.parquet
+    <dataset>/year=__HIVE_DEFAULT_PARTITION__/...   rows without a date
+
+A time-window or year filter only opens the matching month directories, a
+category filter is applied while reading, and load_dataset reads only the
+requested columns: the February 2024 politics slice never touches another
+month or decodes CONTENT. New scrapes are appended as new part files in
+their months; nothing already written is rewritten.
+
+    from hoax_dataset import load_dataset
+    df = load_dataset(['TITLE', 'DATE', 'HOAX_TEXT'], start='2024-01-01', end='2024-02-29',
+                      categories=['politics'])
+
+Usage:
+    python3 hoax_dataset.py build [input_csv] [--output DIR] [--force]
+    python3 hoax_dataset.py append <csv> [--output DIR]
+    python3 hoax_dataset.py info [--output DIR]
+    python3 hoax_dataset.py benchmark [--scale 10]
+"""
+
+import argparse
+import datetime
+import functools
+import operator
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+STRUCTURED_CSV = "Scraping turnbackhoax.id - Structured.csv"
+DATASET_PATH = "Scraping turnbackhoax.id - Dataset"
+DATE_FORMAT = '%d %b %Y'
+CATEGORY_COLUMN = 'LLM Category'
+CATEGORICAL_COLUMNS = ['CATEGORY', CATEGORY_COLUMN]
+KEY_COLUMN = 'URL'  # rows already in the dataset are skipped on append
+ROW_GROUP_SIZE = 512
+COMPRESSION = 'zstd'
+
+PARTITION_SCHEMA = pa.schema([('year', pa.int16()), ('month', pa.int8())])
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor='hive')
+
+
+def dataset_schema(columns):
+    """Arrow schema for a CSV with these columns."""
+    fields = []
+    for name in columns:
+        if name == 'ID':
+            fields.append(pa.field(name, pa.int64()))
+        elif name == 'DATE':
+            fields.append(pa.field(name, pa.date32()))
+        elif name in CATEGORICAL_COLUMNS:
+            fields.append(pa.field(name, pa.dictionary(pa.int32(), pa.string())))
+        elif name in PARTITION_SCHEMA.names:
+            fields.append(PARTITION_SCHEMA.field(name))
+        else:
+            fields.append(pa.field(name, pa.string()))
+    return pa.schema(fields)
+
+
+def typed_table(df, columns=None):
+    """
+    Arrow table of a DataFrame read with dtype=str, sorted by DATE, with
+    year/month partition columns.
+
+    Args:
+        df: Rows of a Complete or Structured CSV
+        columns: Column set to conform to (missing ones become null, extra
+            ones are dropped); default df's own columns
+    """
+    df = df.copy()
+    if columns is not None:
+        df = df.reindex(columns=columns)
+    if 'ID' in df.columns:
+        df['ID'] = pd.to_numeric(df['ID'], errors='coerce').astype('Int64')
+    dates = pd.to_datetime(df['DATE'], format=DATE_FORMAT, errors='coerce')
+    order = dates.sort_values(kind='stable', na_position='first').index
+    df, dates = df.loc[order], dates.loc[order]
+    df['DATE'] = dates.dt.date
+    df['year'] = dates.dt.year.astype('Int16')
+    df['month'] = dates.dt.month.astype('Int8')
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return pa.Table.from_pandas(df, schema=dataset_schema(df.columns), preserve_index=False)
+
+
+def write_partitions(table, directory, row_group_size=ROW_GROUP_SIZE):
+    """Add table's rows to the month directories as new part files."""
+    # A fresh basename per batch, so an append never replaces an earlier file
+    batch = f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    ds.write_dataset(
+        table, directory, format='parquet', partitioning=PARTITIONING,
+        basename_template=f"part-{batch}-{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore',
+        file_options=ds.ParquetFileFormat().make_write_options(compression=COMPRESSION),
+        max_rows_per_group=row_group_size,
+    )
+
+
+def build_dataset(input_csv=STRUCTURED_CSV, output_path=DATASET_PATH, row_group_size=ROW_GROUP_SIZE):
+    """
+    Convert a Complete or Structured CSV into the canonical dataset,
+    replacing any previous one.
+
+    Returns:
+        Number of rows written
+    """
+    table = typed_table(pd.read_csv(input_csv, dtype=str))
+    tmp_path = output_path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    write_partitions(table, tmp_path, row_group_size)
+    shutil.rmtree(output_path, ignore_errors=True)
+    os.replace(tmp_path, output_path)
+    return table.num_rows
+
+
+def open_dataset(path=DATASET_PATH):
+    """pyarrow Dataset over the month partitions."""
+    return ds.dataset(path, format='parquet', partitioning=PARTITIONING)
+
+
+def data_columns(dataset):
+    """Stored columns, without the year/month partition keys."""
+    return [name for name in dataset.schema.names if name not in PARTITION_SCHEMA.names]
+
+
+def append_dataset(df, path=DATASET_PATH, key_column=KEY_COLUMN):
+    """
+    Add newly scraped rows, skipping any whose key is already stored.
+
+    Rows are conformed to the dataset's columns; run structure_frame first
+    so that HOAX_TEXT and the section columns are filled in.
+
+    Returns:
+        Number of rows appended
+    """
+    dataset = open_dataset(path)
+    columns = data_columns(dataset)
+    if key_column in columns and key_column in df.columns:
+        stored = set(dataset.to_table(columns=[key_column])[key_column].to_pylist())
+        df = df[~df[key_column].isin(stored)]
+    if df.empty:
+        return 0
+    write_partitions(typed_table(df, columns), path)
+    return len(df)
+
+
+def _as_date(value):
+    if value is None or isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value))
+
+
+def months_between(start, end):
+    """(year, month) pairs from start's month to end's month, inclusive."""
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def dataset_filter(years=None, categories=None, start=None, end=None):
+    """
+    Dataset expression for the given years, date window and LLM categories.
+
+    years and start/end become conditions on the year/month partition keys,
+    so non-matching month directories are never opened; start/end also bound
+    DATE itself for windows that don't fall on month boundaries.
+    """
+    conditions = []
+    if years is not None:
+        conditions.append(ds.field('year').isin(sorted(set(years))))
+    start, end = _as_date(start), _as_date(end)
+    if start is not None or end is not None:
+        first = start or datetime.date(1900, 1, 1)
+        last = end or datetime.date.today()
+        month_keys = [year * 100 + month for year, month in months_between(first, last)]
+        conditions.append((ds.field('year').cast(pa.int32()) * 100 + ds.field('month').cast(pa.int32()))
+                          .isin(month_keys))
+        if start is not None:
+            conditions.append(ds.field('DATE') >= pa.scalar(start, pa.date32()))
+        if end is not None:
+            conditions.append(ds.field('DATE') <= pa.scalar(end, pa.date32()))
+    if categories is not None:
+        conditions.append(ds.field(CATEGORY_COLUMN).isin(list(categories)))
+    return functools.reduce(operator.and_, conditions) if conditions else None
+
+
+def load_dataset(columns=None, years=None, categories=None, start=None, end=None, path=DATASET_PATH):
+    """
+    Read part of the canonical dataset.
+
+    Args:
+        columns: Columns to read (None for all stored columns); filters work on any column
+        years: Only rows dated in these years
+        categories: Only rows with these LLM Category values
+        start, end: Only rows dated in this window (inclusive; date or 'YYYY-MM-DD')
+        path: Dataset directory written by build_dataset
+
+    Returns:
+        DataFrame with DATE as datetime64 and categorical LLM Category
+    """
+    dataset = open_dataset(path)
+    if columns is None:
+        columns = data_columns(dataset)
+    table = dataset.to_table(columns=columns, filter=dataset_filter(years, categories, start, end))
+    return table.to_pandas(date_as_object=False)
+
+
+def count_files(path=DATASET_PATH, years=None, start=None, end=None):
+    """(files a query opens, files in the dataset)."""
+    dataset = open_dataset(path)
+    matching = dataset.get_fragments(filter=dataset_filter(years, None, start, end))
+    return len(list(matching)), len(dataset.files)
+
+
+def write_synthetic_structured_csv(path, rows):
+    """Structured-CSV-shaped file spread over 2018-2025, for benchmarks."""
+    from extract_content import structure_frame, synthetic_contents
+    from local_site import MONTHS
+
+    contents = synthetic_contents(min(rows, 3746))
+    categories = ['politics', 'scam', 'others']
+    df = pd.DataFrame({
+        'ID': range(1, rows + 1),
+        'URL': [f"https://turnbackhoax.id/post-{i}/" for i in range(rows)],
+        'TITLE': [f"[SALAH] Judul {i}" for i in range(rows)],
+        'CATEGORY': ['Salah' if i % 3 else 'Hoaks' for i in range(rows)],
+        'DATE': [f"{i % 28 + 1} {MONTHS[i % 12]} {2025 - i * 8 // rows}" for i in range(rows)],
+        'CONTENT': [contents[i % len(contents)] for i in range(rows)],
+        CATEGORY_COLUMN: [categories[i % 7 % 3] for i in range(rows)],
+    })
+    structure_frame(df).to_csv(path, index=False)
+
+
+def run_benchmark(scale=10, base_rows=3746):
+    """Load a month slice and the 2024 politics slice from the CSV and from the dataset."""
+    columns = ['TITLE', 'DATE', CATEGORY_COLUMN, 'HOAX_TEXT']
+    rows = base_rows * scale
+
+    print("=" * 60)
+    print(f"DATASET LOADER BENCHMARK ({rows:,} rows over 2018-2025)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'structured.csv')
+        dataset_path = os.path.join(tmp, 'dataset')
+        write_synthetic_structured_csv(csv_path, rows)
+        start = time.perf_counter()
+        build_dataset(csv_path, dataset_path)
+        size = sum(os.path.getsize(f) for f in open_dataset(dataset_path).files)
+        print(f"   build: {time.perf_counter() - start:.2f}s, CSV {os.path.getsize(csv_path) / 1e6:.1f} MB, "
+              f"Parquet {size / 1e6:.1f} MB in {len(open_dataset(dataset_path).files)} files")
+
+        slices = (
+            ("February 2024 (election month)", {'start': '2024-02-01', 'end': '2024-02-29'},
+             lambda dates: (dates >= '2024-02-01') & (dates <= '2024-02-29')),
+            ("2024 politics", {'years': [2024], 'categories': ['politics']},
+             lambda dates: dates.dt.year == 2024),
+        )
+        for label, query, date_mask in slices:
+            print(f"   {label}")
+
+            # What the network scripts did before
+            start = time.perf_counter()
+            df = pd.read_csv(csv_path)
+            df['DATE'] = pd.to_datetime(df['DATE'], format=DATE_FORMAT, errors='coerce')
+            df = df[date_mask(df['DATE'])]
+            if 'categories' in query:
+                df = df[df[CATEGORY_COLUMN].isin(query['categories'])]
+            csv_elapsed = time.perf_counter() - start
+            expected = sorted(df['TITLE'])
+            print(f"      full read_csv + to_datetime + filter  {csv_elapsed:6.3f}s  {len(df):,} rows")
+
+            opened, total = count_files(dataset_path, query.get('years'), query.get('start'), query.get('end'))
+            for name, kwargs in (("load_dataset, all columns", {}),
+                                 ("load_dataset, 4 columns", {'columns': columns})):
+                start = time.perf_counter()
+                df = load_dataset(path=dataset_path, **query, **kwargs)
+                elapsed = time.perf_counter() - start
+                same = sorted(df['TITLE']) == expected
+                print(f"      {name:<37} {elapsed:6.3f}s  {len(df):,} rows  ({csv_elapsed / elapsed:.0f}x, "
+                      f"{opened}/{total} files, {'same rows' if same else 'DIFFERENT rows'})")
+
+
+def print_info(path):
+    dataset = open_dataset(path)
+    months = dataset.to_table(columns=['year', 'month']).group_by(['year', 'month']).aggregate([])
+    print(f"{path}: {dataset.count_rows()} rows in {len(dataset.files)} files, {months.num_rows} months")
+    print(dataset.schema.to_string(show_schema_metadata=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Canonical typed, month-partitioned Parquet dataset")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help="convert the structured CSV to the partitioned dataset")
+    build.add_argument('input_csv', nargs='?', default=STRUCTURED_CSV)
+    build.add_argument('--output', default=DATASET_PATH)
+    build.add_argument('--force', action='store_true', help="rebuild even if the output is newer")
+
+    append = subparsers.add_parser('append', help="add new rows (Complete or Structured CSV)")
+    append.add_argument('input_csv')
+    append.add_argument('--output', default=DATASET_PATH)
+
+    info = subparsers.add_parser('info', help="row count, months and schema")
+    info.add_argument('--output', default=DATASET_PATH)
+
+    benchmark = subparsers.add_parser('benchmark', help="CSV vs partitioned loading of month and year slices")
+    benchmark.add_argument('--scale', type=int, default=10, help="multiple of the archive size")
+    args = parser.parse_args()
+
+    if args.command == 'benchmark':
+        run_benchmark(args.scale)
+        return
+    if args.command == 'info':
+        print_info(args.output)
+        return
+
+    if not os.path.exists(args.input_csv):
+        print(f"✗ {args.input_csv} not found (run extract_content.py first)")
+        sys.exit(1)
+
+    if args.command == 'append':
+        if not os.path.isdir(args.output):
+            print(f"✗ {args.output} not found (run build first)")
+            sys.exit(1)
+        df = pd.read_csv(args.input_csv, dtype=str)
+        if 'HOAX_TEXT' not in df.columns and 'CONTENT' in df.columns:
+            from extract_content import structure_frame
+            df = structure_frame(df)
+        rows = append_dataset(df, args.output)
+        print(f"✓ Appended {rows} new rows ({len(df) - rows} already present) to {args.output}")
+        return
+
+    if (not args.force and os.path.exists(args.output)
+            and os.path.getmtime(args.output) >= os.path.getmtime(args.input_csv)):
+        print(f"{args.output} is up to date; use --force to rebuild")
+        return
+    print(f"Converting {args.input_csv}...")
+    rows = build_dataset(args.input_csv, args.output)
+    print(f"✓ Wrote {rows} rows to {args.output}")
+    print_info(args.output)
+
+
+if __name__ == "__main__":
+    main()
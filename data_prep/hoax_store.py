@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Keyed SQLite store for the hoax dataset: one row per ID, columns added as
+stages need them.
+
+Instead of reading and rewriting the whole Complete CSV to add a column, a
+stage upserts just the columns it produces for just the IDs it touched:
+
+    with HoaxStore() as store:
+        store.upsert(pd.DataFrame({'ID': [101, 102], 'LLM Category': ['scam', 'politics']}))
+        df = store.read(['TITLE', 'LLM Category'], ids=[101, 102])
+
+Each upsert is one transaction (all rows or none, also across a crash), an
+existing row keeps the columns the upsert doesn't mention, and ID is the
+table's primary key, so lookups and joins by ID go through its index. The
+database runs in WAL mode, so readers never block a writer. CSV consumers
+get a file from `export`, written to a temporary name and renamed.
+
+Usage:
+    python3 hoax_store.py import <csv> [--rename OLD=NEW ...] [--columns C ...]
+    python3 hoax_store.py export <csv> [--columns C ...]
+    python3 hoax_store.py info
+    python3 hoax_store.py benchmark [--rows 3746] [--new 50]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+DB_PATH = "turnbackhoax.sqlite"
+TABLE = 'hoaxes'
+KEY_COLUMN = 'ID'
+
+
+def _quote(name):
+    """SQLite identifier; column names like 'LLM Category' contain spaces."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _plain(value):
+    # NaN/NA to NULL, numpy scalars to Python ones
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+class HoaxStore:
+    """ID-keyed table with column-wise upserts."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(f'CREATE TABLE IF NOT EXISTS {TABLE} ({_quote(KEY_COLUMN)} INTEGER PRIMARY KEY)')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def columns(self):
+        """Column names, ID first."""
+        return [row[1] for row in self.conn.execute(f'PRAGMA table_info({TABLE})')]
+
+    def count(self, column=None):
+        """Number of rows, or of rows where column is set."""
+        where = f' WHERE {_quote(column)} IS NOT NULL' if column else ''
+        return self.conn.execute(f'SELECT COUNT(*) FROM {TABLE}{where}').fetchone()[0]
+
+    def _add_columns(self, names):
+        existing = set(self.columns())
+        for name in names:
+            if name not in existing:
+                self.conn.execute(f'ALTER TABLE {TABLE} ADD COLUMN {_quote(name)}')
+
+    def upsert(self, rows):
+        """
+        Insert or update rows by ID in one transaction.
+
+        Args:
+            rows: DataFrame or list of dicts with an ID column; only the given
+                columns are written, missing columns are created
+
+        Returns:
+            Number of rows written
+        """
+        df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows)
+        if KEY_COLUMN not in df.columns:
+            raise ValueError(f"rows need an {KEY_COLUMN} column")
+        df = df[pd.to_numeric(df[KEY_COLUMN], errors='coerce').notna()]
+        if df.empty:
+            return 0
+        columns = [KEY_COLUMN] + [col for col in df.columns if col != KEY_COLUMN]
+        names = ', '.join(_quote(col) for col in columns)
+        placeholders = ', '.join('?' for _ in columns)
+        updates = ', '.join(f'{_quote(col)} = excluded.{_quote(col)}' for col in columns[1:])
+        conflict = f'DO UPDATE SET {updates}' if updates else 'DO NOTHING'
+        sql = (f'INSERT INTO {TABLE} ({names}) VALUES ({placeholders}) '
+               f'ON CONFLICT({_quote(KEY_COLUMN)}) {conflict}')
+
+        values = [[int(row[0])] + [_plain(value) for value in row[1:]]
+                  for row in df[columns].itertuples(index=False, name=None)]
+        with self.conn:  # commit, or roll back everything on error
+            self._add_columns(columns[1:])
+            self.conn.executemany(sql, values)
+        return len(values)
+
+    def read(self, columns=None, ids=None, missing=None):
+        """
+        Rows as a DataFrame.
+
+        Args:
+            columns: Columns besides ID (None for all)
+            ids: Only these IDs, joined through the primary key
+            missing: Only rows where this column is not set yet
+        """
+        available = self.columns()
+        columns = [col for col in (columns or available[1:]) if col != KEY_COLUMN]
+        selected = ', '.join(f'h.{_quote(col)}' if col in available else f'NULL AS {_quote(col)}'
+                             for col in [KEY_COLUMN] + columns)
+        sql = f'SELECT {selected} FROM {TABLE} h'
+        if ids is not None:
+            self.conn.execute(f'CREATE TEMP TABLE IF NOT EXISTS wanted ({_quote(KEY_COLUMN)} INTEGER PRIMARY KEY)')
+            self.conn.execute('DELETE FROM wanted')
+            self.conn.executemany('INSERT OR IGNORE INTO wanted VALUES (?)', [(int(i),) for i in ids])
+            # CROSS JOIN keeps the ID list as the outer loop: one primary key lookup per ID
+            sql = (f'SELECT {selected} FROM wanted w CROSS JOIN {TABLE} h '
+                   f'ON h.{_quote(KEY_COLUMN)} = w.{_quote(KEY_COLUMN)}')
+        if missing is not None:
+            sql += f' WHERE h.{_quote(missing)} IS NULL' if missing in available else ''
+        return pd.read_sql_query(sql + f' ORDER BY h.{_quote(KEY_COLUMN)}', self.conn)
+
+    def export_csv(self, path, columns=None):
+        """Write rows to a CSV atomically (temporary file, then rename)."""
+        df = self.read(columns)
+        tmp_path = path + '.tmp'
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        return len(df)
+
+
+def import_csv(store, path, rename=None, columns=None):
+    """Upsert a CSV's rows (optionally only some columns) into the store."""
+    df = pd.read_csv(path, dtype=str).rename(columns=rename or {})
+    if columns:
+        df = df[[KEY_COLUMN] + [col for col in columns if col != KEY_COLUMN]]
+    return store.upsert(df)
+
+
+def run_benchmark(rows=3746, new=50):
+    """Add categories for `new` hoaxes: whole-CSV rewrite vs store upsert."""
+    from chunked_csv import write_synthetic_complete_csv
+
+    print("=" * 60)
+    print(f"HOAX STORE BENCHMARK (categories for {new} new hoaxes in a {rows:,}-row archive)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'complete.csv')
+        write_synthetic_complete_csv(csv_path, rows)
+        categories = {i: ['politics', 'scam', 'others'][i % 3] for i in range(rows - new + 1, rows + 1)}
+
+        # add_llm_category.py before: read everything, map, rewrite everything
+        start = time.perf_counter()
+        df = pd.read_csv(csv_path)
+        df['LLM Category'] = df['ID'].map(categories)
+        df.to_csv(csv_path, index=False)
+        print(f"   read_csv + map + to_csv      {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        with HoaxStore(os.path.join(tmp, 'store.sqlite')) as store:
+            start = time.perf_counter()
+            import_csv(store, csv_path, columns=['URL', 'TITLE', 'CONTENT'])
+            print(f"   (one-off import of the archive {(time.perf_counter() - start) * 1000:7.1f} ms)")
+
+            batch = pd.DataFrame({'ID': list(categories), 'LLM Category': list(categories.values())})
+            start = time.perf_counter()
+            store.upsert(batch)
+            print(f"   store.upsert                 {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+            start = time.perf_counter()
+            joined = store.read(['TITLE', 'LLM Category'], ids=list(categories))
+            print(f"   store.read by ID (join)      {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+            same = joined.set_index('ID')['LLM Category'].to_dict() == categories
+            print(f"   {store.count('LLM Category')} categorized rows, "
+                  f"{'match' if same else 'DO NOT match'} the CSV result")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyed SQLite store for the hoax dataset")
+    parser.add_argument('--db', default=DB_PATH)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help="upsert a CSV's rows by ID")
+    import_parser.add_argument('csv')
+    import_parser.add_argument('--rename', nargs='*', default=[], metavar='OLD=NEW')
+    import_parser.add_argument('--columns', nargs='*', help="only these columns (default: all)")
+
+    export_parser = subparsers.add_parser('export', help="write the rows to a CSV")
+    export_parser.add_argument('csv')
+    export_parser.add_argument('--columns', nargs='*', help="only these columns (default: all)")
+
+    subparsers.add_parser('info', help="row and column counts")
+
+    benchmark = subparsers.add_parser('benchmark', help="whole-CSV rewrite vs upsert")
+    benchmark.add_argument('--rows', type=int, default=3746)
+    benchmark.add_argument('--new', type=int, default=50)
+    args = parser.parse_args()
+
+    if args.command == 'benchmark':
+        run_benchmark(args.rows, args.new)
+        return
+
+    with HoaxStore(args.db) as store:
+        if args.command == 'import':
+            if not os.path.exists(args.csv):
+                print(f"✗ {args.csv} not found")
+                sys.exit(1)
+            rename = dict(item.split('=', 1) for item in args.rename)
+            rows = import_csv(store, args.csv, rename, args.columns)
+            print(f"✓ Upserted {rows} rows from {args.csv} into {args.db}")
+        elif args.command == 'export':
+            rows = store.export_csv(args.csv, args.columns)
+            print(f"✓ Exported {rows} rows to {args.csv}")
+        else:
+            print(f"{args.db}: {store.count()} rows")
+            for column in store.columns()[1:]:
+                print(f"   {column:<20} {store.count(column)} set")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Content-addressed, compressed store of fetched HTML.
+
+Every page the scrapers download is kept as a zlib-compressed blob named by the
+SHA-256 of its raw bytes, with a SQLite index mapping (URL, content hash) to
+fetch time. Identical pages are stored once, and the store is trimmed back to
+a size cap by evicting the least recently used blobs.
+
+The re-parse mode rebuilds the CATEGORY and CONTENT columns of the Complete CSV
+from the cache, so a change to the extraction code no longer needs a re-scrape.
+
+Usage:
+    python3 html_cache.py stats [--cache html_cache]
+    python3 html_cache.py reparse [input_csv] [--output out.csv] [--workers 4] [--parser lxml]
+    python3 html_cache.py benchmark [--articles 3760]
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from turnbackhoax_parser import BACKENDS, COMPLETE_CSV, DEFAULT_BACKEND, format_separators, parse_article
+
+CACHE_DIR = "html_cache"
+MAX_CACHE_BYTES = 2 * 1024 ** 3  # compressed size cap
+COMPRESSION_LEVEL = 6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    content_hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT NOT NULL,
+    content_hash TEXT NOT NULL REFERENCES blobs (content_hash),
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (url, content_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_pages_hash ON pages (content_hash);
+CREATE INDEX IF NOT EXISTS idx_blobs_access ON blobs (last_access);
+"""
+
+
+def blob_path(cache_dir, content_hash):
+    """Location of a blob inside the cache directory."""
+    return os.path.join(cache_dir, 'objects', content_hash[:2], content_hash + '.z')
+
+
+def read_blob(cache_dir, content_hash):
+    """Decompressed bytes of a stored blob."""
+    with open(blob_path(cache_dir, content_hash), 'rb') as f:
+        return zlib.decompress(f.read())
+
+
+class HtmlCache:
+    """URL + content-hash keyed store of raw pages, safe to share between threads."""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(cache_dir, 'objects'), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(cache_dir, 'index.db'), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def put(self, url, content):
+        """
+        Store a fetched page.
+
+        Returns:
+            SHA-256 hex digest of the raw content
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        content_hash = hashlib.sha256(content).hexdigest()
+        now = time.time()
+
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM blobs WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+            if exists:
+                self._conn.execute("UPDATE blobs SET last_access = ? WHERE content_hash = ?", (now, content_hash))
+            else:
+                compressed = zlib.compress(content, COMPRESSION_LEVEL)
+                path = blob_path(self.cache_dir, content_hash)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Write then rename so a crash never leaves a truncated blob
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(compressed)
+                os.replace(tmp_path, path)
+                self._conn.execute(
+                    "INSERT INTO blobs (content_hash, size, raw_size, last_access) VALUES (?, ?, ?, ?)",
+                    (content_hash, len(compressed), len(content), now),
+                )
+                self._total_bytes += len(compressed)
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, content_hash, fetched_at) VALUES (?, ?, ?)",
+                (url, content_hash, now),
+            )
+            self._conn.commit()
+
+            if self._total_bytes > self.max_bytes:
+                self._evict_locked(self.max_bytes)
+
+        return content_hash
+
+    def latest_hash(self, url):
+        """Content hash of the most recent stored version of url, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash FROM pages WHERE url = ? ORDER BY fetched_at DESC LIMIT 1", (url,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def latest_hashes(self):
+        """Map of every cached URL to the hash of its most recent version."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, content_hash FROM pages ORDER BY fetched_at"
+            ).fetchall()
+        # Later rows overwrite earlier ones, leaving the newest version per URL
+        return dict(rows)
+
+    def get(self, url):
+        """Raw bytes of the most recent version of url, or None if not cached."""
+        content_hash = self.latest_hash(url)
+        if content_hash is None:
+            return None
+        with self._lock:
+            self._conn.execute("UPDATE blobs SET last_access = ? WHERE content_hash = ?",
+                               (time.time(), content_hash))
+            self._conn.commit()
+        return read_blob(self.cache_dir, content_hash)
+
+    def evict(self, max_bytes=None):
+        """Drop least recently used blobs until the store fits max_bytes."""
+        with self._lock:
+            return self._evict_locked(self.max_bytes if max_bytes is None else max_bytes)
+
+    def _evict_locked(self, max_bytes):
+        evicted = 0
+        rows = self._conn.execute("SELECT content_hash, size FROM blobs ORDER BY last_access").fetchall()
+        for content_hash, size in rows:
+            if self._total_bytes <= max_bytes:
+                break
+            self._conn.execute("DELETE FROM pages WHERE content_hash = ?", (content_hash,))
+            self._conn.execute("DELETE FROM blobs WHERE content_hash = ?", (content_hash,))
+            try:
+                os.remove(blob_path(self.cache_dir, content_hash))
+            except FileNotFoundError:
+                pass
+            self._total_bytes -= size
+            evicted += 1
+        self._conn.commit()
+        return evicted
+
+    def stats(self):
+        """Counts and sizes for reporting."""
+        with self._lock:
+            blobs, size, raw_size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(raw_size), 0) FROM blobs"
+            ).fetchone()
+            urls = self._conn.execute("SELECT COUNT(DISTINCT url) FROM pages").fetchone()[0]
+        return {'urls': urls, 'blobs': blobs, 'bytes': size, 'raw_bytes': raw_size}
+
+
+def _reparse_blob(task):
+    """Process-pool entry point: read, decompress and parse one cached page."""
+    cache_dir, content_hash, parser = task
+    try:
+        result = parse_article(read_blob(cache_dir, content_hash), parser)
+    except Exception as e:
+        return '', f'Error: {str(e)}'
+    return result['category'], format_separators(result['content'])
+
+
+def reparse_complete_csv(df, cache_dir=CACHE_DIR, workers=None, url_column='URL', parser=DEFAULT_BACKEND):
+    """
+    Rebuild CATEGORY and CONTENT from cached HTML, without network access.
+
+    Rows whose URL is not in the cache keep their current values.
+
+    Returns:
+        (updated DataFrame, number of rows re-parsed)
+    """
+    with HtmlCache(cache_dir) as cache:
+        hashes = cache.latest_hashes()
+
+    positions = [i for i, url in enumerate(df[url_column]) if url in hashes]
+    tasks = [(cache_dir, hashes[df[url_column].iat[i]], parser) for i in positions]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_reparse_blob, tasks, chunksize=64))
+
+    df = df.copy()
+    for column in ('CATEGORY', 'CONTENT'):
+        if column not in df.columns:
+            df[column] = None
+    if positions:
+        df.iloc[positions, df.columns.get_loc('CATEGORY')] = [category for category, _ in results]
+        df.iloc[positions, df.columns.get_loc('CONTENT')] = [content for _, content in results]
+    return df, len(positions)
+
+
+def run_reparse(input_csv, output_csv, cache_dir, workers, parser=DEFAULT_BACKEND):
+    print(f"Reading {input_csv}...")
+    df = pd.read_csv(input_csv)
+
+    start = time.perf_counter()
+    df, reparsed = reparse_complete_csv(df, cache_dir, workers, parser=parser)
+    elapsed = time.perf_counter() - start
+
+    print(f"Re-parsed {reparsed}/{len(df)} rows from {cache_dir} in {elapsed:.2f}s "
+          f"({reparsed / elapsed if elapsed else 0:.0f} articles/sec)")
+    if reparsed < len(df):
+        print(f"   {len(df) - reparsed} rows not in the cache were left unchanged")
+
+    print(f"Saving to {output_csv}...")
+    tmp_path = output_csv + '.tmp'  # the default output is the input CSV: never leave it half-written
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, output_csv)
+    print("Done.")
+
+
+def run_benchmark(articles=3760, workers=None):
+    """Fill a temporary cache with synthetic articles and time a full re-parse."""
+    from local_site import fixture_post, render_article
+
+    print("=" * 60)
+    print(f"HTML CACHE RE-PARSE BENCHMARK ({articles} articles)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        base_url = "https://turnbackhoax.id"
+        urls = []
+        start = time.perf_counter()
+        with HtmlCache(cache_dir) as cache:
+            for post_id in range(1, articles + 1):
+                post = fixture_post(post_id, base_url)
+                cache.put(post['url'], render_article(post))
+                urls.append(post['url'])
+            stats = cache.stats()
+        print(f"   Stored {stats['blobs']} pages in {time.perf_counter() - start:.2f}s: "
+              f"{stats['raw_bytes'] / 1e6:.1f} MB raw -> {stats['bytes'] / 1e6:.1f} MB compressed")
+
+        df = pd.DataFrame({'ID': range(1, articles + 1), 'URL': urls, 'CATEGORY': '', 'CONTENT': ''})
+        start = time.perf_counter()
+        df, reparsed = reparse_complete_csv(df, cache_dir, workers)
+        elapsed = time.perf_counter() - start
+        print(f"   Re-parsed {reparsed} articles in {elapsed:.2f}s ({reparsed / elapsed:.0f} articles/sec)")
+        print(f"   At the old one-request-per-second crawl: ~{articles / 60:.0f} minutes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Raw HTML cache for turnbackhoax.id pages")
+    parser.add_argument('command', choices=['stats', 'reparse', 'benchmark'])
+    parser.add_argument('input_csv', nargs='?', default=COMPLETE_CSV)
+    parser.add_argument('--cache', default=CACHE_DIR)
+    parser.add_argument('--output', help="output CSV for reparse (default: overwrite input)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--parser', choices=BACKENDS, default=DEFAULT_BACKEND)
+    parser.add_argument('--articles', type=int, default=3760, help="benchmark size")
+    args = parser.parse_args()
+
+    if args.command == 'benchmark':
+        run_benchmark(args.articles, args.workers)
+    elif args.command == 'stats':
+        with HtmlCache(args.cache) as cache:
+            stats = cache.stats()
+        print(f"Cache: {args.cache}")
+        print(f"   URLs: {stats['urls']}")
+        print(f"   Blobs: {stats['blobs']}")
+        print(f"   Size: {stats['bytes'] / 1e6:.1f} MB compressed ({stats['raw_bytes'] / 1e6:.1f} MB raw)")
+    else:
+        if not os.path.exists(args.input_csv):
+            print(f"Input file {args.input_csv} not found.")
+            sys.exit(1)
+        run_reparse(args.input_csv, args.output or args.input_csv, args.cache, args.workers,
+                    args.parser)
+
+
+if __name__ == "__main__":
+    main()
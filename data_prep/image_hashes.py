@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Perceptual-hash index of hoax thumbnails, for spotting recycled images.
+
+Thumbnails from the Complete CSV's IMAGE_URL column are downloaded once into a
+content-addressed cache (html_cache.HtmlCache), reduced to a 64-bit DCT
+perceptual hash (pHash) with NumPy and saved to image_hashes.csv.
+
+Lookups use a multi-index hash table: each hash is split into five 13-bit words,
+and any hash within Hamming distance r of a query shares at least one word
+within distance r // 5 of the query's word. For the default radius of 8 a query
+probes 70 buckets (each word and its one-bit variants) instead of scanning the
+whole archive.
+
+Usage:
+    python3 image_hashes.py build [complete_csv] [--cache image_cache] [--output image_hashes.csv]
+    python3 image_hashes.py scan <image_dir> [--output image_dir_hashes.csv]
+    python3 image_hashes.py query <image file or URL> [--hashes image_hashes.csv] [--radius 8]
+    python3 image_hashes.py reuse [--hashes image_hashes.csv] [--radius 8] [--output image_reuse.csv]
+    python3 image_hashes.py benchmark [--posts 3760]
+"""
+
+import argparse
+import asyncio
+import io
+import itertools
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import aiohttp
+import numpy as np
+import pandas as pd
+from PIL import Image, ImageEnhance, ImageFilter
+
+from headline_crawler import (CONCURRENCY, PER_HOST_CONCURRENCY, PER_HOST_DELAY, HostPoliteness, create_session,
+                              fetch_page)
+from html_cache import HtmlCache, read_blob
+from turnbackhoax_parser import COMPLETE_CSV
+
+IMAGE_CACHE_DIR = "image_cache"
+HASHES_CSV = "image_hashes.csv"
+REUSE_CSV = "image_reuse.csv"
+
+HASH_SIZE = 8  # 8x8 low-frequency DCT coefficients -> 64 bits
+IMAGE_SIZE = 32
+WORDS = 5  # multi-index substrings of 13 bits (the last has 12)
+DEFAULT_RADIUS = 8  # Hamming distance still considered "the same image"
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp')
+
+
+def _dct_matrix(n):
+    """Orthonormal DCT-II basis as an n x n matrix."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+DCT_MATRIX = _dct_matrix(IMAGE_SIZE)
+BIT_WEIGHTS = np.uint64(1) << np.arange(HASH_SIZE * HASH_SIZE - 1, -1, -1, dtype=np.uint64)
+
+
+def load_pixels(data):
+    """Decode image bytes to a 32x32 grayscale float array."""
+    with Image.open(io.BytesIO(data)) as image:
+        # JPEGs can be decoded straight at a fraction of their size
+        image.draft('L', (IMAGE_SIZE * 4, IMAGE_SIZE * 4))
+        image = image.convert('L').resize((IMAGE_SIZE, IMAGE_SIZE), Image.LANCZOS)
+        return np.asarray(image, dtype=np.float64)
+
+
+def phash_pixels(pixels):
+    """
+    pHashes for a stack of 32x32 grayscale images.
+
+    Args:
+        pixels: Array of shape (n, 32, 32)
+
+    Returns:
+        uint64 array of shape (n,)
+    """
+    pixels = np.asarray(pixels, dtype=np.float64).reshape(-1, IMAGE_SIZE, IMAGE_SIZE)
+    dct = DCT_MATRIX @ pixels @ DCT_MATRIX.T
+    low = dct[:, :HASH_SIZE, :HASH_SIZE].reshape(len(pixels), -1)
+    # The DC term only carries overall brightness; leave it out of the median
+    median = np.median(low[:, 1:], axis=1, keepdims=True)
+    return ((low > median).astype(np.uint64) * BIT_WEIGHTS).sum(axis=1, dtype=np.uint64)
+
+
+def phash(data):
+    """pHash of one encoded image as a Python int."""
+    return int(phash_pixels(load_pixels(data)[None])[0])
+
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+
+def format_hash(value):
+    return f"{value:016x}"
+
+
+class MultiIndexHashTable:
+    """64-bit hashes indexed by their words (substrings) for Hamming-radius lookups."""
+
+    def __init__(self, words=WORDS):
+        self.words = words
+        self.word_bits = -(-64 // words)
+        self._mask = (1 << self.word_bits) - 1
+        self._tables = [defaultdict(list) for _ in range(words)]
+        self._flips = {}
+        self.hashes = []
+        self.keys = []
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def _split(self, value):
+        return [(value >> (i * self.word_bits)) & self._mask for i in range(self.words)]
+
+    def _flip_masks(self, distance):
+        """XOR masks changing at most `distance` bits of one word."""
+        if distance not in self._flips:
+            masks = []
+            for flipped in range(distance + 1):
+                for bits in itertools.combinations(range(self.word_bits), flipped):
+                    masks.append(sum(1 << bit for bit in bits))
+            self._flips[distance] = masks
+        return self._flips[distance]
+
+    def add(self, key, value):
+        position = len(self.hashes)
+        self.hashes.append(value)
+        self.keys.append(key)
+        for table, word in zip(self._tables, self._split(value)):
+            table[word].append(position)
+
+    def query(self, value, radius=DEFAULT_RADIUS):
+        """
+        Stored entries within `radius` bits of value.
+
+        Returns:
+            List of (key, distance), nearest first
+        """
+        masks = self._flip_masks(radius // self.words)
+        seen = set()
+        results = []
+        for table, word in zip(self._tables, self._split(value)):
+            for mask in masks:
+                for position in table.get(word ^ mask, ()):
+                    if position in seen:
+                        continue
+                    seen.add(position)
+                    distance = hamming(self.hashes[position], value)
+                    if distance <= radius:
+                        results.append((self.keys[position], distance))
+        results.sort(key=lambda item: item[1])
+        return results
+
+
+def load_index(hashes_csv=HASHES_CSV):
+    """
+    Read a hashes CSV into an index keyed by row position.
+
+    Returns:
+        (DataFrame, MultiIndexHashTable)
+    """
+    df = pd.read_csv(hashes_csv, dtype={'PHASH': str}, keep_default_na=False)
+    index = MultiIndexHashTable()
+    for position, value in enumerate(df['PHASH']):
+        if value:
+            index.add(position, int(value, 16))
+    return df, index
+
+
+async def download_images(urls, cache, concurrency=CONCURRENCY, delay=PER_HOST_DELAY, progress=True):
+    """
+    Fetch image URLs into the cache.
+
+    Returns:
+        Number of images fetched
+    """
+    politeness = HostPoliteness(max_concurrent=min(PER_HOST_CONCURRENCY, concurrency), min_interval=delay)
+    fetched = 0
+
+    async with create_session(concurrency, PER_HOST_CONCURRENCY) as session:
+        async def fetch(url):
+            nonlocal fetched
+            try:
+                _, body, _, _ = await fetch_page(session, url, politeness)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"\nError fetching {url}: {e!r}")
+                return
+            cache.put(url, body)
+            fetched += 1
+            if progress:
+                print(f"   Downloaded {fetched}/{len(urls)} images...", end='\r')
+
+        await asyncio.gather(*(fetch(url) for url in urls))
+
+    if progress and urls:
+        print()
+    return fetched
+
+
+def hash_blobs(cache_dir, content_hashes):
+    """
+    pHash every cached blob, decoding one at a time and hashing in one NumPy batch.
+
+    Returns:
+        Dict of content hash -> 16-digit hex pHash (undecodable images are left out)
+    """
+    keys, stack = [], []
+    for content_hash in content_hashes:
+        try:
+            stack.append(load_pixels(read_blob(cache_dir, content_hash)))
+        except (OSError, ValueError, Image.DecompressionBombError):
+            continue
+        keys.append(content_hash)
+    if not stack:
+        return {}
+    return {key: format_hash(int(value)) for key, value in zip(keys, phash_pixels(np.stack(stack)))}
+
+
+def build_hashes(df, cache_dir=IMAGE_CACHE_DIR, concurrency=CONCURRENCY, delay=PER_HOST_DELAY, progress=True):
+    """
+    Download missing thumbnails for a Complete-CSV frame and hash them.
+
+    Returns:
+        DataFrame with ID, URL, IMAGE_URL and PHASH (empty when unavailable)
+    """
+    image_urls = [url for url in df['IMAGE_URL'].dropna().unique() if url]
+    with HtmlCache(cache_dir) as cache:
+        cached = cache.latest_hashes()
+        missing = [url for url in image_urls if url not in cached]
+        if progress:
+            print(f"   {len(image_urls)} distinct images, {len(missing)} not yet cached")
+        if missing:
+            asyncio.run(download_images(missing, cache, concurrency, delay, progress))
+        cached = cache.latest_hashes()
+
+    # Identical files are decoded and hashed once
+    url_blobs = {url: cached[url] for url in image_urls if url in cached}
+    blob_hashes = hash_blobs(cache_dir, set(url_blobs.values()))
+    url_hashes = {url: blob_hashes.get(blob, '') for url, blob in url_blobs.items()}
+
+    result = df[['ID', 'URL', 'IMAGE_URL']].copy()
+    result['PHASH'] = result['IMAGE_URL'].map(url_hashes).fillna('')
+    return result
+
+
+def scan_directory(image_dir):
+    """Hash every image file under a directory (keyed by relative path)."""
+    rows = []
+    for dirpath, _, filenames in os.walk(image_dir):
+        for filename in sorted(filenames):
+            if not filename.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            path = os.path.join(dirpath, filename)
+            with open(path, 'rb') as f:
+                data = f.read()
+            try:
+                value = format_hash(phash(data))
+            except (OSError, ValueError, Image.DecompressionBombError):
+                value = ''
+            rows.append({'PATH': os.path.relpath(path, image_dir), 'PHASH': value})
+    return pd.DataFrame(rows, columns=['PATH', 'PHASH'])
+
+
+def find_reuse(df, index, radius=DEFAULT_RADIUS):
+    """
+    Group rows whose images are within `radius` bits of each other.
+
+    Returns:
+        DataFrame of the rows in groups of two or more, with a CLUSTER column
+    """
+    parent = list(range(len(df)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for position, value in zip(index.keys, index.hashes):
+        for other, _ in index.query(value, radius):
+            a, b = root(position), root(other)
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+
+    roots = [root(i) for i in range(len(df))]
+    sizes = pd.Series(roots).value_counts()
+    clustered = [i for i in index.keys if sizes[roots[i]] > 1]
+    result = df.iloc[clustered].copy()
+    result.insert(0, 'CLUSTER', [roots[i] for i in clustered])
+    return result.sort_values(['CLUSTER', 'ID' if 'ID' in result.columns else 'PHASH'])
+
+
+def read_image(source):
+    """Bytes of a local image file or an image URL."""
+    if source.startswith(('http://', 'https://')):
+        import requests
+        from turnbackhoax_parser import HEADERS
+
+        response = requests.get(source, headers=HEADERS, timeout=30)
+        response.raise_for_status()
+        return response.content
+    with open(source, 'rb') as f:
+        return f.read()
+
+
+def _fixture_image(seed, width=320, height=240):
+    """Smooth random blocks, so unrelated images hash far apart."""
+    rng = np.random.default_rng(seed)
+    levels = rng.integers(0, 256, size=(6, 8, 3), dtype=np.uint8)
+    blocks = np.kron(levels, np.ones((height // 6, width // 8, 1), dtype=np.uint8))
+    return Image.fromarray(blocks).filter(ImageFilter.GaussianBlur(6))
+
+
+def write_fixture_images(root_dir, base_url, posts, reuse_every=7):
+    """
+    Write synthetic thumbnails at the local_site fixture_post() image paths.
+
+    Every reuse_every-th post recycles an earlier post's image, resized,
+    brightened and recompressed.
+
+    Returns:
+        Dict of recycling post_id -> source post_id
+    """
+    from local_site import fixture_post
+
+    recycled = {}
+    for post_id in range(1, posts + 1):
+        post = fixture_post(post_id, base_url)
+        path = os.path.join(root_dir, post['image_url'][len(base_url):].lstrip('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if post_id % reuse_every == 0:
+            source = (post_id * 31) % (post_id - 1) + 1
+            if source % reuse_every == 0:
+                source -= 1  # always recycle an original
+            recycled[post_id] = source
+            image = _fixture_image(source).resize((256, 192))
+            image = ImageEnhance.Brightness(image).enhance(1.15)
+            image.save(path, 'JPEG', quality=60)
+        else:
+            _fixture_image(post_id).save(path, 'JPEG', quality=85)
+    return recycled
+
+
+def run_benchmark(posts=3760, radius=DEFAULT_RADIUS):
+    """Build the index from a local stand-in site and time 'seen before?' lookups."""
+    from local_site import fixture_post, serve_site
+
+    print("=" * 60)
+    print(f"IMAGE HASH INDEX BENCHMARK ({posts} thumbnails, radius {radius})")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as root:
+        with serve_site(root) as base_url:
+            recycled = write_fixture_images(root, base_url, posts)
+            df = pd.DataFrame([{'ID': post_id, 'URL': fixture_post(post_id, base_url)['url'],
+                                'IMAGE_URL': fixture_post(post_id, base_url)['image_url']}
+                               for post_id in range(1, posts + 1)])
+
+            start = time.perf_counter()
+            hashes = build_hashes(df, os.path.join(root, 'cache'), delay=0.0, progress=False)
+            print(f"   Download + hash: {time.perf_counter() - start:.2f}s")
+
+            start = time.perf_counter()
+            hashes = build_hashes(df, os.path.join(root, 'cache'), delay=0.0, progress=False)
+            print(f"   Rebuild from cache: {time.perf_counter() - start:.2f}s")
+
+    index = MultiIndexHashTable()
+    for position, value in enumerate(hashes['PHASH']):
+        index.add(position, int(value, 16))
+
+    start = time.perf_counter()
+    results = [index.query(value, radius) for value in index.hashes]
+    per_query = (time.perf_counter() - start) / len(index) * 1e6
+
+    array = np.array(index.hashes, dtype=np.uint64)
+    start = time.perf_counter()
+    for value in index.hashes[:200]:
+        distances = np.unpackbits((array ^ np.uint64(value)).view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+        np.flatnonzero(distances <= radius)
+    per_scan = (time.perf_counter() - start) / 200 * 1e6
+
+    found = sum(1 for post_id, source in recycled.items()
+                if source - 1 in {key for key, _ in results[post_id - 1]})
+    # Posts showing the same original image, by row position
+    origin = [recycled.get(post_id, post_id) for post_id in range(1, posts + 1)]
+    false_pairs = sum(1 for position, matches in enumerate(results)
+                      for key, _ in matches if key > position and origin[key] != origin[position])
+
+    print(f"   Multi-index lookup: {per_query:.1f} µs/query")
+    print(f"   NumPy linear scan:  {per_scan:.1f} µs/query")
+    print(f"   Recycled images found: {found}/{len(recycled)}, unrelated pairs matched: {false_pairs}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perceptual-hash index of hoax images")
+    parser.add_argument('command', choices=['build', 'scan', 'query', 'reuse', 'benchmark'])
+    parser.add_argument('target', nargs='?', help="Complete CSV (build), image directory (scan) "
+                                                  "or image file/URL (query)")
+    parser.add_argument('--cache', default=IMAGE_CACHE_DIR)
+    parser.add_argument('--hashes', default=HASHES_CSV, help="hashes CSV written by build")
+    parser.add_argument('--output', help="output CSV")
+    parser.add_argument('--radius', type=int, default=DEFAULT_RADIUS, help="maximum Hamming distance")
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--delay', type=float, default=PER_HOST_DELAY)
+    parser.add_argument('--posts', type=int, default=3760, help="benchmark size")
+    args = parser.parse_args()
+
+    if args.command == 'benchmark':
+        run_benchmark(args.posts, args.radius)
+
+    elif args.command == 'build':
+        input_csv = args.target or COMPLETE_CSV
+        if not os.path.exists(input_csv):
+            print(f"Input file {input_csv} not found.")
+            sys.exit(1)
+        df = pd.read_csv(input_csv)
+        print(f"Hashing images for {len(df)} rows of {input_csv}...")
+        hashes = build_hashes(df, args.cache, args.concurrency, args.delay)
+        output = args.output or HASHES_CSV
+        hashes.to_csv(output, index=False)
+        print(f"Hashed {(hashes['PHASH'] != '').sum()}/{len(hashes)} rows, saved to {output}")
+
+    elif args.command == 'scan':
+        if not args.target:
+            parser.error("scan needs an image directory")
+        hashes = scan_directory(args.target)
+        output = args.output or f"{os.path.basename(os.path.normpath(args.target))}_hashes.csv"
+        hashes.to_csv(output, index=False)
+        print(f"Hashed {(hashes['PHASH'] != '').sum()} images, saved to {output}")
+
+    elif args.command == 'query':
+        if not args.target:
+            parser.error("query needs an image file or URL")
+        df, index = load_index(args.hashes)
+        value = phash(read_image(args.target))
+        start = time.perf_counter()
+        matches = index.query(value, args.radius)
+        elapsed = (time.perf_counter() - start) * 1e6
+        print(f"pHash {format_hash(value)}: {len(matches)} matches within {args.radius} bits "
+              f"of {len(index)} images ({elapsed:.0f} µs)")
+        for position, distance in matches:
+            row = df.iloc[position]
+            print(f"   distance {distance:>2}  {row.get('ID', '')}  {row.get('URL', row.get('PATH', ''))}")
+
+    else:
+        df, index = load_index(args.hashes)
+        reuse = find_reuse(df, index, args.radius)
+        output = args.output or REUSE_CSV
+        reuse.to_csv(output, index=False)
+        print(f"Reused images: {reuse['CLUSTER'].nunique()}, shared by {len(reuse)} hoaxes; saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
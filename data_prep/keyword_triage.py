@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Keyword triage of hoaxes into the analysis plan's buckets.
+
+analysis_plan.md splits the archive by keywords into Politics (bucket A),
+Scam (bucket B) and Other (bucket C: health, disaster, religion, ...).
+BUCKETS gathers those keywords with the entity lists of the text network
+and sentiment scripts, and all of them are compiled into one regex: a
+trie-shaped alternation (shared prefixes factored out, longest keyword
+first) between word boundaries.
+
+Scoring is one pass over the whole corpus: every row's TITLE and
+HOAX_TEXT are joined into one lowercased string, the regex runs over it
+once, and match positions are mapped back to rows with searchsorted. A
+sparse (rows x keywords) count matrix times the (keywords x buckets)
+membership matrix gives the bucket scores; title matches count
+TITLE_WEIGHT times. The category is the bucket with the highest score
+(politics before scam before others on ties), and others when nothing
+matches.
+
+KeywordTriage.classify has the TitleClassifier interface, so it can also
+be the first tier of llm_categorizer.categorize_items(classifier=...):
+titles whose top bucket leads by MIN_MARGIN are answered by keywords.
+
+Usage:
+    python3 keyword_triage.py [structured_csv] [--output triage_csv]
+    python3 keyword_triage.py --benchmark [--copies 27]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+STRUCTURED_CSV = "Scraping turnbackhoax.id - Structured.csv"
+TRIAGE_CSV = "Scraping turnbackhoax.id - Triage.csv"
+
+# LLM-labelled HOAX_TEXT slices of the whole archive, for the benchmark
+LABELLED_CSVS = [
+    "../topic_modeling/politics_hoax_text.csv",
+    "../topic_modeling/scam_category/scam_hoax_text.csv",
+    "../topic_modeling/others_category/others_hoax_text.csv",
+]
+
+# Bucket A and B keywords of analysis_plan.md, plus ENTITY_LISTS
+# (text_network/run_multi_category_analysis.py) and the sentiment entity
+# aliases; short aliases that also match ordinary words ('02', 'bi',
+# 'wong') are left out. Bucket C has no keyword list in the plan, so it
+# gets the 'others' entities with a few religion terms.
+BUCKETS = {
+    'politics': [
+        'prabowo', 'gibran', 'anies', 'ganjar', 'mahfud', 'jokowi', 'joko widodo', 'mulyono', 'baswedan',
+        'pranowo', 'gemoy', 'cak imin', 'muhaimin iskandar', 'kpu', 'bawaslu', 'pemilu', 'curang', 'kecurangan',
+        'mk', 'mahkamah konstitusi', 'partai', 'pdip', 'gerindra', 'nasdem', 'demokrat', 'pks', 'pan', 'golkar',
+        'pilpres', 'capres', 'cawapres', 'koalisi', 'debat', 'kampanye', 'tps', 'surat suara', 'kotak suara',
+        'penghitungan', 'sirekap', 'quick count', 'hak angket', 'politik', 'presiden', 'wakil presiden',
+        'johnny plate', 'sby', 'syahrul yasin limpo', 'bahlil', 'najwa shihab', 'roy suryo',
+    ],
+    'scam': [
+        'undian', 'hadiah', 'bank', 'bri', 'bni', 'mandiri', 'bca', 'bank rakyat indonesia',
+        'bank negara indonesia', 'saldo', 'rekening', 'transfer', 'giveaway', 'bagi bagi', 'dana kaget', 'dana',
+        'gopay', 'ovo', 'kuota', 'pulsa', 'internet gratis', 'gratis', 'lowongan', 'loker', 'rekrutmen', 'cpns',
+        'bumn', 'pln', 'pertamina', 'bpjs', 'ojk', 'pinjol', 'pinjaman online', 'bansos', 'blt', 'prakerja',
+        'kartu', 'promo', 'tebus murah', 'penipuan', 'penipu', 'akun palsu', 'modus', 'whatsapp', 'facebook',
+        'instagram', 'tiktok',
+    ],
+    'others': [
+        'covid', 'vaksin', 'omicron', 'virus', 'pandemi', 'pneumonia', 'kesehatan', 'who', 'kemenkes', 'rs',
+        'rumah sakit', 'dokter', 'obat', 'ivermectin', 'gempa', 'tsunami', 'banjir', 'longsor', 'angin',
+        'puting beliung', 'bencana', 'bmkg', 'gunung', 'erupsi', 'palestina', 'israel', 'gaza', 'hamas',
+        'rohingya', 'ukraina', 'rusia', 'perang', 'china', 'amerika', 'as', 'piala asia', 'timnas', 'fifa', 'afc',
+        'agama', 'masjid', 'gereja', 'ulama', 'kiamat',
+    ],
+}
+TITLE_WEIGHT = 2  # a keyword in the title counts this many times
+MIN_MARGIN = 1  # lead of the top bucket for a confident title (KeywordTriage.classify)
+SEPARATOR = '\n\x00\n'  # between texts; no keyword spans it
+
+
+def trie_pattern(keywords):
+    """Alternation regex source for keywords, shaped like their trie; a space matches any whitespace run."""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def emit(node):
+        end = '' in node
+        branches = [(r'[\s\-]+' if char == ' ' else re.escape(char)) + emit(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if end:
+            body = body + '?' if len(branches) == 1 and len(body) == 1 else '(?:' + body + ')?'
+        return body
+
+    return emit(trie)
+
+
+class KeywordTriage:
+    """One compiled regex over all bucket keywords; scores rows per bucket."""
+
+    source = 'keywords'  # Category Source of its answers in categorize_hoaxes.py
+
+    def __init__(self, buckets=BUCKETS, title_weight=TITLE_WEIGHT, min_margin=MIN_MARGIN):
+        self.classes = list(buckets)
+        self.keywords = sorted({keyword for keywords in buckets.values() for keyword in keywords})
+        self.index = {keyword: i for i, keyword in enumerate(self.keywords)}
+        self.membership = sparse.csr_matrix(np.array(
+            [[keyword in buckets[bucket] for bucket in self.classes] for keyword in self.keywords], dtype=np.float64))
+        self.pattern = re.compile(r'\b' + trie_pattern(self.keywords) + r'\b')
+        self.title_weight = title_weight
+        self.min_margin = min_margin
+
+    def match_counts(self, texts, weights=None):
+        """Sparse (texts x keywords) match counts, optionally weighted per text; one regex pass."""
+        # Lowercase per text: lower() can change a string's length ('İ'), so offsets come from the lowered texts
+        texts = ['' if not isinstance(text, str) else text.lower() for text in texts]
+        corpus = SEPARATOR.join(texts)
+        starts = np.cumsum([0] + [len(text) + len(SEPARATOR) for text in texts[:-1]])
+        positions, keywords = [], []
+        for match in self.pattern.finditer(corpus):
+            positions.append(match.start())
+            keywords.append(self.index[' '.join(match.group().replace('-', ' ').split())])
+        rows = np.searchsorted(starts, positions, side='right') - 1
+        values = np.ones(len(rows)) if weights is None else np.asarray(weights, dtype=np.float64)[rows]
+        return sparse.csr_matrix((values, (rows, keywords)), shape=(len(texts), len(self.keywords)))
+
+    def scores(self, titles, texts=None):
+        """(rows x buckets) scores; title matches count title_weight times."""
+        if texts is None:
+            counts = self.match_counts(titles)
+        else:
+            # Titles and texts interleaved, so one pass covers both
+            both = [value for pair in zip(titles, texts) for value in pair]
+            weights = np.tile([self.title_weight, 1], len(titles))
+            counts = self.match_counts(both, weights)
+            counts = counts[0::2] + counts[1::2]
+        return np.asarray((counts @ self.membership).todense())
+
+    def categories(self, scores):
+        """Top bucket per row (first bucket on ties); 'others' without any match."""
+        labels = np.array(self.classes, dtype=object)[scores.argmax(axis=1)]
+        labels[scores.max(axis=1) == 0] = 'others'
+        return labels
+
+    def classify(self, titles):
+        """(labels, margins, confident mask) for titles, like TitleClassifier.classify."""
+        scores = self.scores(titles)
+        top = np.sort(scores, axis=1)
+        margin = top[:, -1] - top[:, -2]
+        return list(self.categories(scores)), margin, margin >= self.min_margin
+
+
+def triage_frame(df, triage=None):
+    """ID, <BUCKET>_SCORE columns and TRIAGE_CATEGORY for a frame with TITLE and HOAX_TEXT."""
+    triage = triage or KeywordTriage()
+    scores = triage.scores(df['TITLE'].tolist(), df['HOAX_TEXT'].tolist())
+    result = pd.DataFrame(scores.astype(int), columns=[f"{bucket.upper()}_SCORE" for bucket in triage.classes])
+    result.insert(0, 'ID', df['ID'].to_numpy())
+    result['TRIAGE_CATEGORY'] = triage.categories(scores)
+    return result
+
+
+def naive_categories(df, buckets=BUCKETS):
+    """Per-row, per-keyword loop in the style of the entity scripts, for comparison."""
+    labels = []
+    for title, text in zip(df['TITLE'], df['HOAX_TEXT']):
+        title, text = str(title).lower(), str(text).lower()
+        scores = [sum(TITLE_WEIGHT * len(re.findall(r'\b' + re.escape(keyword) + r'\b', title)) +
+                      len(re.findall(r'\b' + re.escape(keyword) + r'\b', text)) for keyword in keywords)
+                  for keywords in buckets.values()]
+        labels.append(list(buckets)[int(np.argmax(scores))] if max(scores) else 'others')
+    return labels
+
+
+def run_benchmark(copies=27):
+    """Triage the LLM-labelled archive, time it against a per-keyword loop, and scale it up."""
+    base = os.path.dirname(os.path.abspath(__file__))
+    paths = [os.path.join(base, path) for path in LABELLED_CSVS]
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        print(f"✗ {missing[0]} not found")
+        sys.exit(1)
+    df = pd.concat([pd.read_csv(path, usecols=['ID', 'TITLE', 'HOAX_TEXT', 'LLM_CATEGORY']) for path in paths],
+                   ignore_index=True)
+
+    print("=" * 60)
+    print(f"KEYWORD TRIAGE BENCHMARK ({len(df)} labelled hoaxes, "
+          f"{(df['TITLE'].str.len().sum() + df['HOAX_TEXT'].str.len().sum()) / 1e6:.1f} MB of text)")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    triage = KeywordTriage()
+    compiled = time.perf_counter() - start
+    print(f"   {len(triage.keywords)} keywords compiled into one regex in {compiled * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    result = triage_frame(df, triage)
+    elapsed = time.perf_counter() - start
+    print(f"   one-pass triage:      {elapsed * 1000:7.1f} ms  ({len(df) / elapsed:,.0f} hoaxes/sec)")
+
+    start = time.perf_counter()
+    naive = naive_categories(df)
+    naive_elapsed = time.perf_counter() - start
+    same = (np.array(naive, dtype=object) == result['TRIAGE_CATEGORY'].to_numpy()).mean()
+    print(f"   per-keyword loop:     {naive_elapsed * 1000:7.1f} ms  ({naive_elapsed / elapsed:.0f}x slower, "
+          f"{same:.1%} same categories)")
+
+    agree = result['TRIAGE_CATEGORY'].to_numpy() == df['LLM_CATEGORY'].to_numpy()
+    print(f"   agreement with LLM labels: {agree.mean():.1%} "
+          f"({(result.iloc[:, 1:4].sum(axis=1) == 0).sum()} hoaxes without any keyword)")
+    for bucket in triage.classes:
+        mask = df['LLM_CATEGORY'].to_numpy() == bucket
+        print(f"      {bucket:<9} {mask.sum():>5} labelled  {agree[mask].mean():6.1%} agreement")
+
+    labels, _, confident = triage.classify(df['TITLE'].tolist())
+    title_agree = np.array(labels, dtype=object)[confident] == df['LLM_CATEGORY'].to_numpy()[confident]
+    print(f"   as a first tier on titles: {confident.mean():.1%} confident, "
+          f"{title_agree.mean() if confident.any() else 0:.1%} agreement on those")
+
+    big = pd.concat([df] * copies, ignore_index=True)
+    start = time.perf_counter()
+    triage_frame(big, triage)
+    elapsed = time.perf_counter() - start
+    print(f"   {copies}x archive ({len(big):,} hoaxes): {elapsed:.2f}s  ({len(big) / elapsed:,.0f} hoaxes/sec)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyword triage of hoaxes into politics, scam and others")
+    parser.add_argument('input_file', nargs='?', default=STRUCTURED_CSV)
+    parser.add_argument('--output', default=TRIAGE_CSV)
+    parser.add_argument('--benchmark', action='store_true', help="triage the LLM-labelled archive and time it")
+    parser.add_argument('--copies', type=int, default=27, help="archive copies for the scaling run")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.copies)
+        return
+
+    if not os.path.exists(args.input_file):
+        print(f"✗ {args.input_file} not found")
+        print("   Run: python3 extract_content.py")
+        sys.exit(1)
+
+    print(f"Triaging {args.input_file}...")
+    df = pd.read_csv(args.input_file, usecols=['ID', 'TITLE', 'HOAX_TEXT'])
+    df = df[pd.to_numeric(df['ID'], errors='coerce').notna()]
+    start = time.perf_counter()
+    result = triage_frame(df)
+    elapsed = time.perf_counter() - start
+    result.to_csv(args.output, index=False)
+
+    print(f"✓ {len(result)} hoaxes triaged in {elapsed * 1000:.0f} ms: "
+          f"{result['TRIAGE_CATEGORY'].value_counts().to_dict()}")
+    print(f"✓ Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,651 @@
+#!/usr/bin/env python3
+"""
+Asynchronous hoax categorization through the Gemini generateContent API.
+
+{ID, TITLE} items are packed into batches by estimated tokens (prompt
+line plus expected answer per item) up to TOKEN_BUDGET and MAX_BATCH_ITEMS,
+so long titles make smaller batches and short ones larger batches.
+
+Batches go out over one reused keep-alive session, with up to
+`concurrency` requests in flight. Transient failures (429, 5xx, timeouts,
+connection errors) are retried with exponential backoff and full jitter,
+honouring Retry-After. A batch that still fails after MAX_ATTEMPTS is
+requeued at the back of the queue, up to MAX_REQUEUES times; after that its
+items are reported as failed instead of being dropped silently. An answer
+that is not the requested JSON (truncated, blocked, malformed) points at
+the batch's content instead: the batch is split in half and both halves are
+queued, until the item causing it is isolated and only that one fails.
+Other HTTP errors (a bad API key, an unknown model) stop the run.
+
+Each answer is reconciled with its batch by ID: results for IDs not in the
+batch (or repeated) are dropped and counted, and items the model left out
+are pooled and packed into new batches once the queue runs dry, up to
+MAX_MISSING_ROUNDS times, so one run reaches full coverage. The run ends with a coverage report.
+
+With a CategoryCache (category_cache.py), titles already categorized under
+the current prompt version are answered from the cache, titles that
+normalize to the same text are sent once, and new answers are stored.
+With a TitleClassifier (title_classifier.py) or KeywordTriage
+(keyword_triage.py), or a list of them tried in order, titles one of them
+is confident about are answered locally and only the others are sent;
+their results carry that classifier's source ('local', 'keywords') and
+are not stored in the cache.
+
+Point base_url at mock_gemini.py to run without an API key, or at
+llm_replay.py to replay answers recorded with GeminiClient(recorder=...).
+
+Usage:
+    python3 llm_categorizer.py --benchmark [--items 2000] [--latency 0.2] [--error-rate 0.1] [--poisoned 3]
+                               [--omit-rate 0.05] [--extra-rate 0.1]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import aiohttp
+
+from category_cache import title_key
+from rate_limiter import parse_retry_after
+
+GEMINI_API_URL = "https://generativelanguage.googleapis.com"
+MODEL_NAME = "gemini-2.5-flash"
+CATEGORIES = ['politics', 'scam', 'others']
+
+TOKEN_BUDGET = 2000  # estimated prompt + answer tokens per batch, besides the instructions
+MAX_BATCH_ITEMS = 80
+CHARS_PER_TOKEN = 4  # rough average for Gemini tokenizers on Indonesian text
+ANSWER_TOKENS_PER_ITEM = 12  # {"id": 123456, "category": "politics"},
+CONCURRENCY = 4
+REQUEST_TIMEOUT = 120
+MAX_ATTEMPTS = 4  # tries of one batch before it is requeued
+MAX_REQUEUES = 2
+MAX_MISSING_ROUNDS = 3  # times items the model left out of an answer are queued again
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+TRANSIENT_STATUSES = (408, 429, 500, 502, 503, 504)
+
+PROMPT = """
+    You are an expert at categorizing news and claims.
+    The data is from turnbackhoax.id, an Indonesian anti-hoax database by MAFINDO.
+
+    Categorize each of the following items based on their Title into one of these categories:
+    - politics
+    - scam
+    - others
+
+    Return the result as a JSON list of objects, where each object has 'id' and 'category'.
+    """
+
+RESPONSE_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "id": {"type": "INTEGER"},
+            "category": {"type": "STRING", "enum": CATEGORIES}
+        },
+        "required": ["id", "category"]
+    }
+}
+
+
+class TransientError(Exception):
+    """A failure worth retrying; retry_after is the server's Retry-After in seconds, if any."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class BatchOutputError(TransientError):
+    """The model's answer to a batch is unusable; likely caused by one of its items."""
+
+
+def item_line(item):
+    """The prompt line for one item."""
+    return f"ID: {item['ID']}\nTitle: {item['TITLE']}\n---\n"
+
+
+def build_prompt(items):
+    """Prompt for a batch of {'ID', 'TITLE'} items."""
+    return PROMPT + "\nItems to categorize:\n" + ''.join(map(item_line, items))
+
+
+def estimate_tokens(item):
+    """Estimated tokens an item adds to a request: its prompt line and its answer."""
+    return math.ceil(len(item_line(item)) / CHARS_PER_TOKEN) + ANSWER_TOKENS_PER_ITEM
+
+
+def plan_batches(items, token_budget=TOKEN_BUDGET, max_items=MAX_BATCH_ITEMS):
+    """
+    Pack items, in order, into batches of at most token_budget estimated
+    tokens and max_items items. An item over the budget gets a batch of its own.
+    """
+    batches = []
+    batch, tokens = [], 0
+    for item in items:
+        cost = estimate_tokens(item)
+        if batch and (tokens + cost > token_budget or len(batch) >= max_items):
+            batches.append(batch)
+            batch, tokens = [], 0
+        batch.append(item)
+        tokens += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def prompt_version(model=MODEL_NAME):
+    """Hash of everything that shapes the model's answers; category cache entries are kept per version."""
+    config = {
+        'prompt': PROMPT,
+        'item_line': item_line({'ID': '{ID}', 'TITLE': '{TITLE}'}),
+        'response_schema': RESPONSE_SCHEMA,
+        'model': model,
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def describe_sizes(sizes):
+    """min/median/max summary of batch sizes."""
+    if not sizes:
+        return "no batches"
+    return f"{len(sizes)} batches of {min(sizes)}/{statistics.median(sizes):g}/{max(sizes)} items (min/median/max)"
+
+
+def request_body(prompt):
+    """generateContent request with the structured-output schema."""
+    return {
+        'contents': [{'role': 'user', 'parts': [{'text': prompt}]}],
+        'generationConfig': {
+            'responseMimeType': 'application/json',
+            'responseSchema': RESPONSE_SCHEMA,
+        },
+    }
+
+
+def parse_categories(response):
+    """
+    The {'id', 'category'} list from a generateContent response.
+
+    Raises:
+        BatchOutputError: The answer is blocked, truncated or not the schema
+    """
+    try:
+        text = ''.join(part.get('text', '') for part in response['candidates'][0]['content']['parts'])
+        results = json.loads(text)
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        raise BatchOutputError(f"unusable model output: {e!r}")
+    if not isinstance(results, list):
+        raise BatchOutputError("model output is not a JSON list")
+    return [{'id': int(result['id']), 'category': result['category']} for result in results
+            if isinstance(result, dict) and isinstance(result.get('id'), int)
+            and result.get('category') in CATEGORIES]
+
+
+def backoff_delay(attempt, retry_after=None, base=BACKOFF_BASE, cap=BACKOFF_MAX):
+    """Seconds before retry number `attempt` (0-based): full jitter, at least Retry-After."""
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    return max(delay, retry_after or 0)
+
+
+class GeminiClient:
+    """One keep-alive session to the generateContent endpoint, reused for every batch."""
+
+    def __init__(self, api_key=None, base_url=GEMINI_API_URL, model=MODEL_NAME,
+                 concurrency=CONCURRENCY, timeout=REQUEST_TIMEOUT, recorder=None):
+        self.url = f"{base_url.rstrip('/')}/v1beta/models/{model}:generateContent"
+        self.version = prompt_version(model)
+        self.recorder = recorder  # e.g. llm_replay.CassetteRecorder; gets every successful exchange
+        headers = {'Content-Type': 'application/json'}
+        if api_key:
+            headers['x-goog-api-key'] = api_key
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=timeout), headers=headers)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        await self.session.close()
+
+    async def generate(self, prompt):
+        """
+        POST one prompt; returns the response as a dict.
+
+        Raises:
+            TransientError: Throttled, server error, timeout or connection error
+            aiohttp.ClientResponseError: Any other HTTP error
+        """
+        start = time.perf_counter()
+        try:
+            async with self.session.post(self.url, json=request_body(prompt)) as response:
+                if response.status in TRANSIENT_STATUSES:
+                    raise TransientError(f"HTTP {response.status}",
+                                         parse_retry_after(response.headers.get('Retry-After')))
+                response.raise_for_status()
+                data = await response.json(content_type=None)
+                if self.recorder is not None:
+                    self.recorder.write(prompt, data, time.perf_counter() - start)
+                return data
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError,
+                ValueError) as e:
+            raise TransientError(repr(e))
+
+    async def categorize(self, items):
+        """{'id', 'category'} results for one batch of items."""
+        return parse_categories(await self.generate(build_prompt(items)))
+
+
+class RunStats:
+    """Counters for one categorization run."""
+
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.requeues = 0
+        self.splits = 0
+        self.batches = 0
+        self.categorized = 0
+        self.failed_ids = []
+        self.batch_sizes = []  # of the batches that succeeded
+        self.batch_seconds = []  # of the batches that succeeded, from first try to answer
+        self.cache_lookups = 0
+        self.cache_hits = 0
+        self.duplicates = 0  # items answered with another item's result in this run
+        self.cache_stored = 0
+        self.local_ids = []  # items answered by a local classifier
+        self.items = 0
+        self.missing = 0  # items left out of an answer (each time)
+        self.extra = 0  # results for IDs not in their batch, or repeated
+
+    def describe(self):
+        return (f"{self.categorized} categorized in {self.batches} batches, {self.requests} requests, "
+                f"{self.retries} retries, {self.requeues} requeues, {self.splits} splits, "
+                f"{len(self.failed_ids)} failed")
+
+    def describe_cache(self):
+        rate = self.cache_hits / self.cache_lookups if self.cache_lookups else 0
+        return (f"{self.cache_hits}/{self.cache_lookups} cache hits ({rate:.1%}), "
+                f"{self.duplicates} duplicate titles sent once, {self.cache_stored} titles stored")
+
+    def describe_coverage(self):
+        coverage = self.categorized / self.items if self.items else 1
+        return (f"{self.categorized}/{self.items} items categorized ({coverage:.1%}), "
+                f"{self.missing} left out by the model, "
+                f"{self.extra} unknown or repeated IDs ignored, {len(self.failed_ids)} failed")
+
+    def describe_routes(self):
+        local = len(self.local_ids)
+        llm = self.categorized - self.cache_hits - local
+        return f"{self.cache_hits} cache, {local} local, {llm} LLM, {len(self.failed_ids)} failed"
+
+
+def reconcile(batch, results):
+    """
+    Match a batch's results to its items by ID.
+
+    Returns:
+        (answered items, their results in the same order, items without a
+        result, results for IDs not in the batch or already answered)
+    """
+    batch_ids = {item['ID'] for item in batch}
+    answers = {}
+    extra = []
+    for result in results:
+        if result['id'] in batch_ids and result['id'] not in answers:
+            answers[result['id']] = result
+        else:
+            extra.append(result)
+    answered = [item for item in batch if item['ID'] in answers]
+    missing = [item for item in batch if item['ID'] not in answers]
+    return answered, [answers[item['ID']] for item in answered], missing, extra
+
+
+def use_cache(items, on_results, cache, version, stats):
+    """
+    Answer items from the cache and fold duplicate titles.
+
+    Cached items are passed to on_results right away. Of the rest, only
+    the first item per normalized title is returned for the LLM; the
+    returned callback stores its answers and repeats them for the others.
+
+    Returns:
+        (items to send, on_results wrapper)
+    """
+    # Titles without a key (missing, or only a verdict label) skip the cache and the deduplication
+    keys = {item['ID']: title_key(item['TITLE']) for item in items}
+    cached = cache.get_many([key for key in keys.values() if key is not None], version)
+    hits = [item for item in items if keys[item['ID']] in cached]
+    stats.cache_lookups += len(items)
+    stats.cache_hits += len(hits)
+    if hits:
+        stats.categorized += len(hits)
+        on_results(hits, [{'id': item['ID'], 'category': cached[keys[item['ID']]]} for item in hits])
+
+    # One request per distinct title; the others follow its result
+    followers = {}
+    unique = []
+    for item in items:
+        key = keys[item['ID']]
+        if key is None:
+            unique.append(item)
+            continue
+        if key in cached:
+            continue
+        if key in followers:
+            followers[key].append(item)
+            stats.duplicates += 1
+        else:
+            followers[key] = []
+            unique.append(item)
+
+    def store_results(batch, results):
+        batch_keys = {item['ID']: keys[item['ID']] for item in batch if keys[item['ID']] is not None}
+        answers = {batch_keys[result['id']]: result['category'] for result in results if result['id'] in batch_keys}
+        # Local answers are repeated for duplicates but not cached as LLM answers
+        llm_answers = {batch_keys[result['id']]: result['category'] for result in results
+                       if result['id'] in batch_keys and result.get('source', 'llm') == 'llm'}
+        cache.put_many(llm_answers, version)
+        stats.cache_stored += len(llm_answers)
+        copies = [follower for key in batch_keys.values() if key in answers for follower in followers[key]]
+        stats.categorized += len(copies)
+        sources = {batch_keys[result['id']]: result.get('source', 'llm') for result in results
+                   if result['id'] in batch_keys}
+        stats.local_ids += [item['ID'] for item in copies if sources[keys[item['ID']]] != 'llm']
+        on_results(batch + copies,
+                   results + [{'id': item['ID'], 'category': answers[keys[item['ID']]],
+                               'source': sources[keys[item['ID']]]} for item in copies])
+
+    return unique, store_results
+
+
+def use_classifier(items, on_results, classifier, stats):
+    """
+    Answer the items a local classifier is confident about.
+
+    Their results, marked with the classifier's source ('local' unless it
+    says otherwise), are passed to on_results right away; the returned
+    items are left for the LLM.
+    """
+    if not items:
+        return items
+    source = getattr(classifier, 'source', 'local')
+    labels, _, confident = classifier.classify([item['TITLE'] for item in items])
+    local = [item for item, ok in zip(items, confident) if ok]
+    if local:
+        stats.local_ids += [item['ID'] for item in local]
+        stats.categorized += len(local)
+        on_results(local, [{'id': item['ID'], 'category': label, 'source': source}
+                           for item, label, ok in zip(items, labels, confident) if ok])
+    return [item for item, ok in zip(items, confident) if not ok]
+
+
+async def categorize_with_retry(client, items, stats, max_attempts=MAX_ATTEMPTS):
+    """
+    Results for a batch, retrying transient errors with backoff; re-raises
+    the last one. Unusable output is re-raised at once for a batch of several
+    items, for the caller to split it, and after one retry for a single item.
+    """
+    for attempt in range(max_attempts):
+        stats.requests += 1
+        try:
+            return await client.categorize(items)
+        except TransientError as e:
+            if attempt == max_attempts - 1 or (isinstance(e, BatchOutputError) and (len(items) > 1 or attempt)):
+                raise
+            stats.retries += 1
+            await asyncio.sleep(backoff_delay(attempt, e.retry_after))
+
+
+async def categorize_items(client, items, on_results, token_budget=TOKEN_BUDGET, max_items=MAX_BATCH_ITEMS,
+                           concurrency=CONCURRENCY, max_attempts=MAX_ATTEMPTS, max_requeues=MAX_REQUEUES,
+                           cache=None, classifier=None, max_missing_rounds=MAX_MISSING_ROUNDS, progress=True):
+    """
+    Categorize items with up to `concurrency` batches in flight.
+
+    Args:
+        client: GeminiClient
+        items: List of {'ID', 'TITLE'} dicts
+        on_results: Called as on_results(items, results) in the event loop
+            as each batch finishes, e.g. to append them to the output;
+            results[i] is the answer for items[i]
+        token_budget, max_items: Batch limits (see plan_batches)
+        max_attempts: Tries per batch before it is requeued
+        max_requeues: Requeues per batch before its items count as failed
+        max_missing_rounds: Times items left out of an answer are queued
+            again before they count as failed
+        cache: Optional CategoryCache (see use_cache)
+        classifier: Optional TitleClassifier or KeywordTriage, or a list of
+            them tried in order; confident titles are not sent (see
+            use_classifier). Applied after the cache.
+
+    Returns:
+        RunStats; failed_ids lists the items of batches that never succeeded
+    """
+    stats = RunStats()
+    stats.items = len(items)
+    if cache is not None:
+        items, on_results = use_cache(items, on_results, cache, client.version, stats)
+    tiers = [tier for tier in (classifier if isinstance(classifier, (list, tuple)) else [classifier])
+             if tier is not None]
+    for tier in tiers:
+        items = use_classifier(items, on_results, tier, stats)
+    queue = asyncio.Queue()
+    batches = plan_batches(items, token_budget, max_items)
+    for batch in batches:
+        queue.put_nowait((batch, 0, 0))
+    if progress:
+        print(f"   Planned {describe_sizes([len(batch) for batch in batches])}")
+    missing_items = {}  # {round: items left out of answers}, sent when the queue runs dry
+
+    def queue_missing():
+        for rounds, pending in sorted(missing_items.items()):
+            for batch in plan_batches(pending, token_budget, max_items):
+                queue.put_nowait((batch, 0, rounds))
+        missing_items.clear()
+
+    async def worker():
+        while True:
+            batch, requeues, rounds = await queue.get()
+            start = time.perf_counter()
+            try:
+                results = await categorize_with_retry(client, batch, stats, max_attempts)
+            except BatchOutputError as e:
+                if len(batch) > 1:
+                    # Halve until the offending item is alone
+                    stats.splits += 1
+                    middle = len(batch) // 2
+                    queue.put_nowait((batch[:middle], requeues, rounds))
+                    queue.put_nowait((batch[middle:], requeues, rounds))
+                else:
+                    stats.failed_ids.append(batch[0]['ID'])
+                    if progress:
+                        print(f"\nItem {batch[0]['ID']} failed: {e}")
+            except TransientError as e:
+                if requeues < max_requeues:
+                    stats.requeues += 1
+                    queue.put_nowait((batch, requeues + 1, rounds))
+                else:
+                    stats.failed_ids += [item['ID'] for item in batch]
+                    if progress:
+                        print(f"\nBatch of {len(batch)} items failed after {requeues + 1} rounds: {e}")
+            else:
+                answered, results, missing, extra = reconcile(batch, results)
+                stats.batches += 1
+                stats.batch_sizes.append(len(batch))
+                stats.batch_seconds.append(time.perf_counter() - start)
+                stats.categorized += len(results)
+                stats.extra += len(extra)
+                if missing:
+                    stats.missing += len(missing)
+                    if rounds < max_missing_rounds:
+                        missing_items.setdefault(rounds + 1, []).extend(missing)
+                    else:
+                        stats.failed_ids += [item['ID'] for item in missing]
+                        if progress:
+                            print(f"\n{len(missing)} items still left out after {rounds + 1} answers")
+                if answered:
+                    on_results(answered, results)
+                if progress:
+                    print(f"   Batches done: {stats.batches} ({stats.describe()})...    ", end='\r')
+            finally:
+                if missing_items and queue.empty():
+                    queue_missing()
+                queue.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    finished = asyncio.create_task(queue.join())
+    try:
+        # A worker only finishes by raising (a non-transient error)
+        done, _ = await asyncio.wait([finished, *workers], return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in [finished, *workers]:
+            task.cancel()
+        await asyncio.gather(finished, *workers, return_exceptions=True)
+    for task in done:
+        if task is not finished:
+            task.result()
+    if progress:
+        print()
+        print(f"   Sent {describe_sizes(stats.batch_sizes)}")
+        if cache is not None:
+            print(f"   Cache (prompt version {client.version}): {stats.describe_cache()}")
+        if cache is not None or tiers:
+            print(f"   Routes: {stats.describe_routes()}")
+        print(f"   Coverage: {stats.describe_coverage()}")
+    return stats
+
+
+async def run_items(items, base_url, concurrency, token_budget=TOKEN_BUDGET, max_items=MAX_BATCH_ITEMS,
+                    api_key=None, model=MODEL_NAME, cache=None, classifier=None,
+                    max_missing_rounds=MAX_MISSING_ROUNDS, recorder=None):
+    """Categorize items against base_url; returns ({id: category}, stats, seconds)."""
+    categories = {}
+
+    def collect(batch, results):
+        categories.update((result['id'], result['category']) for result in results)
+
+    start = time.perf_counter()
+    async with GeminiClient(api_key, base_url, model, concurrency, recorder=recorder) as client:
+        stats = await categorize_items(client, items, collect, token_budget, max_items, concurrency,
+                                       cache=cache, classifier=classifier, max_missing_rounds=max_missing_rounds,
+                                       progress=False)
+    return categories, stats, time.perf_counter() - start
+
+
+def synthetic_items(count, poisoned=0, repeated=0.0, first_id=1):
+    """
+    {'ID', 'TITLE'} items with distinct titles of 4 to 43 words.
+
+    Args:
+        poisoned: Items whose title makes mock_gemini answer garbage
+        repeated: Share of items re-posting an earlier title with another
+            verdict label and case
+    """
+    from local_site import SAMPLE_WORDS
+    from mock_gemini import POISON_MARKER
+
+    items = []
+    for i in range(count):
+        words = ' '.join(SAMPLE_WORDS[(i * 7 + k * 3) % len(SAMPLE_WORDS)] for k in range(4 + i * 7 % 40))
+        items.append({'ID': first_id + i, 'TITLE': f"[SALAH] {words} #{i}"})
+    for i in range(1, count):
+        if (i * repeated) % 1 + repeated >= 1:
+            original = items[i * 7 % i]['TITLE']
+            items[i]['TITLE'] = '[HOAKS] ' + original.removeprefix('[SALAH] ').upper()
+    for i in range(poisoned):
+        items[(i * 2 + 1) * count // (poisoned * 2)]['TITLE'] += f" {POISON_MARKER}"
+    return items
+
+
+def run_benchmark(items=2000, latency=0.2, error_rate=0.1, poisoned=3, levels=(1, 2, 4, 8, 16),
+                  omit_rate=0.05, extra_rate=0.1):
+    """Time categorization against the mock endpoint at several concurrency levels."""
+    from category_cache import CategoryCache
+    from mock_gemini import POISON_MARKER, mock_category, serve_mock_gemini
+
+    rows = synthetic_items(items, poisoned)
+    expected = {row['ID']: mock_category(row['TITLE']) for row in rows if POISON_MARKER not in row['TITLE']}
+
+    print("=" * 60)
+    print(f"LLM CATEGORIZER BENCHMARK ({items} titles, {latency * 1000:.0f} ms latency, "
+          f"{error_rate:.0%} errors, {poisoned} poisoned titles)")
+    print("=" * 60)
+
+    # Estimated tokens per request: fixed 50-item batches vs the planner
+    for label, batches in (("fixed 50 items", [rows[i:i + 50] for i in range(0, len(rows), 50)]),
+                           ("token planner ", plan_batches(rows))):
+        tokens = [sum(map(estimate_tokens, batch)) for batch in batches]
+        print(f"   {label}: {describe_sizes([len(batch) for batch in batches])}, "
+              f"{min(tokens)}-{max(tokens)} est. tokens")
+
+    with tempfile.TemporaryDirectory() as root:
+        with serve_mock_gemini(root, latency=latency, error_rate=error_rate) as base_url:
+            for concurrency in levels:
+                categories, stats, elapsed = asyncio.run(run_items(rows, base_url, concurrency))
+                correct = categories == expected and len(stats.failed_ids) == poisoned
+                print(f"   concurrency={concurrency:<3} {elapsed:6.2f}s  {items / elapsed:7.1f} items/sec  "
+                      f"{stats.retries} retries, {stats.requeues} requeues, {stats.splits} splits, "
+                      f"{len(stats.failed_ids)} failed, {'all correct' if correct else 'MISMATCH'}")
+
+            # Cache: 20% of titles are re-posts, then the same titles under new IDs, then a new prompt version
+            print("   category cache (concurrency=4, 20% re-posted titles)")
+            reposted = synthetic_items(items, repeated=0.2)
+            runs = (("cold", reposted, MODEL_NAME),
+                    ("same titles, new IDs", synthetic_items(items, repeated=0.2, first_id=items + 1), MODEL_NAME),
+                    ("new prompt version", reposted, MODEL_NAME + '-tuned'))
+            with CategoryCache(os.path.join(root, 'cache.sqlite')) as cache:
+                for label, run_rows, model in runs:
+                    categories, stats, elapsed = asyncio.run(run_items(run_rows, base_url, 4, model=model,
+                                                                       cache=cache))
+                    correct = categories == {row['ID']: mock_category(row['TITLE']) for row in run_rows}
+                    print(f"      {label:<21} {elapsed:6.2f}s  {stats.requests:>3} requests  "
+                          f"{stats.describe_cache()}, {'all correct' if correct else 'MISMATCH'}")
+                print(f"      entries per version: {dict(cache.versions())}")
+
+        # Reconciliation: the model leaves items out and adds IDs nobody asked for
+        print(f"   reconciliation (concurrency=4, {omit_rate:.0%} of items left out, "
+              f"{extra_rate:.0%} of answers with an unknown ID)")
+        rows = synthetic_items(items)
+        expected = {row['ID']: mock_category(row['TITLE']) for row in rows}
+        with serve_mock_gemini(root, latency=latency, omit_rate=omit_rate, extra_rate=extra_rate) as base_url:
+            for label, rounds in (("no requeue", 0), ("requeue missing", MAX_MISSING_ROUNDS)):
+                categories, stats, elapsed = asyncio.run(run_items(rows, base_url, 4, max_missing_rounds=rounds))
+                wrong = sum(categories.get(row_id) not in (None, category) for row_id, category in expected.items())
+                print(f"      {label:<16} {elapsed:6.2f}s  {stats.requests:>3} requests  "
+                      f"{stats.describe_coverage()}, {wrong} wrong")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the asynchronous LLM categorizer")
+    parser.add_argument('--benchmark', action='store_true', help="run against a local mock endpoint")
+    parser.add_argument('--items', type=int, default=2000)
+    parser.add_argument('--latency', type=float, default=0.2, help="mock seconds per request")
+    parser.add_argument('--error-rate', type=float, default=0.1, help="share of mock requests failing with 503")
+    parser.add_argument('--poisoned', type=int, default=3, help="titles the mock answers with malformed JSON")
+    parser.add_argument('--omit-rate', type=float, default=0.05, help="share of items the mock leaves out")
+    parser.add_argument('--extra-rate', type=float, default=0.1, help="share of mock answers with an unknown ID")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.items, args.latency, args.error_rate, args.poisoned,
+                      omit_rate=args.omit_rate, extra_rate=args.extra_rate)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Record Gemini answers once, replay them locally.
+
+`categorize_hoaxes.py --record cassette.jsonl` appends every successful
+generateContent exchange to a cassette: one JSON line with the prompt's
+hash, its (ID, title) items, the response and the seconds it took.
+`serve` answers from the cassette through mock_gemini's handler, so the
+same latency, 503 and 429 injection apply, and no API quota is spent:
+
+- a prompt recorded verbatim gets its recorded response (a malformed one
+  too, so failures replay as well)
+- any other batch, e.g. from other batch-size settings or a split, is
+  composed from the recorded per-item answers
+- items never recorded get mock_gemini's keyword category and are counted
+
+Without --latency, responses take their recorded time; composed ones take
+a linear fit of recorded seconds against batch size (or the median).
+
+`--benchmark` replays a cassette (or records a synthetic one against
+mock_gemini first) over a grid of concurrency and token budgets, and
+reports items/sec, p50/p99 batch latency and retry overhead.
+
+Usage:
+    python3 categorize_hoaxes.py --record cassette.jsonl
+    python3 llm_replay.py serve cassette.jsonl [--port 8001] [--latency 0.2] [--error-rate 0.1] [--max-rate 20]
+    python3 categorize_hoaxes.py --base-url http://127.0.0.1:8001
+    python3 llm_replay.py --benchmark [--cassette cassette.jsonl] [--items 1000] [--error-rate 0.1]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from llm_categorizer import MAX_BATCH_ITEMS, BatchOutputError, parse_categories, run_items
+from mock_gemini import ITEM_PATTERN, MockGeminiHandler, mock_category, model_response, serve_mock_gemini
+
+CONCURRENCY_LEVELS = (1, 4, 16)
+TOKEN_BUDGETS = (500, 2000, 8000)
+
+
+def prompt_key(prompt):
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+
+class CassetteRecorder:
+    """Appends generateContent exchanges to a JSON-lines cassette (see GeminiClient(recorder=...))."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'a', encoding='utf-8')
+        self.recorded = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    def write(self, prompt, response, seconds):
+        record = {
+            'prompt': prompt_key(prompt),
+            'items': [[int(item_id), title] for item_id, title in ITEM_PATTERN.findall(prompt)],
+            'response': response,
+            'seconds': round(seconds, 4),
+        }
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.flush()
+        self.recorded += 1
+
+
+class Cassette:
+    """Recorded exchanges, indexed by prompt and by item."""
+
+    def __init__(self, path):
+        self.responses = {}  # prompt hash -> (response, seconds)
+        self.categories = {}  # (ID, title) -> category
+        sizes, seconds = [], []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                self.responses[record['prompt']] = (record['response'], record['seconds'])
+                sizes.append(len(record['items']))
+                seconds.append(record['seconds'])
+                try:
+                    answers = {result['id']: result['category'] for result in parse_categories(record['response'])}
+                except BatchOutputError:
+                    continue
+                for item_id, title in record['items']:
+                    if item_id in answers:
+                        self.categories[(item_id, title)] = answers[item_id]
+        # seconds ~ base + per_item * batch size, for batches that were not recorded verbatim
+        self.per_item, self.base = 0.0, float(np.median(seconds)) if seconds else 0.0
+        if len(set(sizes)) > 1:
+            per_item, base = np.polyfit(sizes, seconds, 1)
+            if per_item > 0:  # else the sizes don't explain the time; keep the median
+                self.per_item, self.base = float(per_item), float(base)
+        self.lock = threading.Lock()
+        self.exact = self.composed = self.unrecorded = 0
+
+    def __len__(self):
+        return len(self.responses)
+
+    def replay(self, prompt):
+        """(response, recorded or estimated seconds) for a prompt."""
+        recorded = self.responses.get(prompt_key(prompt))
+        if recorded is not None:
+            with self.lock:
+                self.exact += 1
+            return recorded
+        results, unrecorded = [], 0
+        items = ITEM_PATTERN.findall(prompt)
+        for item_id, title in items:
+            category = self.categories.get((int(item_id), title))
+            if category is None:
+                category = mock_category(title)
+                unrecorded += 1
+            results.append({'id': int(item_id), 'category': category})
+        with self.lock:
+            self.composed += 1
+            self.unrecorded += unrecorded
+        seconds = max(0.0, self.base + self.per_item * len(items))
+        return model_response(json.dumps(results), prompt, len(results)), seconds
+
+    def describe(self):
+        return (f"{self.exact} recorded verbatim, {self.composed} composed from recorded items, "
+                f"{self.unrecorded} items not in the cassette")
+
+
+class ReplayHandler(MockGeminiHandler):
+    """MockGeminiHandler answering from a Cassette; sleeps the recorded time unless a latency is set."""
+
+    cassette = None
+
+    def answer(self, text):
+        response, seconds = self.cassette.replay(text)
+        if not self.latency:
+            time.sleep(seconds)
+        return response
+
+
+@contextlib.contextmanager
+def serve_replay(cassette, port=0, latency=0.0, error_rate=0.0, max_rate=None, retry_after=1):
+    """
+    Serve a Cassette on 127.0.0.1 in a background thread (see mock_gemini.serve_mock_gemini).
+
+    Yields:
+        Base URL to pass as categorize_hoaxes.py --base-url
+    """
+    handler_class = type('CassetteReplayHandler', (ReplayHandler,), {'cassette': cassette})
+    with tempfile.TemporaryDirectory() as root:
+        with serve_mock_gemini(root, port, latency, error_rate, max_rate, retry_after,
+                               handler_class=handler_class) as url:
+            yield url
+
+
+def record_synthetic(path, items, latency=0.2):
+    """Record a cassette of synthetic titles against mock_gemini."""
+    from llm_categorizer import synthetic_items
+
+    with tempfile.TemporaryDirectory() as root, CassetteRecorder(path) as recorder:
+        with serve_mock_gemini(root, latency=latency) as base_url:
+            asyncio.run(run_items(synthetic_items(items), base_url, 4, recorder=recorder))
+        return recorder.recorded
+
+
+def percentile_ms(values, q):
+    return np.percentile(values, q) * 1000 if values else 0.0
+
+
+def run_benchmark(cassette_path=None, items=1000, latency=None, error_rate=0.1,
+                  levels=CONCURRENCY_LEVELS, budgets=TOKEN_BUDGETS):
+    """Replay a cassette over concurrency x token budget; items/sec, batch latency, retry overhead."""
+    with tempfile.TemporaryDirectory() as root:
+        if cassette_path is None:
+            cassette_path = os.path.join(root, 'cassette.jsonl')
+            recorded = record_synthetic(cassette_path, items)
+            print(f"Recorded {recorded} synthetic exchanges against mock_gemini to a temporary cassette")
+        cassette = Cassette(cassette_path)
+        rows = [{'ID': item_id, 'TITLE': title} for item_id, title in cassette.categories]
+        expected = {row['ID']: cassette.categories[(row['ID'], row['TITLE'])] for row in rows}
+
+        print("=" * 60)
+        print(f"REPLAY BENCHMARK ({len(rows)} titles from {len(cassette)} recorded exchanges, "
+              f"{'recorded' if latency is None else f'{latency * 1000:.0f} ms'} latency, {error_rate:.0%} errors)")
+        print("=" * 60)
+        print(f"   {'concurrency':>11} {'budget':>6} {'batches':>7} {'items/sec':>9} {'p50 ms':>7} {'p99 ms':>7} "
+              f"{'retry %':>7}  result")
+        with serve_replay(cassette, latency=latency or 0.0, error_rate=error_rate) as base_url:
+            for concurrency in levels:
+                for budget in budgets:
+                    categories, stats, elapsed = asyncio.run(
+                        run_items(rows, base_url, concurrency, budget, max(MAX_BATCH_ITEMS, budget // 10)))
+                    # Retry overhead: requests beyond one per batch that succeeded
+                    overhead = (stats.requests - stats.batches) / max(stats.batches, 1)
+                    correct = categories == expected
+                    print(f"   {concurrency:>11} {budget:>6} {stats.batches:>7} {len(rows) / elapsed:>9.1f} "
+                          f"{percentile_ms(stats.batch_seconds, 50):>7.0f} {percentile_ms(stats.batch_seconds, 99):>7.0f} "
+                          f"{overhead:>7.1%}  {'all correct' if correct else 'MISMATCH'}")
+        print(f"   Replayed: {cassette.describe()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record/replay harness for the LLM categorizer")
+    parser.add_argument('command', nargs='?', choices=['serve'])
+    parser.add_argument('cassette', nargs='?', help="cassette recorded with categorize_hoaxes.py --record")
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency', type=float, help="seconds per response (default: as recorded)")
+    parser.add_argument('--error-rate', type=float, help="share of requests answered with 503 (benchmark: 0.1)")
+    parser.add_argument('--max-rate', type=float, help="answer 429 above this many requests/sec")
+    parser.add_argument('--retry-after', type=int, default=1, help="Retry-After seconds sent with a 429")
+    parser.add_argument('--benchmark', action='store_true', help="replay over concurrency and token budgets")
+    parser.add_argument('--cassette', dest='benchmark_cassette', help="cassette for --benchmark (default: synthetic)")
+    parser.add_argument('--items', type=int, default=1000, help="synthetic titles to record for --benchmark")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.benchmark_cassette, args.items, args.latency,
+                      0.1 if args.error_rate is None else args.error_rate)
+    elif args.command == 'serve' and args.cassette:
+        cassette = Cassette(args.cassette)
+        with serve_replay(cassette, args.port, args.latency or 0.0, args.error_rate or 0.0,
+                          args.max_rate, args.retry_after) as url:
+            print(f"Replaying {len(cassette)} exchanges ({len(cassette.categories)} items) at {url} (Ctrl+C to stop)")
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                print(f"\nStopped. {cassette.describe()}")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
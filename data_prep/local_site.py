@@ -0,0 +1,343 @@
+"""
+Local stand-in for turnbackhoax.id.
+
+Serves saved pages from a directory over HTTP/1.1 (keep-alive) so the crawler
+scripts can be exercised and benchmarked without touching the real site.
+A listing page saved as <root>/page/39/index.html is served at /page/39/.
+Recorded responses (see save_recording) are replayed verbatim, which covers
+URLs with query strings such as the WordPress REST API. With --max-rate the
+server answers 429 with a Retry-After header once clients go faster than that,
+to exercise rate_limiter.py.
+
+Usage:
+    python3 local_site.py <root_dir> [--port 8000] [--latency 0.05]
+    python3 local_site.py <root_dir> --generate 60 [--per-page 20]
+    python3 local_site.py <root_dir> --max-rate 5 [--retry-after 1]
+"""
+
+import argparse
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+LISTING_ITEM_TEMPLATE = """
+<article class="mh-loop-item mh-clearfix post-{post_id} post type-post status-publish">
+    <figure class="mh-loop-thumb">
+        <a href="{url}"><img width="326" height="245" src="{image_url}" class="attachment-mh-magazine-medium" alt="" /></a>
+    </figure>
+    <div class="mh-loop-content mh-clearfix">
+        <header class="mh-loop-header">
+            <h3 class="entry-title mh-loop-title">
+                <a href="{url}" rel="bookmark">{title}</a>
+            </h3>
+            <div class="mh-meta mh-loop-meta">
+                <span class="mh-meta-date updated"><i class="far fa-clock"></i>{date}</span>
+                <span class="mh-meta-author author vcard"><i class="fa fa-user"></i><a class="fn" href="{base_url}/author/{author}/">{author}</a></span>
+            </div>
+        </header>
+        <div class="mh-loop-excerpt">
+            <div class="mh-excerpt"><p>{preview} <a class="mh-excerpt-more" href="{url}" title="{title}">[&#8230;]</a></p></div>
+        </div>
+    </div>
+</article>
+"""
+
+LISTING_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="id-ID">
+<head><meta charset="UTF-8" /><title>Turn Back Hoax - Page {page_number}</title>
+<script>var mh = {{"page": {page_number}}};</script></head>
+<body class="home blog">
+<div class="mh-container"><div id="main-content" class="mh-loop mh-content">
+{items}
+</div></div>
+</body>
+</html>
+"""
+
+ARTICLE_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="id-ID">
+<head><meta charset="UTF-8" /><title>{title}</title><style>.mh-container {{ width: 100%; }}</style></head>
+<body class="post-template-default single single-post postid-{post_id}">
+<article id="post-{post_id}" class="post-{post_id} post type-post status-publish">
+    <header class="entry-header mh-clearfix">
+        <h1 class="entry-title">{title}</h1>
+        <span class="entry-meta-categories"><a href="{base_url}/category/{category_slug}/">{category}</a></span>
+    </header>
+    <div class="entry-content mh-clearfix">
+        <p>[KATEGORI] : Konten yang Menyesatkan</p>
+        <p>=======</p>
+        <p>[SUMBER] : Facebook<br />https://www.facebook.com/{post_id}</p>
+        <p>=======</p>
+        <p>[NARASI] : &#8220;{narrative}&#8221;</p>
+        <p>=======</p>
+        <p>[PENJELASAN] : {explanation}</p>
+        <script>console.log("share buttons");</script>
+        <p>[REFERENSI] :<br /><a href="https://cekfakta.example/{post_id}">https://cekfakta.example/{post_id}</a></p>
+    </div>
+</article>
+</body>
+</html>
+"""
+
+SAMPLE_WORDS = [
+    'prabowo', 'gibran', 'anies', 'ganjar', 'jokowi', 'kpu', 'bawaslu', 'pemilu',
+    'bansos', 'hadiah', 'undian', 'rekening', 'gempa', 'banjir', 'vaksin',
+    'beredar', 'video', 'surat', 'suara', 'kampanye', 'rakyat', 'jakarta',
+    'bantuan', 'pemerintah', 'warga', 'presiden', 'debat', 'relawan',
+]
+
+RECORDINGS_DIR = '_recorded'
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def recording_key(path_and_query):
+    """File name stem for a recorded response to the given request target."""
+    return hashlib.sha1(path_and_query.encode('utf-8')).hexdigest()
+
+
+def save_recording(root_dir, path_and_query, body, headers):
+    """
+    Save a response so the local site replays it for the same request target.
+
+    Args:
+        root_dir: Directory served by serve_site
+        path_and_query: Request target, e.g. /wp-json/wp/v2/posts?page=2
+        body: Response body (bytes)
+        headers: Response headers to replay (Content-Type, X-WP-TotalPages, ...)
+    """
+    directory = os.path.join(root_dir, RECORDINGS_DIR)
+    os.makedirs(directory, exist_ok=True)
+    stem = os.path.join(directory, recording_key(path_and_query))
+    with open(stem + '.body', 'wb') as f:
+        f.write(body)
+    with open(stem + '.json', 'w', encoding='utf-8') as f:
+        json.dump({'target': path_and_query, 'headers': dict(headers)}, f, indent=2)
+
+
+class ServerThrottle:
+    """Server-side token bucket deciding which requests get a 429."""
+
+    def __init__(self, max_rate, retry_after=1):
+        self.max_rate = max_rate
+        self.retry_after = retry_after
+        self.allowed = 0
+        self.rejected = 0
+        self._tokens = max(1.0, max_rate)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def admit(self):
+        """True if the request may be served now."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(max(1.0, self.max_rate), self._tokens + (now - self._last) * self.max_rate)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.allowed += 1
+                return True
+            self.rejected += 1
+            return False
+
+
+class LocalSiteHandler(SimpleHTTPRequestHandler):
+    """
+    Static file handler with keep-alive, ETags and optional artificial latency.
+
+    Last-Modified / If-Modified-Since come from SimpleHTTPRequestHandler; ETag /
+    If-None-Match are added here so conditional GETs can be exercised locally.
+    If the server has a ServerThrottle, requests over its rate get a 429.
+    """
+
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+
+    def do_GET(self):
+        throttle = getattr(self.server, 'throttle', None)
+        if throttle is not None and not throttle.admit():
+            self._etag = None
+            self.send_response(429)
+            self.send_header('Retry-After', str(throttle.retry_after))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if self._replay_recording():
+            return
+
+        self._etag = None
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, 'index.html')
+        if os.path.isfile(path):
+            st = os.stat(path)
+            self._etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+            if self.headers.get('If-None-Match') == self._etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+
+        super().do_GET()
+
+    def _replay_recording(self):
+        stem = os.path.join(self.directory, RECORDINGS_DIR, recording_key(self.path))
+        if not os.path.isfile(stem + '.body'):
+            return False
+        with open(stem + '.json', encoding='utf-8') as f:
+            headers = json.load(f)['headers']
+        with open(stem + '.body', 'rb') as f:
+            body = f.read()
+
+        self._etag = None
+        self.send_response(200)
+        for name, value in headers.items():
+            if name.lower() not in ('content-length', 'transfer-encoding', 'connection', 'content-encoding'):
+                self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return True
+
+    def end_headers(self):
+        if getattr(self, '_etag', None):
+            self.send_header('ETag', self._etag)
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable
+        pass
+
+
+@contextlib.contextmanager
+def serve_site(root_dir, port=0, latency=0.0, handler_class=LocalSiteHandler, max_rate=None, retry_after=1):
+    """
+    Serve root_dir on 127.0.0.1 in a background thread.
+
+    Args:
+        root_dir: Directory holding the saved pages
+        port: Port to bind (0 picks a free one)
+        latency: Seconds to sleep before answering each request
+        handler_class: Request handler to use
+        max_rate: If set, answer 429 to requests beyond this many per second
+        retry_after: Retry-After seconds sent with those 429s
+
+    Yields:
+        Base URL of the running server, e.g. http://127.0.0.1:54321
+    """
+    handler = functools.partial(
+        type('ConfiguredHandler', (handler_class,), {'latency': latency}),
+        directory=str(root_dir),
+    )
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    server.throttle = ServerThrottle(max_rate, retry_after) if max_rate else None
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _words(seed, count):
+    return ' '.join(SAMPLE_WORDS[(seed * 7 + i * 3) % len(SAMPLE_WORDS)] for i in range(count))
+
+
+def fixture_post(post_id, base_url):
+    """Fields of one synthetic hoax post; 'path' is its URL path without slashes."""
+    month = MONTHS[post_id % 12]
+    day = post_id % 28 + 1
+    slug = f"salah-{post_id}-{_words(post_id, 3).replace(' ', '-')}"
+    path = f"2024/{MONTHS.index(month) + 1:02d}/{day:02d}/{slug}"
+    return {
+        'post_id': post_id,
+        'path': path,
+        'url': f"{base_url}/{path}/",
+        'image_url': f"{base_url}/wp-content/uploads/2024/{post_id}.jpg",
+        'title': f"[SALAH] {_words(post_id, 8).title()}",
+        'date': f"{day} {month} 2024",
+        'author': f"author{post_id % 5}",
+        'preview': _words(post_id, 30),
+        'base_url': base_url,
+        'category': 'Salah' if post_id % 3 else 'Hoaks',
+        'category_slug': 'salah' if post_id % 3 else 'hoaks',
+        'narrative': _words(post_id, 60),
+        'explanation': _words(post_id + 1, 120),
+    }
+
+
+def render_article(post):
+    """Article page HTML for a fixture_post()."""
+    return ARTICLE_PAGE_TEMPLATE.format(**post)
+
+
+def write_fixture_site(root_dir, base_url, start_page=1, end_page=10, per_page=20):
+    """
+    Write synthetic listing and article pages mimicking the site's markup.
+
+    Article links point at base_url, so call this with the URL of the server
+    that will serve root_dir.
+
+    Returns:
+        Number of articles written
+    """
+    post_id = 0
+    for page_number in range(start_page, end_page + 1):
+        items = []
+        for position in range(per_page):
+            post_id += 1
+            post = fixture_post(post_id, base_url)
+            items.append(LISTING_ITEM_TEMPLATE.format(**post))
+
+            article_dir = os.path.join(root_dir, post['path'])
+            os.makedirs(article_dir, exist_ok=True)
+            with open(os.path.join(article_dir, 'index.html'), 'w', encoding='utf-8') as f:
+                f.write(render_article(post))
+
+        page_dir = os.path.join(root_dir, 'page', str(page_number))
+        os.makedirs(page_dir, exist_ok=True)
+        with open(os.path.join(page_dir, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(LISTING_PAGE_TEMPLATE.format(page_number=page_number, items=''.join(items)))
+
+    return post_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve saved turnbackhoax.id pages locally")
+    parser.add_argument('root_dir', help="directory with saved pages")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--generate', type=int, default=0, metavar='PAGES',
+                        help="write this many synthetic listing pages first")
+    parser.add_argument('--per-page', type=int, default=20)
+    parser.add_argument('--max-rate', type=float, help="answer 429 above this many requests/sec")
+    parser.add_argument('--retry-after', type=int, default=1, help="Retry-After seconds sent with a 429")
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    if args.generate:
+        count = write_fixture_site(args.root_dir, base_url, 1, args.generate, args.per_page)
+        print(f"Wrote {args.generate} listing pages and {count} articles to {args.root_dir}")
+
+    with serve_site(args.root_dir, port=args.port, latency=args.latency,
+                    max_rate=args.max_rate, retry_after=args.retry_after) as url:
+        print(f"Serving {args.root_dir} at {url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Gemini generateContent endpoint.
+
+Answers POST /v1beta/models/<model>:generateContent with the response shape
+of the real API: the JSON list of {"id", "category"} objects that
+categorize_hoaxes.py asks for, as the text of the first candidate. The
+items are read back from the prompt's "ID: ... / Title: ..." lines and
+categorized by keyword, so results are deterministic. A batch holding a
+title with POISON_MARKER gets malformed JSON back, like a model choking on
+one bad item. To exercise reconciliation, the answer can leave out a share
+of the items (omit_rate) and add results for IDs that were not asked
+(extra_rate, per response).
+
+For exercising retries, the server can add latency, fail a share of
+requests with 503 (error_rate) and answer 429 with Retry-After above a
+request rate (max_rate, see local_site.ServerThrottle).
+
+Usage:
+    python3 mock_gemini.py [--port 8001] [--latency 0.2] [--error-rate 0.1] [--max-rate 20]
+                           [--omit-rate 0.05] [--extra-rate 0.1]
+    python3 categorize_hoaxes.py --base-url http://127.0.0.1:8001
+"""
+
+import argparse
+import json
+import random
+import re
+import tempfile
+import time
+
+from local_site import LocalSiteHandler, serve_site
+
+ITEM_PATTERN = re.compile(r'^ID: (-?\d+)\nTitle: (.*)$', re.MULTILINE)
+POISON_MARKER = '<<malformed>>'
+
+POLITICS_WORDS = ('prabowo', 'gibran', 'anies', 'ganjar', 'jokowi', 'kpu', 'bawaslu', 'pemilu',
+                  'capres', 'kampanye', 'debat', 'partai', 'suara')
+SCAM_WORDS = ('hadiah', 'undian', 'rekening', 'giveaway', 'pinjol', 'lowongan', 'bansos', 'transfer')
+
+
+def mock_category(title):
+    """Keyword category for a title: politics, scam or others."""
+    title = title.lower()
+    if any(word in title for word in POLITICS_WORDS):
+        return 'politics'
+    if any(word in title for word in SCAM_WORDS):
+        return 'scam'
+    return 'others'
+
+
+def prompt_text(request):
+    """Concatenated text parts of a generateContent request body."""
+    return ''.join(part.get('text', '') for content in request.get('contents', [])
+                   for part in content.get('parts', []))
+
+
+def generate_response(text, omit_rate=0.0, extra_rate=0.0):
+    """generateContent response (as a dict) for a hoax categorization prompt."""
+    results = [{'id': int(item_id), 'category': mock_category(title)}
+               for item_id, title in ITEM_PATTERN.findall(text)
+               if not (omit_rate and random.random() < omit_rate)]
+    if extra_rate and random.random() < extra_rate:
+        results.append({'id': random.randint(10 ** 8, 10 ** 9), 'category': 'others'})
+    answer = json.dumps(results)
+    if POISON_MARKER in text:
+        answer = answer[:len(answer) // 2]
+    return model_response(answer, text, len(results))
+
+
+def model_response(answer, prompt, count):
+    """generateContent response carrying `answer` as the model's text for `count` items."""
+    return {
+        'candidates': [{
+            'content': {'parts': [{'text': answer}], 'role': 'model'},
+            'finishReason': 'STOP',
+            'index': 0,
+        }],
+        'usageMetadata': {'promptTokenCount': len(prompt) // 4,
+                          'candidatesTokenCount': count * 12},
+    }
+
+
+class MockGeminiHandler(LocalSiteHandler):
+    """POST handler for :generateContent; GET still serves files like the local site."""
+
+    error_rate = 0.0
+    omit_rate = 0.0
+    extra_rate = 0.0
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        throttle = getattr(self.server, 'throttle', None)
+        if throttle is not None and not throttle.admit():
+            self._send_json(429, {'error': {'code': 429, 'message': "Resource has been exhausted",
+                                            'status': 'RESOURCE_EXHAUSTED'}},
+                            {'Retry-After': str(throttle.retry_after)})
+            return
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if not self.path.split('?')[0].endswith(':generateContent'):
+            self._send_json(404, {'error': {'code': 404, 'message': "Not found", 'status': 'NOT_FOUND'}})
+            return
+        if self.error_rate and random.random() < self.error_rate:
+            self._send_json(503, {'error': {'code': 503, 'message': "The model is overloaded",
+                                            'status': 'UNAVAILABLE'}})
+            return
+
+        try:
+            request = json.loads(body)
+        except ValueError:
+            self._send_json(400, {'error': {'code': 400, 'message': "Invalid JSON payload",
+                                            'status': 'INVALID_ARGUMENT'}})
+            return
+        self._send_json(200, self.answer(prompt_text(request)))
+
+    def answer(self, text):
+        """Response for a prompt; subclasses (llm_replay.ReplayHandler) answer differently."""
+        return generate_response(text, self.omit_rate, self.extra_rate)
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode('utf-8')
+        self._etag = None
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def serve_mock_gemini(root_dir, port=0, latency=0.0, error_rate=0.0, max_rate=None, retry_after=1,
+                      omit_rate=0.0, extra_rate=0.0, handler_class=MockGeminiHandler):
+    """
+    Serve the mock endpoint on 127.0.0.1 in a background thread (see local_site.serve_site).
+
+    Yields:
+        Base URL to pass as categorize_hoaxes.py --base-url
+    """
+    handler_class = type('ConfiguredMockGeminiHandler', (handler_class,),
+                         {'error_rate': error_rate, 'omit_rate': omit_rate, 'extra_rate': extra_rate})
+    return serve_site(root_dir, port, latency, handler_class, max_rate, retry_after)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the Gemini API")
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument('--max-rate', type=float, help="answer 429 above this many requests/sec")
+    parser.add_argument('--retry-after', type=int, default=1, help="Retry-After seconds sent with a 429")
+    parser.add_argument('--omit-rate', type=float, default=0.0, help="share of items left out of answers")
+    parser.add_argument('--extra-rate', type=float, default=0.0, help="share of answers with an unknown ID")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        with serve_mock_gemini(root, args.port, args.latency, args.error_rate,
+                               args.max_rate, args.retry_after, args.omit_rate, args.extra_rate) as url:
+            print(f"Mock Gemini API at {url} (Ctrl+C to stop)")
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
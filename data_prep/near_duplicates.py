@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate clustering of hoaxes with MinHash and LSH banding.
+
+The same narrative is often debunked several times with light rewording.
+Every hoax's TITLE and HOAX_TEXT are cut into word shingles (runs of
+SHINGLE_SIZE words) and summarized by a MinHash signature of NUM_PERM
+values; two signatures agree in a position with probability equal to the
+Jaccard similarity of the shingle sets. The signatures are split into BANDS
+bands, hoaxes whose band values all match land in the same bucket, and
+each bucket's members are compared with its first member. Pairs whose
+signatures agree in at least THRESHOLD of the positions are joined, and
+the connected components are the clusters.
+
+Everything after tokenization is NumPy over the whole corpus: shingle
+hashes, signatures (in blocks, so memory stays bounded), band keys,
+bucket grouping and the agreement check.
+
+The output has one row per hoax: ID, CLUSTER_ID (the lowest ID in its
+cluster) and CLUSTER_SIZE. The cluster's representative is the hoax whose
+ID equals its CLUSTER_ID; downstream stages take --representatives to keep
+only those.
+
+Usage:
+    python3 near_duplicates.py [structured_csv] [--output clusters_csv] [--threshold 0.5]
+    python3 near_duplicates.py --benchmark [--docs 100000]
+"""
+
+import argparse
+import os
+import re
+import string
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+STRUCTURED_CSV = "Scraping turnbackhoax.id - Structured.csv"
+CLUSTERS_CSV = "Scraping turnbackhoax.id - Clusters.csv"
+
+SHINGLE_SIZE = 3  # words per shingle
+NUM_PERM = 64
+BANDS = 16  # of NUM_PERM // BANDS = 4 rows: candidates from Jaccard ~(1/16)^(1/4) = 0.5 up
+THRESHOLD = 0.5  # estimated Jaccard similarity to join two hoaxes
+SEED = 1
+SHINGLE_BLOCK = 1 << 16  # shingles per block of the signature computation
+
+PUNCTUATION = string.punctuation + '“”‘’…–—«»'  # stripped from both ends of a token
+VERDICT_PATTERN = re.compile(r'^\s*\[[^\]]*\]')  # "[SALAH]", "[HOAKS]" title prefixes
+
+
+def _mix64(x):
+    """splitmix64 finalizer, elementwise on a uint64 array."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def hoax_texts(df):
+    """TITLE without its verdict label, plus HOAX_TEXT when it isn't just the title."""
+    titles = df['TITLE'].fillna('').astype(str).str.replace(VERDICT_PATTERN, '', regex=True)
+    texts = df['HOAX_TEXT'].fillna('').astype(str)
+    return (titles + ' ' + texts.where(texts != df['TITLE'].fillna(''), '')).tolist()
+
+
+def tokenize(texts, shingle_size=SHINGLE_SIZE):
+    """
+    Token IDs of every text, concatenated.
+
+    Texts are lowercased, split on (Unicode) whitespace and stripped of
+    surrounding punctuation in Arrow kernels; the tokens are then
+    dictionary-encoded. Texts shorter than shingle_size are padded (with the
+    largest uint64 as ID) so each has exactly one shingle.
+
+    Returns:
+        (token_ids, offsets, empty): uint64 IDs, the start of each text's
+        tokens (len(texts) + 1 entries) and a mask of texts without words
+    """
+    words = pc.utf8_split_whitespace(pc.utf8_lower(pa.array(texts, type=pa.string())))
+    parents = pc.list_parent_indices(words).to_numpy()
+    tokens = pc.utf8_trim(pc.list_flatten(words), PUNCTUATION)
+    kept = pc.not_equal(tokens, '').to_numpy(zero_copy_only=False)
+    ids = pc.dictionary_encode(tokens.filter(kept)).indices.to_numpy().astype(np.uint64)
+
+    counts = np.bincount(parents[kept], minlength=len(texts))
+    padded = np.maximum(counts, shingle_size)
+    offsets = np.concatenate(([0], np.cumsum(padded)))
+    token_ids = np.full(offsets[-1], np.iinfo(np.uint64).max, dtype=np.uint64)
+    # Position of each kept token within its text, moved to the padded layout
+    position = np.arange(len(ids)) - np.repeat(np.cumsum(counts) - counts, counts)
+    token_ids[np.repeat(offsets[:-1], counts) + position] = ids
+    return token_ids, offsets, counts == 0
+
+
+def shingle_hashes(token_ids, offsets, shingle_size=SHINGLE_SIZE):
+    """
+    32-bit hashes of every run of shingle_size tokens within a text.
+
+    Returns:
+        (hashes, starts): uint32 hashes, and the index of each text's first
+        shingle (every text has at least one)
+    """
+    doc = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    count = len(token_ids) - shingle_size + 1
+    valid = doc[:count] == doc[shingle_size - 1:]
+
+    hashes = np.zeros(count, dtype=np.uint64)
+    for k in range(shingle_size):
+        hashes = _mix64(hashes ^ token_ids[k:k + count])
+    hashes = (hashes[valid] >> np.uint64(32)).astype(np.uint32)
+
+    shingle_counts = np.diff(offsets) - shingle_size + 1
+    starts = np.concatenate(([0], np.cumsum(shingle_counts)[:-1]))
+    return hashes, starts
+
+
+def minhash_signatures(hashes, starts, num_perm=NUM_PERM, seed=SEED):
+    """
+    MinHash signature of each text: for num_perm random permutations
+    h -> a * h + b (mod 2**32, a odd) of the shingle hashes, the minimum
+    over the text's shingles.
+
+    Returns:
+        uint32 array of shape (texts, num_perm)
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 1 << 32, size=(num_perm, 1), dtype=np.uint32) | np.uint32(1)
+    b = rng.integers(0, 1 << 32, size=(num_perm, 1), dtype=np.uint32)
+
+    texts = len(starts)
+    ends = np.append(starts[1:], len(hashes))
+    signatures = np.empty((texts, num_perm), dtype=np.uint32)
+    # One row per permutation: reduceat then runs along contiguous memory
+    buffer = np.empty((num_perm, SHINGLE_BLOCK), dtype=np.uint32)
+    first = 0
+    while first < texts:
+        # Whole texts per block, at least one
+        last = max(first + 1, np.searchsorted(ends, starts[first] + SHINGLE_BLOCK, side='right'))
+        block = hashes[starts[first]:ends[last - 1]]
+        if len(block) > buffer.shape[1]:
+            buffer = np.empty((num_perm, len(block)), dtype=np.uint32)
+        permuted = buffer[:, :len(block)]
+        np.multiply(a, block, out=permuted)
+        permuted += b
+        signatures[first:last] = np.minimum.reduceat(permuted, starts[first:last] - starts[first], axis=1).T
+        first = last
+    return signatures
+
+
+def candidate_pairs(signatures, bands=BANDS):
+    """
+    (member, head) index pairs of texts that share a band bucket, where head
+    is the bucket's first text. Stars instead of all pairs keep this linear
+    in bucket size.
+    """
+    texts, num_perm = signatures.shape
+    rows = num_perm // bands
+    weights = _mix64(np.arange(1, rows + 1, dtype=np.uint64))
+    members, heads = [], []
+    for band in range(bands):
+        values = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64)
+        keys = _mix64((values * weights).sum(axis=1) + np.uint64(band))
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        new_bucket = np.empty(texts, dtype=bool)
+        new_bucket[0] = True
+        new_bucket[1:] = sorted_keys[1:] != sorted_keys[:-1]
+        head = order[np.flatnonzero(new_bucket)[np.cumsum(new_bucket) - 1]]
+        linked = ~new_bucket
+        members.append(order[linked])
+        heads.append(head[linked])
+    return np.concatenate(members), np.concatenate(heads)
+
+
+def cluster_signatures(signatures, empty=None, bands=BANDS, threshold=THRESHOLD):
+    """
+    Component label of every text: candidate pairs whose signatures agree in
+    at least `threshold` of the positions are joined. Texts in `empty` stay
+    on their own.
+    """
+    texts = len(signatures)
+    members, heads = candidate_pairs(signatures, bands)
+    if empty is not None:
+        keep = ~(empty[members] | empty[heads])
+        members, heads = members[keep], heads[keep]
+
+    agreement = np.empty(len(members))
+    for start in range(0, len(members), SHINGLE_BLOCK):
+        part = slice(start, start + SHINGLE_BLOCK)
+        agreement[part] = (signatures[members[part]] == signatures[heads[part]]).mean(axis=1)
+    joined = agreement >= threshold
+
+    graph = coo_matrix((np.ones(joined.sum(), dtype=np.int8), (members[joined], heads[joined])),
+                       shape=(texts, texts))
+    _, labels = connected_components(graph, directed=False)
+    return labels
+
+
+def cluster_texts(texts, shingle_size=SHINGLE_SIZE, num_perm=NUM_PERM, bands=BANDS,
+                  threshold=THRESHOLD, seed=SEED, timings=None):
+    """Component label of every text (see cluster_signatures)."""
+    if len(texts) == 0:
+        return np.zeros(0, dtype=np.int32)
+    steps = [time.perf_counter()]
+    token_ids, offsets, empty = tokenize(texts, shingle_size)
+    steps.append(time.perf_counter())
+    hashes, starts = shingle_hashes(token_ids, offsets, shingle_size)
+    signatures = minhash_signatures(hashes, starts, num_perm, seed)
+    steps.append(time.perf_counter())
+    labels = cluster_signatures(signatures, empty, bands, threshold)
+    steps.append(time.perf_counter())
+    if timings is not None:
+        timings.update(zip(('tokenize', 'minhash', 'lsh + components'), np.diff(steps)))
+    return labels
+
+
+def cluster_frame(df, **options):
+    """ID, CLUSTER_ID (lowest ID in the cluster) and CLUSTER_SIZE for every hoax in df."""
+    labels = cluster_texts(hoax_texts(df), **options)
+    ids = pd.to_numeric(df['ID']).astype('int64')
+    groups = pd.Series(ids.to_numpy()).groupby(labels)
+    return pd.DataFrame({
+        'ID': ids.to_numpy(),
+        'CLUSTER_ID': groups.transform('min').to_numpy(),
+        'CLUSTER_SIZE': groups.transform('size').to_numpy(),
+    })
+
+
+def representatives(df, clusters_csv=CLUSTERS_CSV):
+    """
+    One hoax per near-duplicate cluster: the lowest ID of each cluster in df.
+
+    Hoaxes missing from clusters_csv (scraped after it was built) count as
+    their own cluster.
+    """
+    clusters = pd.read_csv(clusters_csv, usecols=['ID', 'CLUSTER_ID']).set_index('ID')['CLUSTER_ID']
+    cluster_ids = df['ID'].map(clusters).fillna(df['ID'])
+    return df[df['ID'] == df['ID'].groupby(cluster_ids).transform('min')]
+
+
+def synthetic_corpus(docs=100000, copies=4, seed=0):
+    """
+    Reworded copies of synthetic narratives: each base text appears 1..copies
+    times with ~5% of its words replaced and an optional lead-in.
+
+    Returns:
+        (texts, base): the texts and the base narrative each came from
+    """
+    from local_site import SAMPLE_WORDS
+
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"{word}{i}" if i else word for i in range(200) for word in SAMPLE_WORDS])
+    weights = 1 / np.arange(1, len(vocabulary) + 1)  # Zipf-like word frequencies
+    weights /= weights.sum()
+
+    texts, base = [], []
+    narrative = 0
+    while len(texts) < docs:
+        words = rng.choice(vocabulary, size=rng.integers(15, 120), p=weights)
+        for _ in range(rng.integers(1, copies + 1)):
+            copy = words.copy()
+            changed = rng.random(len(copy)) < 0.05
+            copy[changed] = rng.choice(vocabulary, size=changed.sum(), p=weights)
+            lead = ' '.join(rng.choice(vocabulary, size=4)) + ': ' if rng.random() < 0.3 else ''
+            texts.append(lead + ' '.join(copy))
+            base.append(narrative)
+        narrative += 1
+    return texts[:docs], np.array(base[:docs])
+
+
+def run_benchmark(docs=100000):
+    """Cluster a synthetic corpus with planted reworded copies and score the result."""
+    print("=" * 60)
+    print(f"NEAR-DUPLICATE CLUSTERING BENCHMARK ({docs:,} texts)")
+    print("=" * 60)
+
+    texts, base = synthetic_corpus(docs)
+    print(f"   {len(set(base.tolist())):,} narratives, {sum(len(t) for t in texts) / 1e6:.0f} MB of text")
+
+    timings = {}
+    start = time.perf_counter()
+    labels = cluster_texts(texts, timings=timings)
+    elapsed = time.perf_counter() - start
+    for step, seconds in timings.items():
+        print(f"   {step:<17} {seconds:6.2f}s")
+    print(f"   total             {elapsed:6.2f}s  ({docs / elapsed:,.0f} texts/sec)")
+
+    # A cluster is pure when all of its texts share one base narrative, and a
+    # narrative is recovered when all of its copies share one cluster
+    pairs = pd.DataFrame({'label': labels, 'base': base})
+    pure = pairs.groupby('label')['base'].nunique() == 1
+    recovered = pairs.groupby('base')['label'].nunique() == 1
+    print(f"   {pairs['label'].nunique():,} clusters for {pairs['base'].nunique():,} narratives: "
+          f"{pure.mean():.1%} pure, {recovered.mean():.1%} of narratives in one cluster")
+
+    # Rewording is random, so recall depends on how similar the copies ended
+    # up: share of copies joined to their first text, by exact Jaccard
+    first = pairs.drop_duplicates('base').reset_index().set_index('base')['index']
+    sample = np.flatnonzero(base < 2000)
+    sample = sample[first[base[sample]].to_numpy() != sample]
+    shingles = [set(zip(*(words[k:] for k in range(SHINGLE_SIZE))))
+                for words in (text.lower().split() for text in texts)]
+    similarity = np.array([len(shingles[i] & shingles[j]) / len(shingles[i] | shingles[j])
+                           for i, j in zip(sample, first[base[sample]])])
+    joined = labels[sample] == labels[first[base[sample]].to_numpy()]
+    for low, high in ((0, 0.3), (0.3, 0.5), (0.5, 0.7), (0.7, 1.01)):
+        band = (similarity >= low) & (similarity < high)
+        if band.any():
+            print(f"      Jaccard {low:.1f}-{min(high, 1):.1f}: {joined[band].mean():6.1%} of {band.sum():,} copies joined")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cluster near-duplicate hoaxes with MinHash-LSH")
+    parser.add_argument('input_file', nargs='?', default=STRUCTURED_CSV)
+    parser.add_argument('--output', default=CLUSTERS_CSV)
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help="estimated Jaccard similarity to join two hoaxes")
+    parser.add_argument('--bands', type=int, default=BANDS)
+    parser.add_argument('--benchmark', action='store_true', help="cluster a synthetic corpus and time it")
+    parser.add_argument('--docs', type=int, default=100000)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.docs)
+        return
+
+    if not os.path.exists(args.input_file):
+        print(f"✗ {args.input_file} not found")
+        print("   Run: python3 extract_content.py")
+        sys.exit(1)
+
+    print(f"Clustering near-duplicates in {args.input_file}...")
+    df = pd.read_csv(args.input_file, usecols=['ID', 'TITLE', 'HOAX_TEXT'])
+    df = df[pd.to_numeric(df['ID'], errors='coerce').notna()]
+    clusters = cluster_frame(df, bands=args.bands, threshold=args.threshold)
+    clusters.to_csv(args.output, index=False)
+
+    duplicated = clusters[clusters['CLUSTER_SIZE'] > 1]
+    print(f"✓ {len(clusters)} hoaxes in {clusters['CLUSTER_ID'].nunique()} clusters; "
+          f"{duplicated['CLUSTER_ID'].nunique()} clusters hold {len(duplicated)} near-duplicates")
+    print(f"✓ Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
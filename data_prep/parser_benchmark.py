@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Parity check and benchmark for the turnbackhoax_parser backends.
+
+Every saved page is parsed with each backend and compared against the 'bs4'
+backend (the notebook's original behaviour); any difference is reported and
+makes the script exit non-zero. Each backend is then timed in a fresh process
+to report docs/sec, peak RSS and peak Python heap (tracemalloc).
+
+Listing pages are recognised by a /page/<n>/ path; every other .html file is
+treated as an article page.
+
+Usage:
+    python3 parser_benchmark.py [fixture_dir] [--rounds 3]
+
+Without fixture_dir a synthetic site (plus a few edge-case pages) is generated.
+"""
+
+import argparse
+import multiprocessing
+import os
+import re
+import resource
+import sys
+import tempfile
+import time
+
+from turnbackhoax_parser import BACKENDS, lxml, parse_article, parse_listing_page
+
+EDGE_CASE_ARTICLES = [
+    # Comments, entities, nested inline tags and a style block inside the content
+    """<html><body><span class="entry-meta-categories"><a href="#">Salah</a><a>Hoaks</a></span>
+    <div class="entry-content mh-clearfix"><p>[NARASI] :<!-- hidden --> &#8220;Prabowo&nbsp;dan <b>Gibran</b>&#8221;</p>
+    <style>p { color: red; }</style><p>=====<br/>[PENJELASAN] : <i>cek</i><a href="x">fakta</a> &amp; data</p></div>
+    </body></html>""",
+    # No category, content div with extra whitespace in the class attribute
+    """<html><body><div class="entry-content  mh-clearfix">
+    <p>Teks   dengan
+    baris baru</p><script>var x = "<p>not text</p>";</script>akhir</div></body></html>""",
+    # No content div at all
+    """<html><body><span class="entry-meta-categories"></span><p>Tidak ada konten</p></body></html>""",
+]
+
+EDGE_CASE_LISTING = """<html><body>
+<article class="mh-loop-item"><figure class="mh-loop-thumb"><a href="u"></a></figure>
+<div class="mh-loop-content"><h3 class="entry-title"><span>no link</span></h3>
+<div class="mh-excerpt"><p>Pratinjau &#8230; tanpa penanda</p></div></div></article>
+<article class="post mh-loop-item extra"><h3 class="entry-title mh-loop-title"><a href="v">Judul <em>miring</em></a></h3>
+<span class="mh-meta-date updated">  3 Jan 2024 </span><span class="mh-meta-author"><a class="fn">Penulis</a></span>
+<div class="mh-excerpt"><p>Awal [&#8230;] sisa</p></div></article>
+</body></html>"""
+
+
+def load_fixtures(fixture_dir):
+    """(listing pages, article pages) as raw bytes from a directory tree."""
+    listings, articles = [], []
+    for dirpath, _, filenames in os.walk(fixture_dir):
+        for filename in sorted(filenames):
+            if not filename.endswith('.html'):
+                continue
+            path = os.path.join(dirpath, filename)
+            with open(path, 'rb') as f:
+                content = f.read()
+            relative = os.path.relpath(path, fixture_dir).replace(os.sep, '/')
+            if re.search(r'(^|/)page/\d+/', relative):
+                listings.append(content)
+            else:
+                articles.append(content)
+    return listings, articles
+
+
+def generate_fixtures(root_dir, pages=20, per_page=20):
+    """Write a synthetic site plus edge-case pages into root_dir."""
+    from local_site import write_fixture_site
+
+    write_fixture_site(root_dir, "https://turnbackhoax.id", 1, pages, per_page)
+    edge_dir = os.path.join(root_dir, 'edge-cases')
+    os.makedirs(os.path.join(edge_dir, 'page', '999'), exist_ok=True)
+    with open(os.path.join(edge_dir, 'page', '999', 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(EDGE_CASE_LISTING)
+    for i, html in enumerate(EDGE_CASE_ARTICLES):
+        with open(os.path.join(edge_dir, f'article-{i}.html'), 'w', encoding='utf-8') as f:
+            f.write(html)
+
+
+def check_parity(listings, articles, backends):
+    """Compare every backend with 'bs4'; returns the number of mismatching pages."""
+    mismatches = 0
+    for backend in backends:
+        if backend == 'bs4':
+            continue
+        bad = 0
+        for content in listings:
+            if not parse_listing_page(content, 'bs4').equals(parse_listing_page(content, backend)):
+                bad += 1
+        for content in articles:
+            if parse_article(content, 'bs4') != parse_article(content, backend):
+                bad += 1
+        status = "✓ identical" if bad == 0 else f"✗ {bad} pages differ"
+        print(f"   {backend:<9} vs bs4: {status}")
+        mismatches += bad
+    return mismatches
+
+
+def _time_backend(backend, listings, articles, rounds):
+    """
+    Runs in a fresh process so peak RSS reflects this backend only.
+
+    Returns:
+        (docs/sec, peak RSS in MB, peak Python heap in MB during one round)
+    """
+    import tracemalloc
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for content in listings:
+            parse_listing_page(content, backend)
+        for content in articles:
+            parse_article(content, backend)
+    elapsed = time.perf_counter() - start
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    # tracemalloc sees Python allocations only, not libxml2's
+    tracemalloc.start()
+    for content in listings:
+        parse_listing_page(content, backend)
+    for content in articles:
+        parse_article(content, backend)
+    heap_peak_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+    tracemalloc.stop()
+
+    docs = rounds * (len(listings) + len(articles))
+    return docs / elapsed, peak_rss_mb, heap_peak_mb
+
+
+def _idle_rss(listings, articles):
+    """Peak RSS of a fresh process holding the fixtures without parsing them."""
+    import pandas  # noqa: F401  same imports as the timed runs
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_benchmark(listings, articles, backends, rounds):
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        idle_mb = pool.apply(_idle_rss, (listings, articles))
+
+    results = {}
+    for backend in backends:
+        with context.Pool(1) as pool:
+            results[backend] = pool.apply(_time_backend, (backend, listings, articles, rounds))
+
+    print(f"   idle process with fixtures loaded: peak RSS {idle_mb:.1f} MB")
+    base_rate = results.get('bs4', next(iter(results.values())))[0]
+    for backend, (rate, peak_rss_mb, heap_peak_mb) in results.items():
+        print(f"   {backend:<9} {rate:8.1f} docs/sec  ({rate / base_rate:4.1f}x)  "
+              f"peak RSS {peak_rss_mb:6.1f} MB  peak Python heap {heap_peak_mb:5.2f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare turnbackhoax_parser backends")
+    parser.add_argument('fixture_dir', nargs='?', help="directory of saved .html pages")
+    parser.add_argument('--rounds', type=int, default=3, help="passes over the fixtures per backend")
+    args = parser.parse_args()
+
+    backends = [b for b in BACKENDS if b != 'lxml' or lxml is not None]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixture_dir = args.fixture_dir
+        if fixture_dir is None:
+            fixture_dir = tmp
+            generate_fixtures(fixture_dir)
+        listings, articles = load_fixtures(fixture_dir)
+
+    print("=" * 60)
+    print(f"PARSER BACKENDS ({len(listings)} listing pages, {len(articles)} article pages)")
+    print("=" * 60)
+
+    print("\nParity with the original BeautifulSoup parser:")
+    mismatches = check_parity(listings, articles, backends)
+
+    print(f"\nThroughput ({args.rounds} rounds, fresh process per backend):")
+    run_benchmark(listings, articles, backends, args.rounds)
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Adaptive request rate limiting shared by the scrapers.
+
+AdaptiveRateLimiter is a token bucket whose rate follows the server:
+    - every successful response adds a little to the rate (additive increase,
+      roughly ADDITIVE_INCREASE req/s per second of successes)
+    - a 429/503, or a response slower than LATENCY_TARGET, cuts it
+      (multiplicative decrease, at most once per DECREASE_COOLDOWN seconds so
+      a burst of in-flight 429s counts as one signal)
+    - a Retry-After header pauses the bucket for that long; without one,
+      consecutive throttles back off exponentially
+
+The same object works from threads (acquire) and from asyncio (acquire_async).
+Counters for live requests/sec, throttled responses and backoffs are kept for
+progress lines and run summaries.
+
+Usage:
+    python3 rate_limiter.py --benchmark [--server-rate 15] [--articles 200]
+"""
+
+import argparse
+import asyncio
+import collections
+import email.utils
+import os
+import tempfile
+import threading
+import time
+
+INITIAL_RATE = 4.0  # req/s, the same as the scrapers' 0.25 s default spacing
+MIN_RATE = 0.2
+MAX_RATE = 10.0
+ADDITIVE_INCREASE = 0.5
+MULTIPLICATIVE_DECREASE = 0.5
+LATENCY_TARGET = 2.0  # seconds to response headers before we slow down
+DECREASE_COOLDOWN = 1.0
+BACKOFF_BASE = 1.0  # first pause after a throttle without Retry-After
+BACKOFF_MAX = 60.0
+RATE_WINDOW = 5.0  # seconds of responses behind the live req/s figure
+
+THROTTLE_STATUSES = (429, 503)
+MAX_RETRIES = 3  # retries of a throttled request before giving up on it
+
+
+def rate_for_delay(delay):
+    """Initial rate for a --delay value; a zero delay starts unlimited (None)."""
+    return 1.0 / delay if delay and delay > 0 else None
+
+
+def parse_retry_after(value, now=None):
+    """
+    Seconds to wait according to a Retry-After header.
+
+    Accepts delta-seconds or an HTTP date; returns None if absent or unparseable.
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    now = time.time() if now is None else now
+    return max(0.0, when.timestamp() - now)
+
+
+class AdaptiveRateLimiter:
+    """Token bucket with AIMD rate adaptation; safe to share between threads."""
+
+    def __init__(self, rate=INITIAL_RATE, burst=1.0, min_rate=MIN_RATE, max_rate=MAX_RATE,
+                 increase=ADDITIVE_INCREASE, decrease=MULTIPLICATIVE_DECREASE,
+                 latency_target=LATENCY_TARGET):
+        """
+        Args:
+            rate: Starting requests/sec, or None for no limit until the server pushes back
+            burst: Tokens the bucket can hold (requests allowed back to back)
+            min_rate, max_rate: Bounds for the adapted rate
+            increase: Additive increase, in req/s per second of successful responses
+            decrease: Factor applied to the rate on a throttle or slow response
+            latency_target: Response time (seconds) above which the rate is cut
+        """
+        self.rate = None if rate is None else min(max(rate, min_rate), max_rate)
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+
+        self._lock = threading.Lock()
+        self._tokens = burst
+        self._last = time.monotonic()  # refill clock; in the future while paused
+        self._last_decrease = float('-inf')
+        self._consecutive_throttles = 0
+        self._responses = collections.deque()
+        self._started = time.monotonic()
+
+        self.requests = 0
+        self.throttled = 0
+        self.backoffs = 0
+        self.pauses = 0
+        self.waited = 0.0
+
+    def _refill(self, now):
+        if now > self._last:
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+
+    def reserve(self):
+        """Take a token; returns the seconds to wait before sending the request."""
+        with self._lock:
+            now = time.monotonic()
+            self.requests += 1
+            if self.rate is None:
+                wait = max(0.0, self._last - now)
+            else:
+                self._refill(now)
+                self._tokens -= 1
+                wait = max(0.0, self._last - now + max(0.0, -self._tokens) / self.rate)
+            self.waited += wait
+            return wait
+
+    def acquire(self):
+        """Block the calling thread until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait, without blocking the event loop, until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def record(self, status, latency=None, retry_after=None):
+        """
+        Feed back one response.
+
+        Args:
+            status: HTTP status code, or None if the request failed outright
+            latency: Seconds until the response headers arrived
+            retry_after: Raw Retry-After header value, if any
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._responses.append(now)
+            while self._responses and self._responses[0] < now - RATE_WINDOW:
+                self._responses.popleft()
+
+            if status in THROTTLE_STATUSES:
+                self.throttled += 1
+                self._consecutive_throttles += 1
+                self._decrease_locked(now)
+                pause = parse_retry_after(retry_after)
+                if pause is None:
+                    pause = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (self._consecutive_throttles - 1))
+                self._pause_locked(now, pause)
+                return
+
+            self._consecutive_throttles = 0
+            if status is None:
+                return
+            if latency is not None and latency > self.latency_target:
+                self._decrease_locked(now)
+            elif self.rate is not None:
+                self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def _decrease_locked(self, now):
+        if now - self._last_decrease < DECREASE_COOLDOWN:
+            return
+        self._last_decrease = now
+        self.backoffs += 1
+        if self.rate is None:
+            # First push-back while unlimited: start from what we were sending
+            current = min(self._live_rate_locked(now) or self.max_rate, self.max_rate)
+            self._tokens = 0.0
+            self._last = max(self._last, now)
+            self.rate = max(self.min_rate, current * self.decrease)
+        else:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+
+    def _pause_locked(self, now, seconds):
+        resume = now + seconds
+        if resume > self._last:
+            self.pauses += 1
+            if self.rate is not None:
+                self._refill(now)
+                self._tokens = min(self._tokens, 0.0)
+            self._last = resume
+
+    def _live_rate_locked(self, now):
+        # At least one second, so the first few responses don't read as a huge rate
+        span = min(RATE_WINDOW, max(1.0, now - self._started))
+        return len(self._responses) / span
+
+    def requests_per_second(self):
+        """Responses per second over the last RATE_WINDOW seconds."""
+        with self._lock:
+            now = time.monotonic()
+            while self._responses and self._responses[0] < now - RATE_WINDOW:
+                self._responses.popleft()
+            return self._live_rate_locked(now)
+
+    def stats(self):
+        """Counters for reporting."""
+        return {
+            'rate_limit': self.rate,
+            'requests_per_second': self.requests_per_second(),
+            'requests': self.requests,
+            'throttled': self.throttled,
+            'backoffs': self.backoffs,
+            'pauses': self.pauses,
+            'waited': self.waited,
+        }
+
+    def describe(self):
+        """One-line summary for progress output."""
+        stats = self.stats()
+        limit = 'unlimited' if stats['rate_limit'] is None else f"limit {stats['rate_limit']:.1f}"
+        return (f"{stats['requests_per_second']:.1f} req/s, {limit}, "
+                f"{stats['throttled']} throttled, {stats['backoffs']} backoffs")
+
+
+def run_benchmark(articles=200, server_rate=15.0, latency=0.02):
+    """Scrape a local site that answers 429 above server_rate req/s."""
+    from article_pipeline import scrape_articles
+    from local_site import fixture_post, render_article, serve_site
+
+    print("=" * 60)
+    print(f"RATE LIMITER BENCHMARK ({articles} articles, server allows {server_rate:.0f} req/s)")
+    print("=" * 60)
+    print(f"   fixed 1 s sleep (old scraper): ~{articles:.0f}s")
+
+    with tempfile.TemporaryDirectory() as root:
+        with serve_site(root, latency=latency, max_rate=server_rate) as base_url:
+            urls = []
+            for post_id in range(1, articles + 1):
+                post = fixture_post(post_id, base_url)
+                article_dir = os.path.join(root, post['path'])
+                os.makedirs(article_dir, exist_ok=True)
+                with open(os.path.join(article_dir, 'index.html'), 'w', encoding='utf-8') as f:
+                    f.write(render_article(post))
+                urls.append(post['url'])
+
+            for label, rate in (("adaptive from 4 req/s", INITIAL_RATE),
+                                ("adaptive from unlimited", None)):
+                limiter = AdaptiveRateLimiter(rate, max_rate=server_rate * 2)
+                start = time.perf_counter()
+                df = scrape_articles(urls, fetchers=8, workers=1, progress=False, limiter=limiter)
+                elapsed = time.perf_counter() - start
+                errors = df['content'].str.startswith('Error').sum()
+                print(f"   {label:<24} {elapsed:6.2f}s  {len(df) / elapsed:5.1f} articles/sec  "
+                      f"final limit {limiter.rate:.1f} req/s, {limiter.throttled} throttled, "
+                      f"{limiter.backoffs} backoffs, {errors} failed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Adaptive rate limiter for the scrapers")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="scrape a local site that injects 429s")
+    parser.add_argument('--articles', type=int, default=200)
+    parser.add_argument('--server-rate', type=float, default=15.0)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.articles, args.server_rate)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Crash-safe, append-only storage for scrape results.
+
+Rows are buffered and committed in row groups. Each group is written to its own
+Parquet part file (under a temporary name, fsynced, then renamed) and only then
+recorded in an append-only progress journal. Parts missing from the journal are
+discarded on open, so a crash at any point loses at most the uncommitted
+buffer, and a restarted scrape skips every key already committed. Memory use is
+bounded by the row group size, not by the size of the crawl.
+
+    <dir>/part-00000.parquet, part-00001.parquet, ...
+    <dir>/journal.jsonl    one line per committed part
+
+Usage:
+    python3 result_writer.py <dir>                    # progress summary
+    python3 result_writer.py <dir> --export out.csv   # combine the parts into one CSV
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+JOURNAL = 'journal.jsonl'
+ROW_GROUP_SIZE = 100  # also the most rows a crash can lose
+COMPRESSION = 'zstd'
+
+
+def _fsync_dir(directory):
+    # Make the rename itself durable; not possible (or needed) on every platform
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def read_journal(directory):
+    """Committed journal entries whose part file exists, in commit order."""
+    path = os.path.join(directory, JOURNAL)
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                break  # torn last line from a crash mid-append
+            if not os.path.exists(os.path.join(directory, entry['part'])):
+                break
+            entries.append(entry)
+    return entries
+
+
+def iter_parts(directory, columns=None):
+    """Yield each committed part as a DataFrame, in commit order."""
+    for entry in read_journal(directory):
+        yield pq.read_table(os.path.join(directory, entry['part']), columns=columns).to_pandas()
+
+
+def read_results(directory, columns=None):
+    """All committed rows as one DataFrame."""
+    frames = list(iter_parts(directory, columns))
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+
+def export_csv(directory, output_path, columns=None):
+    """
+    Write every committed row to one CSV, one part at a time.
+
+    Returns:
+        Number of rows written
+    """
+    rows = 0
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        for df in iter_parts(directory, columns):
+            df.to_csv(f, index=False, header=rows == 0)
+            rows += len(df)
+    return rows
+
+
+class ResultWriter:
+    """Buffers rows and commits them as Parquet row groups plus a journal line."""
+
+    def __init__(self, directory, schema, key_column, row_group_size=ROW_GROUP_SIZE):
+        """
+        Args:
+            directory: Where the parts and journal live; reopened to resume
+            schema: pyarrow schema of the rows
+            key_column: Column identifying finished work (e.g. url, page_number)
+            row_group_size: Rows buffered before a commit
+        """
+        self.directory = directory
+        self.schema = schema
+        self.key_column = key_column
+        self.row_group_size = row_group_size
+        os.makedirs(directory, exist_ok=True)
+
+        self._entries = read_journal(directory)
+        self._recover()
+        self.rows_committed = self._entries[-1]['total_rows'] if self._entries else 0
+        self._buffer = []
+        self._journal = open(os.path.join(directory, JOURNAL), 'a', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _recover(self):
+        """Drop a torn journal tail and any part file the journal never committed."""
+        journal_path = os.path.join(self.directory, JOURNAL)
+        tmp_path = journal_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in self._entries:
+                f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, journal_path)
+
+        committed = {entry['part'] for entry in self._entries}
+        for name in os.listdir(self.directory):
+            if name.startswith('part-') and name not in committed:
+                os.remove(os.path.join(self.directory, name))
+
+    def completed_keys(self):
+        """Set of key_column values already committed."""
+        keys = set()
+        for df in iter_parts(self.directory, [self.key_column]):
+            keys.update(df[self.key_column].tolist())
+        return keys
+
+    def write(self, rows):
+        """
+        Add rows (list of dicts or a DataFrame) as one unit.
+
+        A unit is never split across row groups, so every key is either fully
+        committed or not at all.
+        """
+        if isinstance(rows, pd.DataFrame):
+            rows = rows.to_dict('records')
+        self._buffer.extend(rows)
+        if len(self._buffer) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """Commit the buffered rows as one Parquet part."""
+        if not self._buffer:
+            return
+        number = int(self._entries[-1]['part'][5:10]) + 1 if self._entries else 0
+        name = f"part-{number:05d}.parquet"
+        path = os.path.join(self.directory, name)
+
+        table = pa.Table.from_pylist(self._buffer, schema=self.schema)
+        with open(path + '.tmp', 'wb') as f:
+            pq.write_table(table, f, compression=COMPRESSION)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + '.tmp', path)
+        _fsync_dir(self.directory)
+
+        self.rows_committed += len(self._buffer)
+        entry = {'part': name, 'rows': len(self._buffer), 'total_rows': self.rows_committed,
+                 'committed_at': time.time()}
+        self._journal.write(json.dumps(entry) + '\n')
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._entries.append(entry)
+        self._buffer = []
+
+    def close(self):
+        """Commit what is buffered and close the journal."""
+        self.flush()
+        self._journal.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or export streamed scrape results")
+    parser.add_argument('directory')
+    parser.add_argument('--export', metavar='CSV', help="write all committed rows to this CSV")
+    args = parser.parse_args()
+
+    entries = read_journal(args.directory)
+    if not entries:
+        print(f"No committed results in {args.directory}")
+        sys.exit(1)
+
+    last = entries[-1]
+    print(f"{args.directory}: {last['total_rows']} rows in {len(entries)} parts, "
+          f"last commit {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(last['committed_at']))}")
+    if args.export:
+        rows = export_csv(args.directory, args.export)
+        print(f"Exported {rows} rows to {args.export}")
+
+
+if __name__ == "__main__":
+    main()
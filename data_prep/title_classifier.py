@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Local title classifier in front of the LLM categorizer.
+
+A TF-IDF bag of word unigrams and bigrams (over category_cache's
+normalized titles) feeds a multinomial logistic regression, trained on the
+LLM labels in categorized_hoaxes.csv with SciPy's L-BFGS. Titles whose top
+class probability reaches the model's threshold are answered locally; the
+rest go to the LLM (see llm_categorizer.categorize_items(classifier=...)).
+
+`train` splits the labels by ID: 60% to fit, 20% to pick the lowest
+threshold at which local answers still agree with the LLM on at least
+--target of the titles, and 20% held out to report agreement, per-route
+counts and throughput. The saved model is then refitted on all labels
+with that threshold. IDs the hoax store marks as answered without the
+LLM ('Category Source' other than 'llm') are not used as labels.
+
+Usage:
+    python3 title_classifier.py train [--target 0.95]
+    python3 title_classifier.py classify "Prabowo bagi-bagi hadiah 70 juta"
+    python3 title_classifier.py --benchmark [--latency 0.2]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import optimize, sparse
+
+from category_cache import normalize_title
+
+TRAIN_FILE = "categorized_hoaxes.csv"
+MODEL_FILE = "title_classifier.npz"
+SOURCE_COLUMN = 'Category Source'  # 'llm', 'local' or 'keywords', in the hoax store
+
+MIN_DF = 2  # n-grams in fewer training titles are dropped
+L2 = 1e-4  # weight penalty, relative to the mean log loss
+MAX_ITER = 300
+TARGET_AGREEMENT = 0.95
+
+
+def ngrams(title):
+    """Word unigrams and bigrams of the normalized title."""
+    words = normalize_title(title).split()
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def softmax(scores):
+    scores = scores - scores.max(axis=1, keepdims=True)
+    np.exp(scores, out=scores)
+    return scores / scores.sum(axis=1, keepdims=True)
+
+
+class TitleClassifier:
+    """TF-IDF + softmax regression over titles; threshold on the top probability routes to the LLM."""
+
+    source = 'local'  # Category Source of its answers in categorize_hoaxes.py
+
+    def __init__(self, vocabulary, idf, weights, bias, classes, threshold=1.0):
+        self.vocabulary = vocabulary  # {n-gram: column}
+        self.idf = idf
+        self.weights = weights  # (features, classes)
+        self.bias = bias
+        self.classes = list(classes)
+        self.threshold = threshold
+
+    @classmethod
+    def fit(cls, titles, labels, l2=L2, min_df=MIN_DF, max_iter=MAX_ITER):
+        """Train on titles and their LLM labels."""
+        documents = [set(ngrams(title)) for title in titles]
+        df = {}
+        for document in documents:
+            for gram in document:
+                df[gram] = df.get(gram, 0) + 1
+        vocabulary = {gram: i for i, gram in enumerate(sorted(g for g, n in df.items() if n >= min_df))}
+        counts = np.array([df[gram] for gram in vocabulary], dtype=np.float64)
+        idf = np.log((1 + len(documents)) / (1 + counts)) + 1
+
+        classes = sorted(set(labels))
+        y = np.searchsorted(classes, labels)
+        model = cls(vocabulary, idf, np.zeros((len(vocabulary), len(classes))), np.zeros(len(classes)), classes)
+        X = model.transform(titles)
+        targets = np.zeros((len(y), len(classes)))
+        targets[np.arange(len(y)), y] = 1
+        shape = (X.shape[1] + 1, len(classes))
+
+        def loss(flat):
+            params = flat.reshape(shape)
+            W, b = params[:-1], params[-1]
+            scores = X @ W + b
+            scores -= scores.max(axis=1, keepdims=True)
+            log_norm = np.log(np.exp(scores).sum(axis=1, keepdims=True))
+            probs = np.exp(scores - log_norm)
+            value = -(targets * (scores - log_norm)).sum() / len(y) + l2 / 2 * (W * W).sum()
+            residual = (probs - targets) / len(y)
+            grad = np.vstack([X.T @ residual + l2 * W, residual.sum(axis=0)])
+            return value, grad.ravel()
+
+        result = optimize.minimize(loss, np.zeros(shape).ravel(), jac=True, method='L-BFGS-B',
+                                   options={'maxiter': max_iter})
+        params = result.x.reshape(shape)
+        model.weights, model.bias = params[:-1], params[-1]
+        return model
+
+    def transform(self, titles):
+        """Sublinear TF-IDF rows, L2-normalized, as a CSR matrix."""
+        indices, data, indptr = [], [], [0]
+        for title in titles:
+            counts = {}
+            for gram in ngrams(title):
+                column = self.vocabulary.get(gram)
+                if column is not None:
+                    counts[column] = counts.get(column, 0) + 1
+            indices.extend(counts)
+            data.extend(counts.values())
+            indptr.append(len(indices))
+        indices = np.array(indices, dtype=np.int32)
+        data = (1 + np.log(np.array(data, dtype=np.float64))) * self.idf[indices]
+        X = sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, len(self.vocabulary)))
+        norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms) @ X
+
+    def predict_proba(self, titles):
+        return softmax(self.transform(titles) @ self.weights + self.bias)
+
+    def classify(self, titles):
+        """(labels, top probabilities, confident mask) for titles."""
+        probs = self.predict_proba(titles)
+        best = probs.argmax(axis=1)
+        confidence = probs[np.arange(len(best)), best]
+        return [self.classes[i] for i in best], confidence, confidence >= self.threshold
+
+    def save(self, path=MODEL_FILE):
+        grams = list(self.vocabulary)
+        np.savez_compressed(path, vocabulary=np.array(grams), idf=self.idf, weights=self.weights,
+                            bias=self.bias, classes=np.array(self.classes), threshold=self.threshold)
+
+    @classmethod
+    def load(cls, path=MODEL_FILE):
+        with np.load(path) as model:
+            vocabulary = {gram: i for i, gram in enumerate(model['vocabulary'].tolist())}
+            return cls(vocabulary, model['idf'], model['weights'], model['bias'],
+                       model['classes'].tolist(), float(model['threshold']))
+
+
+def choose_threshold(confidence, correct, target=TARGET_AGREEMENT):
+    """
+    Lowest confidence threshold at which the titles answered locally agree
+    with the LLM on at least `target` of them; 1.0 (nothing local) if none does.
+    """
+    order = np.argsort(-confidence, kind='stable')
+    agreement = np.cumsum(correct[order]) / np.arange(1, len(order) + 1)
+    # A threshold has to take every title of equal confidence
+    last_of_tie = np.r_[confidence[order][1:] != confidence[order][:-1], True]
+    ok = np.flatnonzero((agreement >= target) & last_of_tie)
+    return float(confidence[order][ok[-1]]) if len(ok) else 1.0
+
+
+def load_labels(path=TRAIN_FILE, store_path=None):
+    """LLM-labelled rows (ID, TITLE, LLM_CATEGORY), without IDs the store marks as answered otherwise."""
+    from hoax_store import DB_PATH, HoaxStore
+
+    df = pd.read_csv(path).dropna(subset=['TITLE', 'LLM_CATEGORY']).drop_duplicates('ID', keep='last')
+    store_path = store_path or DB_PATH
+    if os.path.exists(store_path):
+        with HoaxStore(store_path) as store:
+            if SOURCE_COLUMN in store.columns():
+                sources = store.read([SOURCE_COLUMN]).dropna()
+                local = sources.loc[sources[SOURCE_COLUMN] != 'llm', 'ID']
+                df = df[~df['ID'].isin(local)]
+    return df.reset_index(drop=True)
+
+
+def split_by_id(ids):
+    """'fit', 'calibrate' or 'test' per ID: 60/20/20, stable across runs."""
+    parts = np.array(['fit', 'fit', 'fit', 'calibrate', 'test'])
+    return parts[np.asarray(ids) % 5]
+
+
+def route_report(model, titles, labels):
+    """Print per-route counts, agreement with the LLM labels and throughput for titles."""
+    start = time.perf_counter()
+    predicted, _, confident = model.classify(titles)
+    elapsed = time.perf_counter() - start
+    agree = np.array(predicted) == np.asarray(labels)
+    local = int(confident.sum())
+    print(f"   Routes: {local} local ({local / len(titles):.1%}), {len(titles) - local} to the LLM")
+    print(f"   Agreement with LLM labels: {agree[confident].mean() if local else 0:.1%} on local answers, "
+          f"{agree.mean():.1%} if every title were answered locally")
+    for label in model.classes:
+        mask = np.asarray(labels) == label
+        print(f"      {label:<9} {int(mask.sum()):>4} titles  {int((mask & confident).sum()):>4} local  "
+              f"{agree[mask & confident].mean() if (mask & confident).any() else 0:6.1%} agreement")
+    print(f"   Throughput: {len(titles) / elapsed:,.0f} titles/sec ({elapsed / len(titles) * 1e6:.1f} µs per title)")
+
+
+def train(path=TRAIN_FILE, model_path=MODEL_FILE, target=TARGET_AGREEMENT):
+    df = load_labels(path)
+    parts = split_by_id(df['ID'])
+    print(f"Training on {len(df)} LLM labels from {path}: {pd.Series(parts).value_counts().to_dict()}")
+
+    fit, calibrate, test = (df[parts == part] for part in ('fit', 'calibrate', 'test'))
+    start = time.perf_counter()
+    model = TitleClassifier.fit(fit['TITLE'].tolist(), fit['LLM_CATEGORY'].tolist())
+    print(f"   Fitted {len(model.vocabulary)} n-grams in {time.perf_counter() - start:.2f}s")
+
+    predicted, confidence, _ = model.classify(calibrate['TITLE'].tolist())
+    correct = np.array(predicted) == calibrate['LLM_CATEGORY'].to_numpy()
+    model.threshold = choose_threshold(confidence, correct, target)
+    print(f"   Threshold for {target:.0%} agreement on the calibration split: {model.threshold:.3f}")
+
+    print(f"Held-out split ({len(test)} titles):")
+    route_report(model, test['TITLE'].tolist(), test['LLM_CATEGORY'].tolist())
+
+    final = TitleClassifier.fit(df['TITLE'].tolist(), df['LLM_CATEGORY'].tolist())
+    final.threshold = model.threshold
+    final.save(model_path)
+    print(f"✓ Saved model fitted on all {len(df)} labels to {model_path}")
+
+
+def run_benchmark(path=TRAIN_FILE, latency=0.2, concurrency=4, target=TARGET_AGREEMENT):
+    """Held-out titles through the mock LLM endpoint, with and without the local classifier."""
+    from llm_categorizer import run_items
+    from mock_gemini import serve_mock_gemini
+
+    df = load_labels(path)
+    parts = split_by_id(df['ID'])
+    train_rows, calibrate, test = (df[parts == part] for part in ('fit', 'calibrate', 'test'))
+    model = TitleClassifier.fit(train_rows['TITLE'].tolist(), train_rows['LLM_CATEGORY'].tolist())
+    predicted, confidence, _ = model.classify(calibrate['TITLE'].tolist())
+    model.threshold = choose_threshold(confidence, np.array(predicted) == calibrate['LLM_CATEGORY'].to_numpy(),
+                                       target)
+    items = test[['ID', 'TITLE']].to_dict('records')
+    labels = dict(zip(test['ID'], test['LLM_CATEGORY']))
+
+    print("=" * 60)
+    print(f"CASCADE BENCHMARK ({len(items)} held-out titles, mock LLM at {latency * 1000:.0f} ms, "
+          f"concurrency {concurrency}, threshold {model.threshold:.3f})")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as root:
+        with serve_mock_gemini(root, latency=latency) as base_url:
+            for label, classifier in (("LLM only", None), ("local + LLM", model)):
+                categories, stats, elapsed = asyncio.run(run_items(items, base_url, concurrency,
+                                                                   classifier=classifier))
+                print(f"   {label:<12} {elapsed:6.2f}s  {len(items) / elapsed:8.1f} items/sec  "
+                      f"{stats.requests:>3} requests  routes: {stats.describe_routes()}")
+                if classifier is not None:
+                    local = stats.local_ids
+                    agree = sum(categories[i] == labels[i] for i in local)
+                    print(f"   {'':<12} local answers agree with the held-out LLM labels on "
+                          f"{agree}/{len(local)} ({agree / max(len(local), 1):.1%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local TF-IDF title classifier for hoax categories")
+    parser.add_argument('command', nargs='?', choices=['train', 'classify'])
+    parser.add_argument('titles', nargs='*', help="titles to classify")
+    parser.add_argument('--labels', default=TRAIN_FILE, help="CSV with ID, TITLE, LLM_CATEGORY")
+    parser.add_argument('--model', default=MODEL_FILE)
+    parser.add_argument('--target', type=float, default=TARGET_AGREEMENT,
+                        help="agreement with the LLM required of local answers")
+    parser.add_argument('--benchmark', action='store_true', help="held-out titles through the mock LLM")
+    parser.add_argument('--latency', type=float, default=0.2, help="mock seconds per request")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.labels, args.latency, target=args.target)
+    elif args.command == 'train':
+        train(args.labels, args.model, args.target)
+    elif args.command == 'classify':
+        if not os.path.exists(args.model):
+            print(f"✗ {args.model} not found; run `python3 title_classifier.py train` first")
+            sys.exit(1)
+        model = TitleClassifier.load(args.model)
+        labels, confidence, confident = model.classify(args.titles)
+        for title, label, p, local in zip(args.titles, labels, confidence, confident):
+            print(f"   {label:<9} {p:.3f} {'local' if local else 'LLM  '}  {title}")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
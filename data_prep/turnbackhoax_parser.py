@@ -0,0 +1,287 @@
+"""
+HTML extraction for turnbackhoax.id pages.
+
+The parsing logic from Scraping_Turn_Back_Hoax.ipynb, moved into an importable
+module so the crawler scripts can share it without touching the network.
+
+Three interchangeable backends produce identical output:
+    bs4       full BeautifulSoup 'html.parser' tree (the notebook's behaviour)
+    strainer  BeautifulSoup restricted to the needed subtrees with SoupStrainer
+    lxml      libxml2 parse with XPath lookups of only the needed elements
+parser_benchmark.py checks their parity and compares speed and memory.
+"""
+
+import re
+
+import pandas as pd
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+except ImportError:  # lxml backend unavailable
+    lxml = None
+
+BASE_URL = "https://turnbackhoax.id"
+COMPLETE_CSV = "Scraping turnbackhoax.id - Complete.csv"
+
+# Headers to mimic browser request
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+LISTING_COLUMNS = ['title', 'url', 'preview', 'image_url', 'date', 'author']
+
+BACKENDS = ['bs4', 'strainer', 'lxml']
+DEFAULT_BACKEND = 'lxml' if lxml is not None else 'bs4'
+
+# Strainers see the raw class attribute while parsing, so match class words by regex
+LISTING_STRAINER = SoupStrainer('article', class_=re.compile(r'(^|\s)mh-loop-item(\s|$)'))
+ARTICLE_STRAINER = SoupStrainer(['span', 'div'],
+                                class_=re.compile(r'(^|\s)(entry-meta-categories|entry-content)(\s|$)'))
+
+# Layout of the Complete CSV read by the data_prep scripts
+COMPLETE_COLUMNS = ['ID', 'URL', 'TITLE', 'CATEGORY', 'DATE', 'AUTHOR', 'PREVIEW', 'IMAGE_URL', 'CONTENT']
+
+
+def listing_page_url(page_number, base_url=BASE_URL):
+    """URL of a numbered listing page."""
+    return f"{base_url.rstrip('/')}/page/{page_number}/"
+
+
+def parse_listing_page(content, backend=DEFAULT_BACKEND):
+    """
+    Extract the headline rows from a listing page.
+
+    Args:
+        content: Raw HTML (bytes or str) of a /page/<n>/ listing
+        backend: One of BACKENDS
+
+    Returns:
+        DataFrame with title, url, preview, image_url, date and author columns
+    """
+    if backend == 'lxml':
+        return pd.DataFrame(_parse_listing_lxml(content))
+
+    parse_only = LISTING_STRAINER if backend == 'strainer' else None
+    soup = BeautifulSoup(content, 'html.parser', parse_only=parse_only)
+
+    data = {column: [] for column in LISTING_COLUMNS}
+
+    articles = soup.find_all('article', class_='mh-loop-item')
+
+    for article in articles:
+        # Extract title and URL
+        title_element = article.find('h3', class_='entry-title')
+        if title_element and title_element.a:
+            data['title'].append(title_element.a.text.strip())
+            data['url'].append(title_element.a['href'])
+        else:
+            data['title'].append('')
+            data['url'].append('')
+
+        # Extract preview text
+        preview_element = article.find('div', class_='mh-excerpt')
+        if preview_element and preview_element.p:
+            preview_text = preview_element.p.text.split('[…]')[0].strip()
+            data['preview'].append(preview_text)
+        else:
+            data['preview'].append('')
+
+        # Extract image URL
+        figure_element = article.find('figure', class_='mh-loop-thumb')
+        if figure_element and figure_element.a and figure_element.a.img:
+            data['image_url'].append(figure_element.a.img['src'])
+        else:
+            data['image_url'].append('')
+
+        # Extract date
+        date_element = article.find('span', class_='mh-meta-date')
+        if date_element:
+            data['date'].append(date_element.text.strip())
+        else:
+            data['date'].append('')
+
+        # Extract author
+        author_element = article.find('span', class_='mh-meta-author')
+        if author_element and author_element.a:
+            data['author'].append(author_element.a.text.strip())
+        else:
+            data['author'].append('')
+
+    return pd.DataFrame(data)
+
+
+def clean_html_content(html_content):
+    """
+    Clean HTML content and format it into readable paragraphs
+    """
+    # Remove script and style elements
+    for script in html_content.find_all(['script', 'style']):
+        script.decompose()
+
+    # Get text and clean it
+    text = html_content.get_text(separator=' ')
+
+    # Remove extra whitespace and newlines
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\n\s*\n', '\n\n', text)
+
+    # Create proper paragraphs
+    paragraphs = text.split('\n\n')
+    cleaned_paragraphs = [p.strip() for p in paragraphs if p.strip()]
+
+    return '\n\n'.join(cleaned_paragraphs)
+
+
+def parse_article(content, backend=DEFAULT_BACKEND):
+    """
+    Extract the category and cleaned body text from an article page.
+
+    Args:
+        content: Raw HTML (bytes or str) of an article page
+        backend: One of BACKENDS
+
+    Returns:
+        Dict with 'category' and 'content'
+    """
+    if backend == 'lxml':
+        return _parse_article_lxml(content)
+
+    parse_only = ARTICLE_STRAINER if backend == 'strainer' else None
+    soup = BeautifulSoup(content, 'html.parser', parse_only=parse_only)
+
+    # Get category
+    category_element = soup.find('span', class_='entry-meta-categories')
+    category = category_element.a.text if category_element and category_element.a else ''
+
+    # Get article content
+    content_div = soup.find('div', class_='entry-content mh-clearfix')
+    text = clean_html_content(content_div) if content_div else ''
+
+    return {
+        'category': category,
+        'content': text
+    }
+
+
+# lxml backend: same lookups as above, expressed as XPath over a libxml2 tree
+
+def _has_class(name):
+    """XPath predicate matching what BeautifulSoup's class_=name matches."""
+    if ' ' in name:
+        return f"normalize-space(@class)='{name}'"
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _first(element, path):
+    found = element.xpath(path)
+    return found[0] if found else None
+
+
+def _find(element, tag, class_name):
+    """First descendant tag with the class, like BeautifulSoup's find()."""
+    return _first(element, f".//{tag}[{_has_class(class_name)}]")
+
+
+def _lxml_document(content):
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return lxml.html.document_fromstring(content, parser=lxml.html.HTMLParser(encoding='utf-8'))
+
+
+def _parse_listing_lxml(content):
+    doc = _lxml_document(content)
+    data = {column: [] for column in LISTING_COLUMNS}
+
+    for article in doc.xpath(f"//article[{_has_class('mh-loop-item')}]"):
+        title_element = _find(article, 'h3', 'entry-title')
+        title_link = _first(title_element, './/a') if title_element is not None else None
+        if title_link is not None:
+            data['title'].append(title_link.text_content().strip())
+            data['url'].append(title_link.attrib['href'])
+        else:
+            data['title'].append('')
+            data['url'].append('')
+
+        preview_element = _find(article, 'div', 'mh-excerpt')
+        preview_p = _first(preview_element, './/p') if preview_element is not None else None
+        if preview_p is not None:
+            data['preview'].append(preview_p.text_content().split('[…]')[0].strip())
+        else:
+            data['preview'].append('')
+
+        figure_element = _find(article, 'figure', 'mh-loop-thumb')
+        figure_link = _first(figure_element, './/a') if figure_element is not None else None
+        image = _first(figure_link, './/img') if figure_link is not None else None
+        data['image_url'].append(image.attrib['src'] if image is not None else '')
+
+        date_element = _find(article, 'span', 'mh-meta-date')
+        data['date'].append(date_element.text_content().strip() if date_element is not None else '')
+
+        author_element = _find(article, 'span', 'mh-meta-author')
+        author_link = _first(author_element, './/a') if author_element is not None else None
+        data['author'].append(author_link.text_content().strip() if author_link is not None else '')
+
+    return data
+
+
+def _parse_article_lxml(content):
+    doc = _lxml_document(content)
+
+    category_element = _find(doc, 'span', 'entry-meta-categories')
+    category_link = _first(category_element, './/a') if category_element is not None else None
+    category = category_link.text_content() if category_link is not None else ''
+
+    content_div = _find(doc, 'div', 'entry-content mh-clearfix')
+    text = ''
+    if content_div is not None:
+        for element in content_div.xpath('.//script|.//style'):
+            element.drop_tree()
+        # Same steps as clean_html_content, on the text nodes of the subtree
+        text = re.sub(r'\s+', ' ', ' '.join(content_div.xpath('.//text()')))
+        text = re.sub(r'\n\s*\n', '\n\n', text)
+        paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+        text = '\n\n'.join(paragraphs)
+
+    return {
+        'category': category,
+        'content': text
+    }
+
+
+def format_separators(text):
+    """
+    Put "=====" style separators on their own lines (Step 3 of the notebook),
+    as done for the CONTENT column of the Complete CSV.
+    """
+    if not isinstance(text, str):
+        return text
+
+    # Pattern for continuous "=" (like "=====" of any length)
+    text = re.sub(r'={2,}', r'\n\g<0>\n', text)
+
+    # Pattern for spaced "=" (like "= = =" with any number of "=")
+    text = re.sub(r'(?:=\s+){2,}=', r'\n\g<0>\n', text)
+
+    return text
+
+
+def build_complete_frame(headlines, articles):
+    """
+    Join headline rows and article rows into the Complete CSV layout.
+
+    Args:
+        headlines: DataFrame with the LISTING_COLUMNS, newest first
+        articles: DataFrame with url, category and content
+
+    Returns:
+        DataFrame with COMPLETE_COLUMNS; IDs count up in listing order
+    """
+    df = headlines[LISTING_COLUMNS].merge(
+        articles[['url', 'category', 'content']].drop_duplicates('url', keep='last'),
+        on='url', how='left',
+    )
+    df['content'] = df['content'].map(format_separators)
+    df.insert(0, 'id', range(1, len(df) + 1))
+    df.columns = [column.upper() for column in df.columns]
+    return df[COMPLETE_COLUMNS]
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Bulk ingestion through turnbackhoax.id's WordPress endpoints.
+
+Instead of rendering ~190 listing pages and then every article page, the REST
+API returns titles, dates, authors, categories, featured images and the full
+post body in pages of up to 100 posts. The output has the same layout as the
+Complete CSV built from the HTML scrape (turnbackhoax_parser.COMPLETE_COLUMNS).
+
+The sitemap mode lists every post URL with its last-modified date, which can
+seed article_pipeline.py when the REST API is unavailable.
+
+Usage:
+    python3 wp_ingest.py rest [--after 2024-01-01] [--before 2025-01-01] [--output out.csv]
+    python3 wp_ingest.py rest --record recordings/     # also save responses for replay
+    python3 wp_ingest.py sitemap [--output urls.csv]
+    python3 wp_ingest.py benchmark
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from urllib.parse import urlencode, urlsplit
+
+import aiohttp
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from headline_crawler import CONCURRENCY, PER_HOST_DELAY, HostPoliteness, create_session
+from rate_limiter import MAX_RETRIES, THROTTLE_STATUSES
+from turnbackhoax_parser import BASE_URL, build_complete_frame, clean_html_content
+
+POSTS_PATH = "/wp-json/wp/v2/posts"
+SITEMAP_PATH = "/wp-sitemap.xml"
+PER_PAGE = 100  # WordPress maximum
+SITEMAP_NS = {'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
+
+
+def posts_target(page, per_page=PER_PAGE, after=None, before=None):
+    """Request target (path + query) for one page of the posts endpoint."""
+    params = {'per_page': per_page, 'page': page, '_embed': 1, 'orderby': 'date', 'order': 'desc'}
+    if after:
+        params['after'] = after
+    if before:
+        params['before'] = before
+    return f"{POSTS_PATH}?{urlencode(params)}"
+
+
+async def fetch_target(session, base_url, target, politeness, recorder=None):
+    """
+    GET base_url + target, retrying throttled (429/503) responses.
+
+    Returns:
+        (body bytes, response headers)
+    """
+    url = base_url.rstrip('/') + target
+    loop = asyncio.get_running_loop()
+    for attempt in range(MAX_RETRIES + 1):
+        async with politeness.slot(url) as limiter:
+            start = loop.time()
+            async with session.get(url) as response:
+                limiter.record(response.status, loop.time() - start, response.headers.get('Retry-After'))
+                if response.status in THROTTLE_STATUSES and attempt < MAX_RETRIES:
+                    continue
+                response.raise_for_status()
+                body = await response.read()
+                headers = dict(response.headers)
+                break
+    if recorder is not None:
+        recorder(target, body, headers)
+    return body, headers
+
+
+def _text(html):
+    """Visible text of an HTML fragment, as BeautifulSoup's .text gives it."""
+    return BeautifulSoup(html or '', 'html.parser').get_text()
+
+
+def _format_date(iso_date):
+    """WordPress ISO date -> the listing's '2 Jan 2024' format."""
+    date = datetime.fromisoformat(iso_date)
+    return f"{date.day} {date:%b %Y}"
+
+
+def post_to_rows(post):
+    """
+    Split one REST post object into a headline row and an article row,
+    matching what the listing and article page parsers extract.
+    """
+    embedded = post.get('_embedded', {})
+
+    authors = embedded.get('author') or [{}]
+    media = embedded.get('wp:featuredmedia') or [{}]
+    terms = embedded.get('wp:term') or [[]]
+    categories = [term['name'] for term in terms[0] if term.get('taxonomy', 'category') == 'category']
+
+    url = post.get('link', '')
+    headline = {
+        'title': _text(post.get('title', {}).get('rendered')).strip(),
+        'url': url,
+        'preview': _text(post.get('excerpt', {}).get('rendered')).split('[…]')[0].strip(),
+        'image_url': media[0].get('source_url', ''),
+        'date': _format_date(post['date']) if post.get('date') else '',
+        'author': authors[0].get('name', ''),
+    }
+
+    body = BeautifulSoup(post.get('content', {}).get('rendered') or '', 'html.parser')
+    article = {
+        'url': url,
+        'category': categories[0] if categories else '',
+        'content': clean_html_content(body),
+    }
+    return headline, article
+
+
+def posts_to_complete_frame(posts):
+    """Complete-CSV layout for a list of REST post objects (newest first)."""
+    headlines, articles = [], []
+    for post in posts:
+        headline, article = post_to_rows(post)
+        headlines.append(headline)
+        articles.append(article)
+    return build_complete_frame(pd.DataFrame(headlines), pd.DataFrame(articles))
+
+
+async def fetch_all_posts(base_url=BASE_URL, per_page=PER_PAGE, after=None, before=None,
+                          concurrency=CONCURRENCY, delay=PER_HOST_DELAY, recorder=None):
+    """
+    Download every post from the REST API.
+
+    The first page tells us X-WP-TotalPages; the rest are fetched concurrently.
+
+    Returns:
+        (list of post objects newest first, number of requests made)
+    """
+    politeness = HostPoliteness(max_concurrent=concurrency, min_interval=delay)
+    async with create_session(concurrency, concurrency) as session:
+        body, headers = await fetch_target(session, base_url, posts_target(1, per_page, after, before),
+                                           politeness, recorder)
+        posts = json.loads(body)
+        total_pages = int(headers.get('X-WP-TotalPages', 1))
+        print(f"   {headers.get('X-WP-Total', '?')} posts in {total_pages} pages of {per_page}")
+
+        rest = await asyncio.gather(*(
+            fetch_target(session, base_url, posts_target(page, per_page, after, before), politeness, recorder)
+            for page in range(2, total_pages + 1)
+        ))
+    for body, _ in rest:
+        posts.extend(json.loads(body))
+    return posts, total_pages
+
+
+async def fetch_sitemap_urls(base_url=BASE_URL, concurrency=CONCURRENCY, delay=PER_HOST_DELAY,
+                             recorder=None):
+    """
+    List post URLs from the WordPress sitemap index.
+
+    Returns:
+        DataFrame with url and lastmod columns
+    """
+    politeness = HostPoliteness(max_concurrent=concurrency, min_interval=delay)
+    async with create_session(concurrency, concurrency) as session:
+        body, _ = await fetch_target(session, base_url, SITEMAP_PATH, politeness, recorder)
+        index = ET.fromstring(body)
+        sitemaps = [loc.text.strip() for loc in index.findall('sm:sitemap/sm:loc', SITEMAP_NS)]
+        post_sitemaps = [url for url in sitemaps if '-posts-post-' in url]
+
+        bodies = await asyncio.gather(*(
+            fetch_target(session, base_url, urlsplit(url).path, politeness, recorder)
+            for url in post_sitemaps
+        ))
+
+    rows = []
+    for body, _ in bodies:
+        for entry in ET.fromstring(body).findall('sm:url', SITEMAP_NS):
+            lastmod = entry.find('sm:lastmod', SITEMAP_NS)
+            rows.append({
+                'url': entry.find('sm:loc', SITEMAP_NS).text.strip(),
+                'lastmod': lastmod.text.strip() if lastmod is not None else '',
+            })
+    return pd.DataFrame(rows, columns=['url', 'lastmod'])
+
+
+def make_recorder(directory):
+    """Recorder callback saving responses for replay by local_site.py."""
+    from local_site import save_recording
+
+    def record(target, body, headers):
+        save_recording(directory, target, body, headers)
+    return record
+
+
+def write_fixture_api(root_dir, base_url, posts=1000, per_page=PER_PAGE):
+    """Record synthetic REST responses for fixture_post() posts under root_dir."""
+    from local_site import fixture_post, save_recording
+
+    pages = math.ceil(posts / per_page)
+    for page in range(1, pages + 1):
+        objects = []
+        for post_id in range((page - 1) * per_page + 1, min(page * per_page, posts) + 1):
+            post = fixture_post(post_id, base_url)
+            day, month, year = post['date'].split()
+            date = datetime.strptime(f"{day} {month} {year}", '%d %b %Y')
+            objects.append({
+                'id': post_id,
+                'date': date.isoformat(),
+                'link': post['url'],
+                'title': {'rendered': post['title']},
+                'excerpt': {'rendered': f"<p>{post['preview']} [&hellip;]</p>\n"},
+                'content': {'rendered': (
+                    f"<p>[KATEGORI] : Konten yang Menyesatkan</p>\n<p>=======</p>\n"
+                    f"<p>[NARASI] : &#8220;{post['narrative']}&#8221;</p>\n"
+                    f"<p>[PENJELASAN] : {post['explanation']}</p>\n"
+                )},
+                '_embedded': {
+                    'author': [{'name': post['author']}],
+                    'wp:featuredmedia': [{'source_url': post['image_url']}],
+                    'wp:term': [[{'taxonomy': 'category', 'name': post['category']}], []],
+                },
+            })
+        save_recording(root_dir, posts_target(page, per_page), json.dumps(objects).encode('utf-8'), {
+            'Content-Type': 'application/json; charset=UTF-8',
+            'X-WP-Total': str(posts),
+            'X-WP-TotalPages': str(pages),
+        })
+
+
+def run_benchmark(posts=3760, latency=0.05):
+    """Compare request counts and time of REST ingestion against HTML scraping."""
+    from headline_crawler import crawl_pages
+    from local_site import serve_site
+
+    print("=" * 60)
+    print(f"WORDPRESS REST INGESTION BENCHMARK ({posts} posts, {latency * 1000:.0f} ms latency)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as root:
+        with serve_site(root, latency=latency) as base_url:
+            write_fixture_api(root, base_url, posts)
+
+            start = time.perf_counter()
+            post_objects, requests_made = asyncio.run(fetch_all_posts(base_url, delay=0.0))
+            df = posts_to_complete_frame(post_objects)
+            elapsed = time.perf_counter() - start
+            print(f"   REST: {len(df)} complete rows from {requests_made} requests in {elapsed:.2f}s")
+
+    html_requests = math.ceil(posts / 20) + posts
+    print(f"   HTML scrape of the same posts: {html_requests} requests "
+          f"(~{html_requests * latency / CONCURRENCY:.1f}s at concurrency {CONCURRENCY} "
+          f"with the same latency, before any politeness delay)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest turnbackhoax.id through WordPress endpoints")
+    parser.add_argument('mode', choices=['rest', 'sitemap', 'benchmark'])
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--after', help="only posts published after this ISO date")
+    parser.add_argument('--before', help="only posts published before this ISO date")
+    parser.add_argument('--per-page', type=int, default=PER_PAGE)
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--delay', type=float, default=PER_HOST_DELAY)
+    parser.add_argument('--record', metavar='DIR', help="save every response for replay by local_site.py")
+    parser.add_argument('--output', help="output CSV (default: timestamped file)")
+    args = parser.parse_args()
+
+    if args.mode == 'benchmark':
+        run_benchmark()
+        return
+
+    def iso(value):
+        return f"{value}T00:00:00" if value and 'T' not in value else value
+
+    recorder = make_recorder(args.record) if args.record else None
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+
+    if args.mode == 'rest':
+        print("Fetching posts from the REST API...")
+        posts, requests_made = asyncio.run(fetch_all_posts(
+            args.base_url, args.per_page, iso(args.after), iso(args.before),
+            args.concurrency, args.delay, recorder))
+        df = posts_to_complete_frame(posts)
+        filename = args.output or f'turnbackhoax_rest_{timestamp}.csv'
+        print(f"Requests made: {requests_made}")
+    else:
+        print("Reading the sitemap index...")
+        df = asyncio.run(fetch_sitemap_urls(args.base_url, args.concurrency, args.delay, recorder))
+        filename = args.output or f'turnbackhoax_sitemap_{timestamp}.csv'
+
+    df.to_csv(filename, index=False)
+    print(f"Total rows: {len(df)}")
+    print(f"Data saved to: {filename}")
+
+
+if __name__ == "__main__":
+    main()
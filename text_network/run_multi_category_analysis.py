@@ -3,6 +3,7 @@ Multi-Category Text Network Analysis
 Analyzes co-occurrence networks for politics, scam, and others categories
 """
 
+import argparse
 import pandas as pd
 import networkx as nx
 import re
@@ -10,8 +11,18 @@ from collections import Counter, defaultdict
 from itertools import combinations
 import json
 import os
+import sys
 import pickle
 
+# hoax_dataset.py and near_duplicates.py live in data_prep/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data_prep'))
+from hoax_dataset import load_dataset
+from near_duplicates import representatives
+
+# Month-partitioned dataset built by data_prep/hoax_dataset.py; only these
+# columns, and only the year=2024 directories, are read
+DATASET_COLUMNS = ['ID', 'TITLE', 'DATE', 'LLM Category', 'HOAX_TEXT']
+
 # Indonesian stopwords
 INDONESIAN_STOPWORDS = set([
     'yang', 'dan', 'di', 'ke', 'dari', 'ini', 'itu', 'dengan', 'untuk', 
@@ -51,25 +62,6 @@ ENTITY_LISTS = {
     ]
 }
 
-def extract_narasi(content):
-    """Extract NARASI section from content"""
-    if pd.isna(content):
-        return ""
-    
-    narasi_pattern = r'\[NARASI\]:?\s*(.*?)(?:\[|===|$)'
-    match = re.search(narasi_pattern, content, re.IGNORECASE | re.DOTALL)
-    
-    if match:
-        return match.group(1).strip()
-    
-    narasi_pattern2 = r'NARASI:?\s*(.*?)(?:\[|===|$)'
-    match = re.search(narasi_pattern2, content, re.IGNORECASE | re.DOTALL)
-    
-    if match:
-        return match.group(1).strip()
-    
-    return ""
-
 def clean_text(text):
     """Clean and normalize text"""
     if not text:
@@ -101,10 +93,10 @@ def build_cooccurrence_network(df, entity_list, min_cooccurrence=2):
     doc_entities = []
     
     for idx, row in df.iterrows():
-        content = row.get('CONTENT', '')
-        narasi = extract_narasi(content)
+        # NARASI (or TITLE) extracted once by data_prep/extract_content.py
+        narasi = row.get('HOAX_TEXT', '')
         
-        if not narasi:
+        if pd.isna(narasi) or not narasi:
             narasi = row.get('TITLE', '')
         
         cleaned = clean_text(narasi)
@@ -249,6 +241,11 @@ def analyze_category(df, category, entity_list, output_dir):
     }
 
 def main():
+    parser = argparse.ArgumentParser(description="Text network analysis of 2024 hoaxes per category")
+    parser.add_argument('--representatives', action='store_true',
+                        help="one hoax per near-duplicate cluster (run data_prep/near_duplicates.py first)")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Multi-Category Text Network Analysis")
     print("=" * 60)
@@ -259,11 +256,8 @@ def main():
     
     # Load data
     print("\nLoading data...")
-    df = pd.read_csv("Scraping turnbackhoax.id - Complete.csv")
-    
-    # Filter to 2024
-    df['DATE'] = pd.to_datetime(df['DATE'], format='%d %b %Y', errors='coerce')
-    df_2024 = df[df['DATE'].dt.year == 2024].copy()
+    # Filter to 2024 while reading
+    df_2024 = load_dataset(DATASET_COLUMNS, years=[2024])
     
     print(f"Total 2024 rows: {len(df_2024)}")
     
@@ -272,6 +266,8 @@ def main():
     
     for category in ['politics', 'scam', 'others']:
         df_category = df_2024[df_2024['LLM Category'] == category].copy()
+        if args.representatives:
+            df_category = representatives(df_category)
         print(f"\n{category.upper()}: {len(df_category)} documents")
         
         if len(df_category) > 0:
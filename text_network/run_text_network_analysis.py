@@ -3,6 +3,7 @@ Text Network Analysis for Political Hoaxes
 Analyzes co-occurrence networks to reveal narrative structures in political hoax content
 """
 
+import argparse
 import pandas as pd
 import networkx as nx
 import re
@@ -10,6 +11,16 @@ from collections import Counter, defaultdict
 from itertools import combinations
 import json
 import os
+import sys
+
+# hoax_dataset.py and near_duplicates.py live in data_prep/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data_prep'))
+from hoax_dataset import load_dataset
+from near_duplicates import representatives
+
+# Month-partitioned dataset built by data_prep/hoax_dataset.py; only these
+# columns, and only the year=2024 directories, are read
+DATASET_COLUMNS = ['ID', 'TITLE', 'DATE', 'LLM Category', 'HOAX_TEXT']
 
 # Indonesian stopwords
 INDONESIAN_STOPWORDS = set([
@@ -33,27 +44,6 @@ POLITICAL_ENTITIES = [
     'roy suryo', 'hak angket', 'curang', 'kecurangan'
 ]
 
-def extract_narasi(content):
-    """Extract NARASI section from content"""
-    if pd.isna(content):
-        return ""
-    
-    # Look for [NARASI] or Narasi: pattern
-    narasi_pattern = r'\[NARASI\]:?\s*(.*?)(?:\[|===|$)'
-    match = re.search(narasi_pattern, content, re.IGNORECASE | re.DOTALL)
-    
-    if match:
-        return match.group(1).strip()
-    
-    # Fallback: try without brackets
-    narasi_pattern2 = r'NARASI:?\s*(.*?)(?:\[|===|$)'
-    match = re.search(narasi_pattern2, content, re.IGNORECASE | re.DOTALL)
-    
-    if match:
-        return match.group(1).strip()
-    
-    return ""
-
 def clean_text(text):
     """Clean and normalize text"""
     if not text:
@@ -111,10 +101,10 @@ def build_cooccurrence_network(df, min_cooccurrence=2):
     doc_entities = []
     
     for idx, row in df.iterrows():
-        content = row.get('CONTENT', '')
-        narasi = extract_narasi(content)
+        # NARASI (or TITLE) extracted once by data_prep/extract_content.py
+        narasi = row.get('HOAX_TEXT', '')
         
-        if not narasi:
+        if pd.isna(narasi) or not narasi:
             # Fallback to TITLE if NARASI is empty
             narasi = row.get('TITLE', '')
         
@@ -207,6 +197,11 @@ def detect_communities(G):
     return community_map, communities
 
 def main():
+    parser = argparse.ArgumentParser(description="Text network analysis of 2024 political hoaxes")
+    parser.add_argument('--representatives', action='store_true',
+                        help="one hoax per near-duplicate cluster (run data_prep/near_duplicates.py first)")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Text Network Analysis - Political Hoaxes")
     print("=" * 60)
@@ -217,16 +212,13 @@ def main():
     
     # Load data
     print("\nLoading data...")
-    df = pd.read_csv("Scraping turnbackhoax.id - Complete.csv")
-    
-    # Filter to 2024 and politics
-    df['DATE'] = pd.to_datetime(df['DATE'], format='%d %b %Y', errors='coerce')
-    df_2024 = df[df['DATE'].dt.year == 2024].copy()
-    df_politics = df_2024[df_2024['LLM Category'] == 'politics'].copy()
+    # Filter to 2024 and politics while reading
+    df_politics = load_dataset(DATASET_COLUMNS, years=[2024], categories=['politics'])
     
-    print(f"Total rows: {len(df)}")
-    print(f"2024 rows: {len(df_2024)}")
-    print(f"Politics rows: {len(df_politics)}")
+    print(f"2024 politics rows: {len(df_politics)}")
+    if args.representatives:
+        df_politics = representatives(df_politics)
+        print(f"One per near-duplicate cluster: {len(df_politics)} rows")
     
     # Build network
     G, doc_entities, all_entities = build_cooccurrence_network(df_politics, min_cooccurrence=2)
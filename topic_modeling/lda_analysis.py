@@ -17,7 +17,9 @@ Features:
 import pandas as pd
 import numpy as np
 import re
+import os
 import pickle
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Gensim for LDA
@@ -37,18 +39,96 @@ import pyLDAvis.gensim_models as gensimvis
 import warnings
 warnings.filterwarnings('ignore')
 
+CHUNK_SIZE = 50  # documents per task sent to a preprocessing worker
+
+def preprocess_text(text, stopwords, stemmer):
+    """
+    Preprocess a single text document.
+
+    Args:
+        text: Raw text string
+        stopwords: Set of words to drop
+        stemmer: Sastrawi stemmer
+
+    Returns:
+        List of cleaned, stemmed tokens
+    """
+    if not isinstance(text, str):
+        return []
+    
+    # Lowercase
+    text = text.lower()
+    
+    # Remove URLs
+    text = re.sub(r'http\S+|www\S+', '', text)
+    
+    # Remove email addresses
+    text = re.sub(r'\S+@\S+', '', text)
+    
+    # Remove special characters and numbers, keep only letters and spaces
+    text = re.sub(r'[^a-z\s]', ' ', text)
+    
+    # Remove extra whitespace
+    text = re.sub(r'\s+', ' ', text).strip()
+    
+    # Tokenize
+    tokens = text.split()
+    
+    # Remove stopwords
+    tokens = [t for t in tokens if t not in stopwords and len(t) > 2]
+    
+    # Stem with Sastrawi
+    tokens = [stemmer.stem(t) for t in tokens]
+    
+    # Remove duplicates while preserving order
+    seen = set()
+    tokens = [t for t in tokens if not (t in seen or seen.add(t))]
+    
+    return tokens
+
+# Stopwords and stemmer of a preprocessing worker process, set once by _init_worker
+_worker_stopwords = None
+_worker_stemmer = None
+
+def _init_worker(stopwords):
+    global _worker_stopwords, _worker_stemmer
+    _worker_stopwords = stopwords
+    _worker_stemmer = StemmerFactory().create_stemmer()
+
+def _preprocess_chunk(texts):
+    return [preprocess_text(text, _worker_stopwords, _worker_stemmer) for text in texts]
+
+def preprocess_chunks(texts, stopwords, stemmer, workers=1, chunk_size=CHUNK_SIZE):
+    """
+    Preprocess texts in chunks of chunk_size documents, yielding each chunk's tokens in order.
+
+    With workers > 1 the chunks go to a process pool whose workers build
+    their stemmer once, at start; the tokens are the same as serially.
+    """
+    texts = list(texts)
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield [preprocess_text(text, stopwords, stemmer) for text in chunk]
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(stopwords,)) as executor:
+        # map returns results in submission order
+        yield from executor.map(_preprocess_chunk, chunks)
+
 class IndonesianLDAAnalyzer:
     """LDA Topic Modeling for Indonesian political hoax texts."""
     
-    def __init__(self, data_path, output_dir="topic_modeling"):
+    def __init__(self, data_path, output_dir="topic_modeling", workers=None):
         """
         Initialize the LDA analyzer.
         
         Args:
             data_path: Path to CSV with HOAX_TEXT column
             output_dir: Directory to save outputs
+            workers: Preprocessing processes (default: one per CPU)
         """
         self.data_path = data_path
+        self.workers = workers or os.cpu_count() or 1
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
@@ -99,62 +179,20 @@ class IndonesianLDAAnalyzer:
             print(f"   Remaining: {len(self.df)} documents")
     
     def preprocess_text(self, text):
-        """
-        Preprocess a single text document.
-        
-        Args:
-            text: Raw text string
-            
-        Returns:
-            List of cleaned, stemmed tokens
-        """
-        if not isinstance(text, str):
-            return []
-        
-        # Lowercase
-        text = text.lower()
-        
-        # Remove URLs
-        text = re.sub(r'http\S+|www\S+', '', text)
-        
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
-        
-        # Remove special characters and numbers, keep only letters and spaces
-        text = re.sub(r'[^a-z\s]', ' ', text)
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        # Tokenize
-        tokens = text.split()
-        
-        # Remove stopwords
-        tokens = [t for t in tokens if t not in self.all_stopwords and len(t) > 2]
-        
-        # Stem with Sastrawi
-        tokens = [self.stemmer.stem(t) for t in tokens]
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        tokens = [t for t in tokens if not (t in seen or seen.add(t))]
-        
-        return tokens
+        """Preprocess a single text document (see preprocess_text)."""
+        return preprocess_text(text, self.all_stopwords, self.stemmer)
     
     def preprocess_corpus(self):
-        """Preprocess all documents in the corpus."""
+        """Preprocess all documents in the corpus, in self.workers processes."""
         print(f"\n[2/7] Preprocessing corpus...")
         print("   - Tokenizing")
         print("   - Removing stopwords")
-        print("   - Stemming with Sastrawi")
+        print(f"   - Stemming with Sastrawi ({self.workers} worker{'s' if self.workers > 1 else ''})")
         
         self.processed_docs = []
-        for idx, text in enumerate(self.df['HOAX_TEXT']):
-            tokens = self.preprocess_text(text)
-            self.processed_docs.append(tokens)
-            
-            if (idx + 1) % 200 == 0:
-                print(f"   Processed {idx + 1}/{len(self.df)} documents...", end='\r')
+        for tokens in preprocess_chunks(self.df['HOAX_TEXT'], self.all_stopwords, self.stemmer, self.workers):
+            self.processed_docs.extend(tokens)
+            print(f"   Processed {len(self.processed_docs)}/{len(self.df)} documents...", end='\r')
         
         print(f"\n   ✓ Preprocessed {len(self.processed_docs)} documents")
         
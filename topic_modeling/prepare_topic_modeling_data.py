@@ -1,73 +1,49 @@
 #!/usr/bin/env python3
 """
-Prepare data for Topic Modeling by extracting HOAX_TEXT from CONTENT.
-This script extracts the NARASI (hoax narrative) from the CONTENT field,
+Prepare data for Topic Modeling from the HOAX_TEXT column.
+HOAX_TEXT (the NARASI hoax narrative, or the TITLE) is extracted once by
+data_prep/extract_content.py; this script reads it from the structured CSV,
 filters for politics category, and creates a clean dataset for LDA analysis.
+
+Usage:
+    python3 topic_modeling/prepare_topic_modeling_data.py [--representatives]
 """
 
-import pandas as pd
-import re
+import argparse
+import os
 import sys
 
-def extract_narasi(content_text, title_fallback):
-    """
-    Extract NARASI (hoax narrative) from CONTENT field.
-    
-    Args:
-        content_text: The CONTENT column text
-        title_fallback: The TITLE to use if NARASI not found
-        
-    Returns:
-        Extracted hoax text (NARASI or TITLE fallback)
-    """
-    if not isinstance(content_text, str):
-        return title_fallback
-    
-    # Try to find [NARASI] tag
-    # Pattern matches: [NARASI] ... [next tag or end]
-    narasi_pattern = r'\[NARASI\]\s*:?\s*(.*?)(?:\[|$)'
-    match = re.search(narasi_pattern, content_text, re.IGNORECASE | re.DOTALL)
-    
-    if match:
-        narasi_text = match.group(1).strip()
-        # Clean up common separators
-        narasi_text = re.sub(r'={3,}.*?={3,}', '', narasi_text)  # Remove ======
-        narasi_text = narasi_text.strip()
-        if narasi_text and len(narasi_text) > 10:
-            return narasi_text
-    
-    # Try alternative pattern: NARASI: or Narasi:
-    narasi_pattern2 = r'(?:NARASI|Narasi)\s*:\s*(.*?)(?:\[|={3}|$)'
-    match = re.search(narasi_pattern2, content_text, re.DOTALL)
-    
-    if match:
-        narasi_text = match.group(1).strip()
-        narasi_text = re.sub(r'={3,}.*?={3,}', '', narasi_text)
-        narasi_text = narasi_text.strip()
-        if narasi_text and len(narasi_text) > 10:
-            return narasi_text
-    
-    # Fallback to TITLE as mentioned in the plan
-    return title_fallback
+import pandas as pd
+
+# near_duplicates.py lives in data_prep/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data_prep'))
+from near_duplicates import representatives
+
+STRUCTURED_COLUMNS = ['ID', 'TITLE', 'DATE', 'HOAX_TEXT', 'EXTRACTOR_VERSION']
 
 def main():
+    parser = argparse.ArgumentParser(description="Prepare politics HOAX_TEXT for topic modeling")
+    parser.add_argument('--representatives', action='store_true',
+                        help="one hoax per near-duplicate cluster (run data_prep/near_duplicates.py first)")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("PREPARING DATA FOR TOPIC MODELING")
     print("=" * 60)
     
     # File paths
-    original_csv = "Scraping turnbackhoax.id - Complete.csv"
+    structured_csv = "Scraping turnbackhoax.id - Structured.csv"
     categorized_csv = "data_prep/categorized_hoaxes.csv"
     output_csv = "topic_modeling/politics_hoax_text.csv"
     
-    # Load original data with all columns
-    print(f"\n[1/5] Loading original dataset: {original_csv}")
+    # Load the extracted columns (not CONTENT)
+    print(f"\n[1/5] Loading structured dataset: {structured_csv}")
     try:
-        df_original = pd.read_csv(original_csv)
+        df_original = pd.read_csv(structured_csv, usecols=STRUCTURED_COLUMNS)
         print(f"   ✓ Loaded {len(df_original)} rows")
-        print(f"   Columns: {df_original.columns.tolist()}")
     except Exception as e:
         print(f"   ✗ Error: {e}")
+        print("   Run: python3 data_prep/extract_content.py")
         sys.exit(1)
     
     # Load categorized data (ID + LLM_CATEGORY)
@@ -89,27 +65,21 @@ def main():
     print(f"\n[4/5] Filtering for politics category...")
     df_politics = df_merged[df_merged['LLM_CATEGORY'] == 'politics'].copy()
     print(f"   ✓ Politics subset: {len(df_politics)} rows")
+    if args.representatives:
+        df_politics = representatives(df_politics)
+        print(f"   ✓ One per near-duplicate cluster: {len(df_politics)} rows")
     
-    # Extract HOAX_TEXT from CONTENT
-    print(f"\n[5/5] Extracting HOAX_TEXT from CONTENT...")
-    df_politics['HOAX_TEXT'] = df_politics.apply(
-        lambda row: extract_narasi(row['CONTENT'], row['TITLE']),
-        axis=1
-    )
-    
-    # Check extraction success
-    # Count how many used NARASI vs TITLE fallback
-    narasi_count = df_politics['HOAX_TEXT'].apply(
-        lambda x: '[NARASI]' in str(df_politics[df_politics['HOAX_TEXT'] == x]['CONTENT'].iloc[0] if len(df_politics[df_politics['HOAX_TEXT'] == x]) > 0 else '')
-    ).sum()
+    # HOAX_TEXT was extracted once, upstream
+    versions = df_politics['EXTRACTOR_VERSION'].dropna().unique().tolist()
+    print(f"\n[5/5] Using HOAX_TEXT from extract_content.py (extractor {', '.join(versions)})...")
     
-    print(f"   ✓ Extracted HOAX_TEXT for all rows")
+    print(f"   ✓ HOAX_TEXT for {len(df_politics)} rows")
     print(f"   - Average length: {df_politics['HOAX_TEXT'].str.len().mean():.0f} characters")
     print(f"   - Min length: {df_politics['HOAX_TEXT'].str.len().min()}")
     print(f"   - Max length: {df_politics['HOAX_TEXT'].str.len().max()}")
     
     # Select relevant columns for topic modeling
-    df_output = df_politics[['ID', 'TITLE', 'DATE', 'HOAX_TEXT', 'LLM_CATEGORY']].copy()
+    df_output = df_politics[['ID', 'TITLE', 'DATE', 'HOAX_TEXT', 'LLM_CATEGORY', 'EXTRACTOR_VERSION']].copy()
     
     # Save to CSV
     print(f"\n[OUTPUT] Saving to: {output_csv}")
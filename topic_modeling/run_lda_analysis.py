@@ -2,19 +2,29 @@
 """
 LDA Topic Modeling Analysis - Generalized for any category.
 
+Preprocessing (Sastrawi stemming per token) runs in a process pool of
+--workers processes (default: one per CPU), over chunks of documents; the
+tokens and their order are the same as with one process.
+
 Usage:
-    python3 run_lda_analysis.py <data_path> <output_dir> <num_topics_list>
+    python3 run_lda_analysis.py <data_path> <output_dir> <num_topics_list> [--workers N]
+    python3 run_lda_analysis.py --benchmark <data_path> [--workers N]
     
     data_path: path to CSV with HOAX_TEXT column
     output_dir: directory to save outputs
     num_topics_list: comma-separated list of topic numbers to test (e.g., "5,7,10")
+    --benchmark: time preprocessing with 1, 2, 4, ... up to N workers
 """
 
 import pandas as pd
 import numpy as np
 import re
+import os
 import pickle
 import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Gensim for LDA
@@ -34,18 +44,96 @@ import pyLDAvis.gensim_models as gensimvis
 import warnings
 warnings.filterwarnings('ignore')
 
+CHUNK_SIZE = 50  # documents per task sent to a preprocessing worker
+
+def preprocess_text(text, stopwords, stemmer):
+    """
+    Preprocess a single text document.
+
+    Args:
+        text: Raw text string
+        stopwords: Set of words to drop
+        stemmer: Sastrawi stemmer
+
+    Returns:
+        List of cleaned, stemmed tokens
+    """
+    if not isinstance(text, str):
+        return []
+    
+    # Lowercase
+    text = text.lower()
+    
+    # Remove URLs
+    text = re.sub(r'http\S+|www\S+', '', text)
+    
+    # Remove email addresses
+    text = re.sub(r'\S+@\S+', '', text)
+    
+    # Remove special characters and numbers, keep only letters and spaces
+    text = re.sub(r'[^a-z\s]', ' ', text)
+    
+    # Remove extra whitespace
+    text = re.sub(r'\s+', ' ', text).strip()
+    
+    # Tokenize
+    tokens = text.split()
+    
+    # Remove stopwords
+    tokens = [t for t in tokens if t not in stopwords and len(t) > 2]
+    
+    # Stem with Sastrawi
+    tokens = [stemmer.stem(t) for t in tokens]
+    
+    # Remove duplicates while preserving order
+    seen = set()
+    tokens = [t for t in tokens if not (t in seen or seen.add(t))]
+    
+    return tokens
+
+# Stopwords and stemmer of a preprocessing worker process, set once by _init_worker
+_worker_stopwords = None
+_worker_stemmer = None
+
+def _init_worker(stopwords):
+    global _worker_stopwords, _worker_stemmer
+    _worker_stopwords = stopwords
+    _worker_stemmer = StemmerFactory().create_stemmer()
+
+def _preprocess_chunk(texts):
+    return [preprocess_text(text, _worker_stopwords, _worker_stemmer) for text in texts]
+
+def preprocess_chunks(texts, stopwords, stemmer, workers=1, chunk_size=CHUNK_SIZE):
+    """
+    Preprocess texts in chunks of chunk_size documents, yielding each chunk's tokens in order.
+
+    With workers > 1 the chunks go to a process pool whose workers build
+    their stemmer once, at start; the tokens are the same as serially.
+    """
+    texts = list(texts)
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield [preprocess_text(text, stopwords, stemmer) for text in chunk]
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(stopwords,)) as executor:
+        # map returns results in submission order
+        yield from executor.map(_preprocess_chunk, chunks)
+
 class IndonesianLDAAnalyzer:
     """LDA Topic Modeling for Indonesian hoax texts."""
     
-    def __init__(self, data_path, output_dir):
+    def __init__(self, data_path, output_dir, workers=None):
         """
         Initialize the LDA analyzer.
         
         Args:
             data_path: Path to CSV with HOAX_TEXT column
             output_dir: Directory to save outputs
+            workers: Preprocessing processes (default: one per CPU)
         """
         self.data_path = data_path
+        self.workers = workers or os.cpu_count() or 1
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True, parents=True)
         
@@ -95,54 +183,20 @@ class IndonesianLDAAnalyzer:
             print(f"   Remaining: {len(self.df)} documents")
     
     def preprocess_text(self, text):
-        """Preprocess a single text document."""
-        if not isinstance(text, str):
-            return []
-        
-        # Lowercase
-        text = text.lower()
-        
-        # Remove URLs
-        text = re.sub(r'http\S+|www\S+', '', text)
-        
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
-        
-        # Remove special characters and numbers, keep only letters and spaces
-        text = re.sub(r'[^a-z\s]', ' ', text)
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        # Tokenize
-        tokens = text.split()
-        
-        # Remove stopwords
-        tokens = [t for t in tokens if t not in self.all_stopwords and len(t) > 2]
-        
-        # Stem with Sastrawi
-        tokens = [self.stemmer.stem(t) for t in tokens]
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        tokens = [t for t in tokens if not (t in seen or seen.add(t))]
-        
-        return tokens
+        """Preprocess a single text document (see preprocess_text)."""
+        return preprocess_text(text, self.all_stopwords, self.stemmer)
     
     def preprocess_corpus(self):
-        """Preprocess all documents in the corpus."""
+        """Preprocess all documents in the corpus, in self.workers processes."""
         print(f"\n[2/7] Preprocessing corpus...")
         print("   - Tokenizing")
         print("   - Removing stopwords")
-        print("   - Stemming with Sastrawi")
+        print(f"   - Stemming with Sastrawi ({self.workers} worker{'s' if self.workers > 1 else ''})")
         
         self.processed_docs = []
-        for idx, text in enumerate(self.df['HOAX_TEXT']):
-            tokens = self.preprocess_text(text)
-            self.processed_docs.append(tokens)
-            
-            if (idx + 1) % 200 == 0:
-                print(f"   Processed {idx + 1}/{len(self.df)} documents...", end='\r')
+        for tokens in preprocess_chunks(self.df['HOAX_TEXT'], self.all_stopwords, self.stemmer, self.workers):
+            self.processed_docs.extend(tokens)
+            print(f"   Processed {len(self.processed_docs)}/{len(self.df)} documents...", end='\r')
         
         print(f"\n   ✓ Preprocessed {len(self.processed_docs)} documents")
         
@@ -345,21 +399,70 @@ class IndonesianLDAAnalyzer:
         print(f"\nOutputs saved to: {self.output_dir}/")
         print("=" * 80)
 
+def run_benchmark(data_path, max_workers=None):
+    """Time corpus preprocessing with 1 to max_workers processes and check the tokens match."""
+    max_workers = max_workers or os.cpu_count() or 1
+    levels = sorted({1, max_workers} | {2 ** k for k in range(1, max_workers.bit_length()) if 2 ** k < max_workers})
+    texts = pd.read_csv(data_path)['HOAX_TEXT'].dropna().tolist()
+    
+    print("=" * 80)
+    print(f"PREPROCESSING BENCHMARK ({len(texts)} documents, up to {max_workers} workers, "
+          f"{os.cpu_count()} CPUs)")
+    print("Times include building the stemmer(s) and, with more than one worker, starting the pool")
+    print("=" * 80)
+    
+    reference = None
+    with tempfile.TemporaryDirectory() as output_dir:
+        analyzer = IndonesianLDAAnalyzer(data_path, output_dir)
+        for workers in levels:
+            start = time.perf_counter()
+            # Built inside the timed region, like the pool workers' stemmers; a fresh
+            # stemmer per run, so no run reuses another's stemmer cache
+            stemmer = StemmerFactory().create_stemmer() if workers == 1 else analyzer.stemmer
+            docs = [tokens for chunk in preprocess_chunks(texts, analyzer.all_stopwords, stemmer, workers)
+                    for tokens in chunk]
+            elapsed = time.perf_counter() - start
+            if reference is None:
+                reference, serial = docs, elapsed
+            print(f"   workers={workers:<3} {elapsed:7.2f}s  {len(texts) / elapsed:8.1f} docs/sec  "
+                  f"{serial / elapsed:5.2f}x  {'same tokens' if docs == reference else 'MISMATCH'}")
+
 def main():
     """Main entry point."""
-    if len(sys.argv) != 4:
-        print("Usage: python3 run_lda_analysis.py <data_path> <output_dir> <num_topics_list>")
+    args = sys.argv[1:]
+    workers = None
+    if '--workers' in args:
+        i = args.index('--workers')
+        value = args[i + 1] if i + 1 < len(args) else ''
+        if not value.isdigit() or int(value) < 1:
+            print("Usage: python3 run_lda_analysis.py <data_path> <output_dir> <num_topics_list> [--workers N]")
+            print(f"  --workers: a positive number of processes, got '{value}'")
+            sys.exit(1)
+        workers = int(value)
+        del args[i:i + 2]
+    
+    if '--benchmark' in args:
+        args.remove('--benchmark')
+        if len(args) != 1:
+            print("Usage: python3 run_lda_analysis.py --benchmark <data_path> [--workers N]")
+            sys.exit(1)
+        run_benchmark(args[0], workers)
+        return
+    
+    if len(args) != 3:
+        print("Usage: python3 run_lda_analysis.py <data_path> <output_dir> <num_topics_list> [--workers N]")
         print("  data_path: path to CSV with HOAX_TEXT column")
         print("  output_dir: directory to save outputs")
         print("  num_topics_list: comma-separated list (e.g., '5,7,10')")
+        print("  --workers: preprocessing processes (default: one per CPU)")
         sys.exit(1)
     
-    data_path = sys.argv[1]
-    output_dir = sys.argv[2]
-    topic_numbers = [int(x.strip()) for x in sys.argv[3].split(',')]
+    data_path = args[0]
+    output_dir = args[1]
+    topic_numbers = [int(x.strip()) for x in args[2].split(',')]
     
     # Initialize analyzer
-    analyzer = IndonesianLDAAnalyzer(data_path, output_dir)
+    analyzer = IndonesianLDAAnalyzer(data_path, output_dir, workers=workers)
     
     # Run analysis
     analyzer.run_analysis(topic_numbers=topic_numbers)